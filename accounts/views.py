@@ -1,8 +1,10 @@
 from django.contrib.auth import login as auth_login
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.shortcuts import render, redirect
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import UpdateView
 
 from accounts.form import SingUpForm
@@ -20,6 +22,7 @@ def signup(request):
     return render(request, 'signup.html', {'form': form})
 
 
+@method_decorator(login_required, name='dispatch')
 class UserUpdateView(UpdateView):
     model = User
     fields = ('first_name', 'last_name', 'email',)
@@ -27,4 +30,4 @@ class UserUpdateView(UpdateView):
     success_url = reverse_lazy('my_account')
 
     def get_object(self, queryset=None):
-        return self.request.User
+        return self.request.user
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BoardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'boards'
+
+    def ready(self):
+        # Imported for their signal receivers.
+        from boards import avatars, caching, db, search  # noqa: F401
@@ -0,0 +1,183 @@
+"""
+Async versions of the read-only pages, routed by `djangoProject1.urls_async`
+for the ASGI entry point. They render the same templates with the same
+context as their counterparts in `boards.views`, but reach the database,
+cache and user through Django's async APIs, so a request does not
+hold a worker thread while it waits on I/O.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import aget_object_or_404
+from django.views.generic import View
+from django.views.generic.base import TemplateResponseMixin
+
+from boards.caching import (
+    aget_generations, aget_validators, cache_page_when_rendered, cached_page_response, conditional_response,
+    is_page_cacheable, page_cache_key, set_validators,
+)
+from boards.models import Board, Topic, attach_board_stats
+from boards.pagination import CursorPaginator
+from boards.viewed import record_view_once, save_viewed_topics
+from boards.views import get_unread_redirect, prepare_topic_page
+
+
+class AsyncPageView(TemplateResponseMixin, View):
+    """
+    Conditional GET, anonymous page caching and pagination for async views:
+    the same behaviour as `ConditionalPageMixin`, `AnonymousPageCacheMixin`
+    and `CursorPaginationMixin` give the synchronous ones, through the same
+    helpers of `boards.caching`. Subclasses define the coroutine
+    `get_context_data()`.
+    """
+    paginate_by = None
+    cursor_ordering = None
+
+    def get_cache_scopes(self):
+        return [('site', 0)]
+
+    def get_reader_scopes(self, request):
+        return []
+
+    async def on_page_cache_hit(self, request):
+        pass
+
+    async def on_not_modified(self, request):
+        pass
+
+    async def paginate_queryset(self, queryset):
+        request = self.request
+        if settings.BOARDS_CURSOR_PAGINATION and not request.GET.get('page'):
+            paginator = CursorPaginator(queryset, self.cursor_ordering, self.paginate_by)
+            page = await paginator.apage(request.GET.get('cursor'))
+        else:
+            paginator = Paginator(queryset, self.paginate_by)
+            paginator.count = await queryset.acount()
+            page_number = request.GET.get('page') or 1
+            if page_number == 'last':
+                page_number = paginator.num_pages
+            try:
+                page = paginator.page(page_number)
+            except InvalidPage as e:
+                raise Http404('Invalid page: {}'.format(e))
+            page.object_list = [obj async for obj in page.object_list]
+        return {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+        }
+
+    async def get(self, request, *args, **kwargs):
+        # Resolve the user once, asynchronously; the templates read request.user.
+        request.user = await request.auser()
+        generations = await aget_generations(*self.get_cache_scopes())
+        etag, last_modified = await aget_validators(self, request, generations)
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = await self.render_page(request, generations)
+            if response.status_code != 200:
+                return response
+        else:
+            await self.on_not_modified(request)
+        set_validators(request, response, etag, last_modified)
+        return response
+
+    async def render_page(self, request, generations):
+        if not is_page_cacheable(request):
+            return await self.render_context(generations)
+        key = page_cache_key(request, generations)
+        cached = await cache.aget(key)
+        if cached is not None:
+            await self.on_page_cache_hit(request)
+            return cached_page_response(cached)
+        response = await self.render_context(generations)
+        # The template is rendered after the view returns, in a worker thread.
+        cache_page_when_rendered(response, key)
+        return response
+
+    async def render_context(self, generations):
+        context = await self.get_context_data()
+        context.update({
+            'view': self,
+            'cache_generation': generations,
+            'fragment_cache_timeout': settings.BOARDS_FRAGMENT_CACHE_TIMEOUT,
+        })
+        return self.render_to_response(context)
+
+
+class BoardListHome(AsyncPageView):
+    template_name = "home.html"
+
+    async def get_context_data(self):
+        if settings.BOARDS_DENORMALIZED_STATS:
+            boards = [board async for board in Board.objects.select_related('stats__last_post_author').aiterator()]
+        else:
+            boards = await sync_to_async(attach_board_stats)(Board.objects.with_stats())
+        return {'boards': boards, 'object_list': boards}
+
+
+class TopicListView(AsyncPageView):
+    template_name = "topics.html"
+    paginate_by = 20
+    cursor_ordering = ("-last_update", "-id")
+
+    def get_cache_scopes(self):
+        return [('board', self.kwargs.get('pk'))]
+
+    def get_reader_scopes(self, request):
+        return [('reads', request.user.pk)] if request.user.is_authenticated else []
+
+    async def get_context_data(self):
+        board = await aget_object_or_404(Board, pk=self.kwargs.get('pk'))
+        queryset = board.topics.select_related("starter").order_by("-last_update").with_replies()
+        if self.request.user.is_authenticated:
+            queryset = queryset.with_unread(self.request.user)
+        context = await self.paginate_queryset(queryset)
+        context.update({'board': board, 'topics': context['object_list']})
+        return context
+
+
+class PostListView(AsyncPageView):
+    template_name = "topic_posts.html"
+    paginate_by = 20
+    cursor_ordering = ("created_at", "id")
+
+    def get_cache_scopes(self):
+        return [('board', self.kwargs.get('pk')), ('topic', self.kwargs.get('topic_pk'))]
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        # A returning reader starts at the first post they have not read.
+        self.read_marker, url = await sync_to_async(get_unread_redirect)(
+            request, self.kwargs.get('pk'), self.kwargs.get('topic_pk'), self.paginate_by
+        )
+        if url is not None:
+            return HttpResponseRedirect(url)
+        response = await super().get(request, *args, **kwargs)
+        save_viewed_topics(request, response)
+        return response
+
+    async def on_page_cache_hit(self, request):
+        await sync_to_async(record_view_once)(request, self.kwargs.get('topic_pk'))
+
+    async def on_not_modified(self, request):
+        await sync_to_async(record_view_once)(request, self.kwargs.get('topic_pk'))
+
+    async def get_context_data(self):
+        try:
+            topic = await Topic.objects.select_related('board').aget(
+                board_id=self.kwargs.get('pk'), pk=self.kwargs.get('topic_pk')
+            )
+        except Topic.DoesNotExist:
+            raise Http404('No Topic matches the given query.')
+        queryset = topic.posts.select_related('created_by').order_by('created_at')
+        context = await self.paginate_queryset(queryset)
+        # One thread hop for all the synchronous reader bookkeeping.
+        posts, subscribed = await sync_to_async(prepare_topic_page)(
+            self.request, topic, context['object_list'], self.read_marker
+        )
+        context.update({'topic': topic, 'posts': posts, 'object_list': posts, 'subscribed': subscribed})
+        return context
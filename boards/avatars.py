@@ -0,0 +1,69 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+DEFAULT_SIZE = 256
+
+
+def gravatar_url(email, size=DEFAULT_SIZE):
+    return 'https://www.gravatar.com/avatar/{md5}?{params}'.format(
+        md5=hashlib.md5(email.lower().encode('utf-8')).hexdigest(),
+        params=urlencode({'d': 'mm', 's': str(size)})
+    )
+
+
+class AvatarCache:
+    """
+    Least recently used map of user id to `(email, {size: url})`, bounded to
+    `maxsize` users. An entry is only used while the email it was built from
+    matches the user's, so a changed address is never served a stale URL.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, user, size=DEFAULT_SIZE):
+        if user.pk is None or not self.maxsize:
+            return gravatar_url(user.email, size)
+        with self.lock:
+            entry = self.entries.get(user.pk)
+            if entry is not None and entry[0] == user.email:
+                self.entries.move_to_end(user.pk)
+                url = entry[1].get(size)
+                if url is not None:
+                    return url
+        url = gravatar_url(user.email, size)
+        with self.lock:
+            entry = self.entries.get(user.pk)
+            if entry is None or entry[0] != user.email:
+                entry = self.entries[user.pk] = (user.email, {})
+            entry[1][size] = url
+            self.entries.move_to_end(user.pk)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return url
+
+    def forget(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+avatar_cache = AvatarCache(settings.GRAVATAR_CACHE_SIZE)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_avatar(sender, instance, **kwargs):
+    avatar_cache.forget(instance.pk)
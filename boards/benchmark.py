@@ -0,0 +1,122 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+
+from boards.models import Board, Post, Topic
+
+BATCH_SIZE = 1000
+BENCHMARK_PASSWORD = 'benchmark'
+WORDS = (
+    'django python board topic reply template query index cache session migration view model '
+    'form admin static deploy server request response thread page markdown search count'
+).split()
+
+
+@contextmanager
+def scratch_database():
+    """
+    Point the default SQLite connection at a migrated temporary file for the
+    duration of the block, leaving the configured database untouched.
+    """
+    fd, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    original_name = connection.settings_dict['NAME']
+    connections.close_all()
+    connection.settings_dict['NAME'] = path
+    try:
+        call_command('migrate', verbosity=0)
+        yield path
+    finally:
+        connections.close_all()
+        connection.settings_dict['NAME'] = original_name
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+@contextmanager
+def scratch_cache():
+    """
+    Move the default cache to a file in a temporary directory for the
+    duration of the block, so the pages and counters of the scratch
+    database never reach the configured cache.
+    """
+    directory = tempfile.mkdtemp()
+    caches = {'default': {
+        'BACKEND': 'djangoProject1.cache.SQLiteCache',
+        'OPTIONS': settings.CACHES['default'].get('OPTIONS', {}),
+        'LOCATION': os.path.join(directory, 'cache.sqlite3'),
+    }}
+    try:
+        with override_settings(CACHES=caches):
+            yield
+    finally:
+        shutil.rmtree(directory)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def random_text(rng, min_words, max_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def seed_forum(boards, topics_per_board, posts_per_topic, users, seed=0, stdout=None):
+    """
+    Fill the database with a synthetic forum using bulk inserts. The same
+    arguments and seed always produce the same content. Returns the number of
+    posts created.
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)
+    with transaction.atomic():
+        user_objects = User.objects.bulk_create(
+            [User(username='bench{}'.format(i), email='bench{}@example.com'.format(i), password=password)
+             for i in range(users)],
+            batch_size=BATCH_SIZE,
+        )
+        board_objects = Board.objects.bulk_create(
+            [Board(name='Board {}'.format(i), description=random_text(rng, 3, 10)) for i in range(boards)],
+            batch_size=BATCH_SIZE,
+        )
+    posts_created = 0
+    for board in board_objects:
+        with transaction.atomic():
+            topic_objects = Topic.objects.bulk_create(
+                [Topic(subject=random_text(rng, 2, 8), board=board, starter=rng.choice(user_objects))
+                 for _ in range(topics_per_board)],
+                batch_size=BATCH_SIZE,
+            )
+            batch = []
+            for topic in topic_objects:
+                for _ in range(posts_per_topic):
+                    post = Post(message=random_text(rng, 5, 120), topic=topic, created_by=rng.choice(user_objects))
+                    post.render_message()
+                    batch.append(post)
+                    if len(batch) >= BATCH_SIZE:
+                        Post.objects.bulk_create(batch)
+                        posts_created += len(batch)
+                        batch = []
+            Post.objects.bulk_create(batch)
+            posts_created += len(batch)
+        if stdout is not None:
+            stdout.write('Seeded {} ({} posts so far)'.format(board.name, posts_created))
+    # bulk_create skips the signal receivers that maintain these.
+    call_command('rebuild_board_stats', stdout=stdout or io.StringIO())
+    call_command('rebuild_search_index', stdout=io.StringIO())
+    return posts_created
@@ -0,0 +1,263 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from boards.models import Board, Post, Topic
+from djangoProject1.cache import Namespace
+
+GENERATIONS = Namespace('boards:gen')
+PAGES = Namespace('boards:page')
+LAST_MODIFIED = Namespace('boards:lastmod', version=2)
+
+
+def generation_key(kind, pk):
+    return GENERATIONS.key(kind, pk)
+
+
+def new_generation():
+    """
+    First number of a generation that is missing from the cache. The cache
+    evicts cold keys and can be cleared, so a counter that restarted at 1
+    would repeat numbers that pages, fragments and ETags were stored under.
+    """
+    return time.time_ns()
+
+
+def get_generations(*scopes):
+    """
+    Current generation number of each `(kind, pk)` scope, e.g. ('topic', 3).
+    Cached content includes these numbers in its key, so bumping a generation
+    invalidates everything rendered from that scope.
+    """
+    keys = [generation_key(kind, pk) for kind, pk in scopes]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            generation = new_generation()
+            cache.add(key, generation, timeout=None)
+            values[key] = cache.get(key, generation)
+    return '.'.join(str(values[key]) for key in keys)
+
+
+async def aget_generations(*scopes):
+    """Async version of `get_generations`."""
+    keys = [generation_key(kind, pk) for kind, pk in scopes]
+    values = await cache.aget_many(keys)
+    for key in keys:
+        if key not in values:
+            generation = new_generation()
+            await cache.aadd(key, generation, timeout=None)
+            values[key] = await cache.aget(key, generation)
+    return '.'.join(str(values[key]) for key in keys)
+
+
+def _increment(key):
+    if not cache.add(key, new_generation(), timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, new_generation(), timeout=None)
+
+
+def bump_generation(kind, pk):
+    key = generation_key(kind, pk)
+    _increment(key)
+    # Bump again once the write is visible: a page rendered from the old data
+    # while the transaction was open must not stay cached under the new number.
+    transaction.on_commit(lambda: _increment(key))
+
+
+def is_page_cacheable(request):
+    return bool(
+        settings.BOARDS_PAGE_CACHE_TIMEOUT
+        and request.method == 'GET'
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def page_cache_key(request, generations):
+    path_hash = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+    return PAGES.key(generations, path_hash)
+
+
+def last_modified_key(request, generations):
+    return LAST_MODIFIED.key(generations, hashlib.md5(request.path.encode('utf-8')).hexdigest())
+
+
+def make_etag(request, generations):
+    """
+    ETag for the page at `request` as seen by `request.user`. Pages embed
+    the CSRF token in their forms and login rotates it, so the CSRF secret
+    is part of the tag: a copy from before the login is not reused.
+    """
+    user_id = request.user.pk if request.user.is_authenticated else 0
+    parts = [generations, str(user_id), request.META.get('CSRF_COOKIE', ''), request.get_full_path()]
+    return quote_etag(hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest())
+
+
+def set_validators(request, response, etag, last_modified):
+    response.headers.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.headers.setdefault('Last-Modified', http_date(int(last_modified.timestamp())))
+    # Let browsers and the proxy store the page but revalidate every time.
+    patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+
+
+def conditional_response(request, etag, last_modified):
+    """A 304 response when the client's copy is current, otherwise None."""
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def join_generations(generations, reader_generations):
+    return '{}.{}'.format(generations, reader_generations)
+
+
+def get_validators(view, request, generations):
+    """
+    `(etag, last_modified)` of the page `view` renders for `request`, from
+    the `generations` of its cache scopes and of its `get_reader_scopes`.
+    Last-Modified is the time these generations were first seen, so it
+    moves with every change that moves the ETag.
+    """
+    reader_scopes = view.get_reader_scopes(request)
+    if reader_scopes:
+        generations = join_generations(generations, get_generations(*reader_scopes))
+    key = last_modified_key(request, generations)
+    last_modified = cache.get(key)
+    if last_modified is None:
+        cache.add(key, timezone.now(), settings.BOARDS_FRAGMENT_CACHE_TIMEOUT)
+        last_modified = cache.get(key) or timezone.now()
+    return make_etag(request, generations), last_modified
+
+
+async def aget_validators(view, request, generations):
+    """Async version of `get_validators`."""
+    reader_scopes = view.get_reader_scopes(request)
+    if reader_scopes:
+        generations = join_generations(generations, await aget_generations(*reader_scopes))
+    key = last_modified_key(request, generations)
+    last_modified = await cache.aget(key)
+    if last_modified is None:
+        await cache.aadd(key, timezone.now(), settings.BOARDS_FRAGMENT_CACHE_TIMEOUT)
+        last_modified = await cache.aget(key) or timezone.now()
+    return make_etag(request, generations), last_modified
+
+
+def cached_page_response(cached):
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+def cache_page_when_rendered(response, key):
+    """Store the page under `key` once the template response has been rendered."""
+    response.add_post_render_callback(
+        lambda response: cache.set(
+            key, (response.content, response['Content-Type']), settings.BOARDS_PAGE_CACHE_TIMEOUT
+        )
+    )
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serve whole pages from the cache to readers without a session cookie, so
+    a hit costs two cache reads and no database queries. Logged-in readers
+    get the page rendered, with fragments cached by generation in the templates.
+    """
+
+    def get_cache_scopes(self):
+        return [('site', 0)]
+
+    def is_page_cacheable(self, request):
+        return is_page_cacheable(request)
+
+    def on_page_cache_hit(self, request):
+        pass
+
+    def get_context_data(self, **kwargs):
+        kwargs['cache_generation'] = get_generations(*self.get_cache_scopes())
+        kwargs['fragment_cache_timeout'] = settings.BOARDS_FRAGMENT_CACHE_TIMEOUT
+        return super().get_context_data(**kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, get_generations(*self.get_cache_scopes()))
+        cached = cache.get(key)
+        if cached is not None:
+            self.on_page_cache_hit(request)
+            return cached_page_response(cached)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            cache_page_when_rendered(response, key)
+        return response
+
+
+class ConditionalPageMixin:
+    """
+    Answer `If-None-Match` / `If-Modified-Since` with 304 Not Modified before
+    the page is rendered. The ETag combines the cache generations, the
+    reader and the URL, and Last-Modified is when those generations were
+    first seen; neither costs a query. Pages that show per-reader state add
+    its scopes with `get_reader_scopes`.
+    """
+
+    def get_cache_scopes(self):
+        return [('site', 0)]
+
+    def get_reader_scopes(self, request):
+        return []
+
+    def on_not_modified(self, request):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = get_validators(self, request, get_generations(*self.get_cache_scopes()))
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        else:
+            self.on_not_modified(request)
+        set_validators(request, response, etag, last_modified)
+        return response
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def invalidate_board(sender, instance, **kwargs):
+    bump_generation('site', 0)
+    bump_generation('board', instance.pk)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def invalidate_topic(sender, instance, **kwargs):
+    bump_generation('site', 0)
+    bump_generation('board', instance.board_id)
+    bump_generation('topic', instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    bump_generation('site', 0)
+    bump_generation('topic', instance.topic_id)
+    if Post.topic.is_cached(instance):
+        board_id = instance.topic.board_id
+    else:
+        board_id = Topic.objects.filter(pk=instance.topic_id).values_list('board_id', flat=True).first()
+    if board_id is not None:
+        bump_generation('board', board_id)
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from djangoProject1.cache import Namespace
+
+UPDATE_BATCH_SIZE = 500
+VIEWS = Namespace('boards:topic_views')
+
+
+class LocalViewBuffer:
+    """Buffers topic view increments in the memory of the current process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+
+    def add(self, topic_id):
+        with self.lock:
+            self.pending[topic_id] += 1
+            return len(self.pending)
+
+    def get(self, topic_id):
+        return self.pending.get(topic_id, 0)
+
+    def drain(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        return pending
+
+    def acknowledge(self, pending):
+        pass
+
+
+class CacheViewBuffer:
+    """
+    Buffers topic view increments in the default cache, so every process that
+    shares the cache also shares the buffer.
+
+    Each topic has its own counter, changed only with add/incr/decr. The
+    topics with pending views are listed in numbered slots: the first view
+    after a flush takes the next slot number with incr, so no two processes
+    ever rewrite the same list. One flush at a time reads the slots from the
+    last flushed number on, under a lock key.
+    """
+    slots_key = VIEWS.key('slots')
+    flushed_key = VIEWS.key('flushed')
+    lock_key = VIEWS.key('lock')
+    lock_timeout = 60
+
+    def key(self, topic_id):
+        return VIEWS.key(topic_id)
+
+    def listed_key(self, topic_id):
+        return VIEWS.key('listed', topic_id)
+
+    def slot_key(self, number):
+        return VIEWS.key('slot', number)
+
+    def increment(self, key, delta=1):
+        # The key may have been evicted between the two calls.
+        while not cache.add(key, delta, timeout=None):
+            try:
+                return cache.incr(key, delta)
+            except ValueError:
+                pass
+        return delta
+
+    def add(self, topic_id):
+        """Count one view; returns the number of topics pending, or 0 if unchanged."""
+        self.increment(self.key(topic_id))
+        # The listing expires, so a topic whose slot was lost to a race with a
+        # drain, or to eviction, is listed again within a minute.
+        if not cache.add(self.listed_key(topic_id), True, timeout=self.lock_timeout):
+            return 0
+        number = self.increment(self.slots_key)
+        cache.set(self.slot_key(number), topic_id, timeout=None)
+        return number - cache.get(self.flushed_key, 0)
+
+    def get(self, topic_id):
+        return cache.get(self.key(topic_id), 0)
+
+    def drain(self):
+        if not cache.add(self.lock_key, True, timeout=self.lock_timeout):
+            # Another process is flushing.
+            return Counter()
+        flushed = cache.get(self.flushed_key, 0)
+        last = cache.get(self.slots_key, 0)
+        slots = cache.get_many([self.slot_key(number) for number in range(flushed + 1, last + 1)])
+        topic_ids = list(dict.fromkeys(slots.values()))
+        if not topic_ids:
+            cache.delete(self.lock_key)
+            return Counter()
+        # Unlist before reading the counts: a view that arrives from here on
+        # lists its topic again, and is either read now or by the next flush.
+        cache.delete_many([self.listed_key(topic_id) for topic_id in topic_ids])
+        cache.delete_many(list(slots))
+        cache.set(self.flushed_key, last, timeout=None)
+        counts = cache.get_many([self.key(topic_id) for topic_id in topic_ids])
+        return Counter({topic_id: counts.get(self.key(topic_id), 0) for topic_id in topic_ids})
+
+    def acknowledge(self, pending):
+        # Subtract what was written instead of deleting the keys, so views that
+        # arrived during the flush stay buffered. Only called after a drain
+        # that took the lock and returned topics.
+        for topic_id, count in pending.items():
+            if count:
+                try:
+                    cache.decr(self.key(topic_id), count)
+                except ValueError:
+                    # Evicted since the drain; the written views are gone with it.
+                    pass
+        cache.delete(self.lock_key)
+
+
+BUFFERS = {
+    'local': LocalViewBuffer,
+    'cache': CacheViewBuffer,
+}
+
+_buffers = {}
+_last_flush = time.monotonic()
+
+
+def get_buffer():
+    name = settings.TOPIC_VIEWS_BUFFER
+    if name not in _buffers:
+        _buffers[name] = BUFFERS[name]()
+    return _buffers[name]
+
+
+def record_topic_view(topic_id):
+    """Count one view of a topic without writing to the database."""
+    size = get_buffer().add(topic_id)
+    elapsed = time.monotonic() - _last_flush
+    if size >= settings.TOPIC_VIEWS_MAX_BUFFER or elapsed >= settings.TOPIC_VIEWS_FLUSH_INTERVAL:
+        flush_topic_views()
+
+
+def pending_topic_views(topic_id):
+    return get_buffer().get(topic_id)
+
+
+def flush_topic_views():
+    """
+    Write the buffered increments with one `UPDATE ... SET views = views + n`
+    per distinct increment, and return the number of topics updated.
+    """
+    from boards import trending
+    from boards.models import Topic
+
+    global _last_flush
+    _last_flush = time.monotonic()
+    buffer = get_buffer()
+    pending = buffer.drain()
+    by_increment = defaultdict(list)
+    for topic_id, count in pending.items():
+        if count > 0:
+            by_increment[count].append(topic_id)
+    for count, topic_ids in by_increment.items():
+        for start in range(0, len(topic_ids), UPDATE_BATCH_SIZE):
+            Topic.objects.filter(pk__in=topic_ids[start:start + UPDATE_BATCH_SIZE]).update(
+                views=F('views') + count
+            )
+    if pending:
+        buffer.acknowledge(pending)
+    trending.record_views(pending)
+    return sum(len(topic_ids) for topic_ids in by_increment.values())
@@ -0,0 +1,160 @@
+import asyncio
+import io
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from boards.benchmark import percentile, scratch_database, seed_forum
+from boards.models import Board, Topic
+
+HOST = '127.0.0.1'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic forum in a scratch database and serve the board, topic and post list '
+        'pages through the WSGI entry point (sync views, one thread per in-flight request) and '
+        'the ASGI entry point (async views, one event loop) in-process at the same concurrency, '
+        'reporting latency percentiles and throughput for each.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=5)
+        parser.add_argument('--topics', type=int, default=50, help='Topics per board.')
+        parser.add_argument('--posts', type=int, default=20, help='Posts per topic.')
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=300, help='Requests per page and entry point.')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--page-cache', action='store_true',
+                            help='Keep the anonymous page cache on; by default every request renders.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+
+    def handle(self, *args, **options):
+        from djangoProject1.asgi import application as asgi_application
+        from djangoProject1.wsgi import application as wsgi_application
+
+        overrides = {} if options['page_cache'] else {'BOARDS_PAGE_CACHE_TIMEOUT': 0}
+        results = {}
+        with scratch_database(), override_settings(**overrides):
+            seed_forum(options['boards'], options['topics'], options['posts'], options['users'], options['seed'])
+            for name, paths in self.get_paths(options).items():
+                results[name] = {
+                    'wsgi': self.run_wsgi(wsgi_application, paths, options['concurrency']),
+                    'asgi': asyncio.run(self.run_asgi(asgi_application, paths, options['concurrency'])),
+                }
+                for entry_point in ('wsgi', 'asgi'):
+                    metrics = self.format_metrics(results[name][entry_point])
+                    self.stdout.write('{} {}: {}'.format(name, entry_point, metrics))
+            connection.close()
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'options': options, 'pages': results}, output, indent=2, sort_keys=True, default=str)
+
+    def get_paths(self, options):
+        rng = random.Random(options['seed'])
+        board_ids = list(Board.objects.values_list('pk', flat=True))
+        topics = list(Topic.objects.values_list('board_id', 'pk'))
+        count = options['requests']
+        return {
+            'home': [reverse('home')] * count,
+            'topic_list': [reverse('board_topics', kwargs={'pk': rng.choice(board_ids)}) for _ in range(count)],
+            'post_list': [
+                reverse('topic_posts', kwargs={'pk': board_id, 'topic_pk': topic_id})
+                for board_id, topic_id in (rng.choice(topics) for _ in range(count))
+            ],
+        }
+
+    def run_wsgi(self, application, paths, concurrency):
+        def call(path):
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': HOST,
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': HOST,
+                'wsgi.version': (1, 0),
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            statuses = []
+            start = time.perf_counter()
+            response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+            try:
+                b''.join(response)
+            finally:
+                response.close()
+            return time.perf_counter() - start, int(statuses[0].split()[0])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(call, paths))
+        return self.summarize(samples, time.perf_counter() - start)
+
+    async def run_asgi(self, application, paths, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(path):
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode('ascii'),
+                'query_string': b'',
+                'headers': [(b'host', HOST.encode('ascii'))],
+                'client': (HOST, 0),
+                'server': (HOST, 80),
+            }
+            received = []
+            messages = []
+
+            async def receive():
+                if not received:
+                    received.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The client stays connected; Django cancels this once it has responded.
+                await asyncio.Event().wait()
+
+            async def send(message):
+                messages.append(message)
+
+            async with semaphore:
+                start = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - start, messages[0]['status']
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(call(path) for path in paths))
+        return self.summarize(samples, time.perf_counter() - start)
+
+    def summarize(self, samples, wall):
+        latencies = sorted(latency for latency, status in samples)
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for latency, status in samples if status >= 400),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3),
+            'throughput_rps': round(len(samples) / wall, 2),
+        }
+
+    def format_metrics(self, metrics):
+        return ('p50 {p50_ms} ms, p95 {p95_ms} ms, p99 {p99_ms} ms, max {max_ms} ms, '
+                '{throughput_rps} req/s, {errors} errors').format(**metrics)
@@ -0,0 +1,166 @@
+import json
+import platform
+import random
+import subprocess
+import threading
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from boards.benchmark import percentile, scratch_cache, scratch_database, seed_forum
+from boards.models import Board, Topic
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_mean')
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic forum in a scratch database and cache, drive the main pages with concurrent '
+        'clients and report latency percentiles, throughput and query counts per endpoint.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--topics', type=int, default=100, help='Topics per board.')
+        parser.add_argument('--posts', type=int, default=20, help='Posts per topic.')
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', help='A previous --output file to compare against.')
+
+    def handle(self, *args, **options):
+        with scratch_database(), scratch_cache():
+            seed_forum(options['boards'], options['topics'], options['posts'], options['users'], options['seed'])
+            self.board_ids = list(Board.objects.values_list('pk', flat=True))
+            self.topics = list(Topic.objects.values_list('board_id', 'pk'))
+            self.users = list(User.objects.order_by('pk')[:options['concurrency']])
+            endpoints = {}
+            for name, make_request, login in self.get_scenarios():
+                endpoints[name] = self.run_endpoint(make_request, login, options)
+                self.stdout.write('{}: {}'.format(name, self.format_metrics(endpoints[name])))
+
+        results = {
+            'meta': {
+                'commit': self.get_commit(),
+                'settings': settings.SETTINGS_MODULE,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'forum': {key: options[key] for key in ('boards', 'topics', 'posts', 'users', 'seed')},
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'endpoints': endpoints,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                self.compare(json.load(baseline), results)
+
+    def get_scenarios(self):
+        """(name, request function, needs login) for every endpoint under test."""
+
+        def home(client, rng):
+            return client.get(reverse('home'))
+
+        def topic_list(client, rng):
+            return client.get(reverse('board_topics', kwargs={'pk': rng.choice(self.board_ids)}))
+
+        def post_list(client, rng):
+            board_id, topic_id = rng.choice(self.topics)
+            return client.get(reverse('topic_posts', kwargs={'pk': board_id, 'topic_pk': topic_id}))
+
+        def reply(client, rng):
+            board_id, topic_id = rng.choice(self.topics)
+            url = reverse('reply_topic', kwargs={'pk': board_id, 'topic_pk': topic_id})
+            return client.post(url, {'message': 'Benchmark reply'})
+
+        def new_topic(client, rng):
+            url = reverse('new_topic', kwargs={'pk': rng.choice(self.board_ids)})
+            return client.post(url, {'subject': 'Benchmark topic', 'message': 'Benchmark message'})
+
+        return (
+            ('home', home, False),
+            ('topic_list', topic_list, False),
+            ('post_list', post_list, False),
+            ('reply_topic', reply, True),
+            ('new_topic', new_topic, True),
+        )
+
+    def run_endpoint(self, make_request, login, options):
+        latencies, queries = [], []
+        errors = []
+        lock = threading.Lock()
+        per_client = options['requests'] // options['concurrency']
+
+        def client_loop(index):
+            rng = random.Random(options['seed'] + index)
+            client = Client(HTTP_HOST='127.0.0.1')
+            if login:
+                client.force_login(self.users[index % len(self.users)])
+            for _ in range(per_client):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = make_request(client, rng)
+                    elapsed = time.perf_counter() - start
+                with lock:
+                    if response.status_code >= 400:
+                        errors.append(response.status_code)
+                    latencies.append(elapsed)
+                    queries.append(len(captured))
+            connection.close()
+
+        threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(options['concurrency'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': len(errors),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'throughput_rps': round(len(latencies) / wall, 2),
+            'queries_mean': round(sum(queries) / len(queries), 2),
+            'queries_max': max(queries),
+        }
+
+    def format_metrics(self, metrics):
+        return ('p50 {p50_ms} ms, p95 {p95_ms} ms, p99 {p99_ms} ms, {throughput_rps} req/s, '
+                '{queries_mean} queries (max {queries_max}), {errors} errors').format(**metrics)
+
+    def compare(self, baseline, results):
+        self.stdout.write('Compared with {}:'.format(baseline['meta'].get('commit') or 'baseline'))
+        for name, metrics in results['endpoints'].items():
+            before = baseline['endpoints'].get(name)
+            if before is None:
+                continue
+            changes = []
+            for metric in METRICS:
+                if before.get(metric):
+                    change = (metrics[metric] - before[metric]) / before[metric] * 100
+                    changes.append('{} {:+.1f}%'.format(metric, change))
+            self.stdout.write('  {}: {}'.format(name, ', '.join(changes)))
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+from django.utils import timezone
+
+from boards.benchmark import percentile, scratch_database
+from boards.models import Board, Post, Topic
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure reply throughput with concurrent writers and readers on a scratch copy of the '
+        'schema. Run it once per settings module to compare, e.g. '
+        '--settings=djangoProject1.settings_production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8)
+        parser.add_argument('--replies', type=int, default=100, help='Replies per client.')
+        parser.add_argument('--readers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write('This benchmark only supports SQLite.')
+            return
+        with scratch_database():
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+            user = User.objects.create_user(username='benchmark')
+            board = Board.objects.create(name='Benchmark', description='Benchmark board.')
+            topic = Topic.objects.create(subject='Benchmark', board=board, starter=user)
+            connections.close_all()
+            result = self.run_clients(topic, user, options)
+
+        latencies = sorted(result['latencies'])
+        self.stdout.write('journal_mode: {}'.format(journal_mode))
+        self.stdout.write('clients: {clients} x {replies} replies, {readers} readers'.format(**options))
+        self.stdout.write('replies committed: {}'.format(len(latencies)))
+        self.stdout.write('"database is locked" errors: {}'.format(result['errors']))
+        self.stdout.write('throughput: {:.1f} replies/s'.format(len(latencies) / result['elapsed']))
+        if latencies:
+            self.stdout.write('latency p50: {:.2f} ms, p95: {:.2f} ms'.format(
+                percentile(latencies, 0.5) * 1000, percentile(latencies, 0.95) * 1000
+            ))
+        self.stdout.write('reads during run: {}'.format(result['reads']))
+
+    def run_clients(self, topic, user, options):
+        latencies = []
+        counters = {'errors': 0, 'reads': 0}
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def reply():
+            try:
+                for i in range(options['replies']):
+                    start = time.perf_counter()
+                    try:
+                        # Same writes as boards.views.reply_topic.
+                        with transaction.atomic():
+                            Post.objects.create(message='Reply {}'.format(i), topic=topic, created_by=user)
+                            Topic.objects.filter(pk=topic.pk).update(last_update=timezone.now())
+                    except OperationalError:
+                        with lock:
+                            counters['errors'] += 1
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+            finally:
+                connection.close()
+
+        def read():
+            try:
+                while not done.is_set():
+                    try:
+                        list(topic.posts.order_by('-created_at')[:20])
+                    except OperationalError:
+                        continue
+                    with lock:
+                        counters['reads'] += 1
+            finally:
+                connection.close()
+
+        writers = [threading.Thread(target=reply) for _ in range(options['clients'])]
+        readers = [threading.Thread(target=read) for _ in range(options['readers'])]
+        start = time.perf_counter()
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        for thread in readers:
+            thread.join()
+        return {'latencies': latencies, 'elapsed': elapsed, **counters}
@@ -0,0 +1,70 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from boards.benchmark import percentile, scratch_database
+
+ENGINES = ('django.contrib.sessions.backends.db', 'django.contrib.sessions.backends.cached_db')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare session read latency of database-backed and cached_db sessions, against a '
+        'scratch database and a scratch SQLite cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=500)
+        parser.add_argument('--reads', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp()
+        caches = {'default': {
+            'BACKEND': 'djangoProject1.cache.SQLiteCache',
+            'LOCATION': os.path.join(directory, 'cache.sqlite3'),
+            'OPTIONS': {'MAX_ENTRIES': options['sessions'] * 2},
+        }}
+        try:
+            with scratch_database(), override_settings(CACHES=caches):
+                for engine in ENGINES:
+                    self.stdout.write('{}: {}'.format(engine.rsplit('.', 1)[-1], self.run_engine(engine, options)))
+                connection.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def run_engine(self, engine, options):
+        store = import_module(engine).SessionStore
+        keys = []
+        for i in range(options['sessions']):
+            session = store()
+            session.update({'_auth_user_id': str(i), '_auth_user_backend': 'benchmark', '_auth_user_hash': '0' * 64})
+            session.create()
+            keys.append(session.session_key)
+
+        rng = random.Random(options['seed'])
+        latencies = []
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            for _ in range(options['reads']):
+                session = store(session_key=rng.choice(keys))
+                start = time.perf_counter()
+                session.load()
+                latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        return 'p50 {:.3f} ms, p95 {:.3f} ms, p99 {:.3f} ms, {:.2f} queries/read'.format(
+            percentile(latencies, 0.5), percentile(latencies, 0.95), percentile(latencies, 0.99),
+            len(queries) / options['reads'],
+        )
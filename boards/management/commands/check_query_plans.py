@@ -0,0 +1,131 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from boards import trending, unread
+from boards.benchmark import scratch_database, seed_forum
+from boards.models import Board, BoardStats, Topic, attach_author_post_counts
+
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+EXPLAINED_RE = re.compile(r'^\s*(SELECT|UPDATE|DELETE)\b', re.IGNORECASE)
+LIMIT_RE = re.compile(r'\bLIMIT \d+$')
+# Listing every board is what the home page is for; subqueries are not tables.
+FULL_SCAN_ALLOWED = ('boards_board', 'subquery')
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the hot queries of boards.views and boards.models against a small seeded scratch '
+        'database, print EXPLAIN QUERY PLAN for each, and fail if any of them scans a whole table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every query.')
+        parser.add_argument('--strict', action='store_true', help='Also fail on temporary B-tree sorts.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('EXPLAIN QUERY PLAN checks only support SQLite.')
+        # Keep the scratch pages out of the real cache.
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with scratch_database(), override_settings(CACHES=caches, TOPIC_VIEWS_BUFFER='local'):
+            seed_forum(boards=3, topics_per_board=30, posts_per_topic=25, users=20)
+            queries = self.capture()
+            failures, warnings = self.explain(queries, options)
+            connection.close()
+
+        self.stdout.write('Checked {} queries: {} full table scans, {} temporary sorts.'.format(
+            len(queries), len(failures), len(warnings)
+        ))
+        if failures or (options['strict'] and warnings):
+            raise CommandError('Query plan check failed.')
+        self.stdout.write(self.style.SUCCESS('No full table scans.'))
+
+    def capture(self):
+        """Run every scenario and return `(scenario, sql)` for the queries worth explaining."""
+        queries = []
+        for name, scenario in self.get_scenarios():
+            with CaptureQueriesContext(connection) as captured:
+                scenario()
+            queries.extend((name, query['sql']) for query in captured if EXPLAINED_RE.match(query['sql']))
+        return queries
+
+    def get_scenarios(self):
+        board = Board.objects.order_by('pk').first()
+        topic = Topic.objects.filter(board=board).order_by('pk').first()
+        user = User.objects.order_by('pk').first()
+        topics_url = reverse('board_topics', kwargs={'pk': board.pk})
+        posts_url = reverse('topic_posts', kwargs={'pk': board.pk, 'topic_pk': topic.pk})
+        client = Client(HTTP_HOST='127.0.0.1')
+
+        def page(url):
+            return lambda: client.get(url)
+
+        def logged_in(url):
+            def get():
+                client.force_login(user)
+                client.get(url)
+                client.logout()
+            return get
+
+        return (
+            ('home', page(reverse('home'))),
+            ('topic list', page(topics_url)),
+            ('topic list, page 2', page(topics_url + '?page=2')),
+            ('topic list, logged in', logged_in(topics_url)),
+            ('post list', page(posts_url)),
+            ('post list, page 2', page(posts_url + '?page=2')),
+            ('post list, logged in', logged_in(posts_url)),
+            ('search', page(reverse('search') + '?q=django')),
+            ('trending', page(reverse('trending'))),
+            ('home, annotated stats', lambda: list(Board.objects.with_stats())),
+            ('BoardStats.refresh', lambda: BoardStats.objects.get(board=board).refresh()),
+            ('Board.get_posts_count', board.get_posts_count),
+            ('Board.get_last_post', board.get_last_post),
+            ('Topic.get_posts_count', topic.get_posts_count),
+            ('attach_author_post_counts', lambda: attach_author_post_counts(topic.posts.select_related('created_by'))),
+            ('update_trending', trending.update_from_posts),
+            ('reply', self.reply(client, user, board, topic)),
+            ('mark board read', lambda: unread.mark_board_read(user, board.pk)),
+        )
+
+    def reply(self, client, user, board, topic):
+        url = reverse('reply_topic', kwargs={'pk': board.pk, 'topic_pk': topic.pk})
+
+        def post():
+            client.force_login(user)
+            client.post(url, {'message': 'Query plan check'})
+            client.logout()
+        return post
+
+    def explain(self, queries, options):
+        failures, warnings = [], []
+        seen = set()
+        for name, sql in queries:
+            if sql in seen:
+                continue
+            seen.add(sql)
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plan = [row[3] for row in cursor.fetchall()]
+            sorts = [detail for detail in plan if 'USE TEMP B-TREE' in detail]
+            scans = [detail for detail in plan if FULL_SCAN_RE.match(detail)
+                     and FULL_SCAN_RE.match(detail).group(1) not in FULL_SCAN_ALLOWED]
+            if scans and not sorts and LIMIT_RE.search(sql):
+                # A primary key ordered walk that stops at the LIMIT, e.g. ORDER BY id DESC LIMIT n.
+                scans = []
+            if scans:
+                failures.append((name, sql))
+            if sorts:
+                warnings.append((name, sql))
+            if scans or sorts or options['verbose_plans']:
+                style = self.style.ERROR if scans else self.style.WARNING if sorts else str
+                self.stdout.write(style('[{}] {}'.format(name, sql[:500])))
+                for detail in plan:
+                    self.stdout.write('    ' + detail)
+        return failures, warnings
@@ -0,0 +1,24 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from boards.transfer import export_forum, open_dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Export users, boards, topics and posts as JSONL, one object per line, reading the '
+        'tables in primary key chunks. Paths ending in .gz are compressed; "-" writes to stdout.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['output'] == '-':
+            export_forum(sys.stdout, options['chunk_size'])
+            return
+        with open_dump(options['output'], 'w') as output:
+            written = export_forum(output, options['chunk_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Exported {} objects.'.format(written)))
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards.counters import flush_topic_views
+
+
+class Command(BaseCommand):
+    help = 'Write buffered topic view counts to the database.'
+
+    def handle(self, *args, **options):
+        if settings.TOPIC_VIEWS_BUFFER == 'local':
+            # This process has its own, empty buffer; the web workers flush theirs.
+            raise CommandError("TOPIC_VIEWS_BUFFER is 'local': only the process that buffered a view can flush it.")
+        updated = flush_topic_views()
+        self.stdout.write(self.style.SUCCESS('Flushed view counts for {} topics.'.format(updated)))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from boards.transfer import NATURAL_KEYS, ForumImporter, InvalidDump, open_dump
+
+MATCHED_SHOWN = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a JSONL dump written by export_forum with batched bulk inserts, remapping primary '
+        'and foreign keys. Progress is checkpointed in the database with every batch; running the '
+        'command again after an interruption resumes from the checkpoint.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help='Name of the checkpoint to resume from. Defaults to the input path.')
+        parser.add_argument('--render', action='store_true',
+                            help='Render the Markdown of every post now instead of on first view.')
+
+    def handle(self, *args, **options):
+        importer = ForumImporter(
+            batch_size=options['batch_size'],
+            checkpoint=options['checkpoint'] or options['input'],
+            render=options['render'],
+            stdout=self.stdout,
+        )
+        if importer.load_checkpoint():
+            self.stdout.write('Resuming after line {}.'.format(importer.position))
+        try:
+            with open_dump(options['input'], 'r') as stream:
+                counts = importer.run(stream)
+        except InvalidDump as e:
+            raise CommandError(e)
+        for label, names in importer.matched.items():
+            if names:
+                self.stdout.write(self.style.WARNING('Reused {} existing {} with the same {}: {}{}'.format(
+                    len(names), label, NATURAL_KEYS[label], ', '.join(names[:MATCHED_SHOWN]),
+                    ', ...' if len(names) > MATCHED_SHOWN else '',
+                )))
+        self.stdout.write(self.style.SUCCESS('Imported {}.'.format(
+            ', '.join('{} {}'.format(count, label) for label, count in counts.items())
+        )))
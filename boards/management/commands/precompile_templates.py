@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoProject1.templating import precompile_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile every template the template engines can find and report syntax errors. '
+        'Run on deploy to catch broken templates before the first request renders them.'
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        compiled, errors = precompile_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        for name, error in errors:
+            self.stderr.write('{}: {}'.format(name, error))
+        self.stdout.write('Compiled {} templates in {:.1f} ms.'.format(compiled, elapsed))
+        if errors:
+            raise CommandError('{} templates failed to compile.'.format(len(errors)))
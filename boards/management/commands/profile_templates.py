@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from boards.benchmark import scratch_database, seed_forum
+from boards.models import Topic
+from djangoProject1.templating import profile_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the main pages of a seeded scratch forum and report the time and queries spent '
+        'in each template and include, and the template variable lookups that hit the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=5)
+        parser.add_argument('--topics', type=int, default=30, help='Topics per board.')
+        parser.add_argument('--posts', type=int, default=20, help='Posts per topic.')
+        parser.add_argument('--limit', type=int, default=10, help='Rows per table.')
+
+    def handle(self, *args, **options):
+        # Cached pages would skip rendering altogether.
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with scratch_database(), override_settings(CACHES=caches, TOPIC_VIEWS_BUFFER='local'):
+            seed_forum(options['boards'], options['topics'], options['posts'], users=20)
+            topic = Topic.objects.order_by('pk').first()
+            client = Client(HTTP_HOST='127.0.0.1')
+            urls = (
+                reverse('home'),
+                reverse('board_topics', kwargs={'pk': topic.board_id}),
+                reverse('topic_posts', kwargs={'pk': topic.board_id, 'topic_pk': topic.pk}),
+            )
+            for url in urls:
+                with profile_templates() as profile:
+                    client.get(url)
+                self.write_report(url, profile.report(limit=options['limit']))
+            connection.close()
+
+    def write_report(self, url, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(url))
+        for section in ('templates', 'includes'):
+            for row in report[section]:
+                self.stdout.write('  {ms:>8.2f} ms {queries:>4} queries {calls:>4}x  {name}'.format(**row))
+        for row in report['lookups']:
+            self.stdout.write('  {queries:>4} queries  {{{{ {variable} }}}} in {template}'.format(**row))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from boards.models import Board, BoardStats, attach_board_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized per-board statistics from the posts and topics tables.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            BoardStats.objects.all().delete()
+            stats = [board.stats for board in attach_board_stats(Board.objects.with_stats())]
+            BoardStats.objects.bulk_create(stats, batch_size=500)
+        self.stdout.write(self.style.SUCCESS('Rebuilt stats for {} boards.'.format(len(stats))))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from boards.search import get_backend, iter_documents
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the topic and post search index, streaming rows in chunks. Each chunk is '
+        'committed on its own, so searches during the rebuild see a partial index.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        indexed = 0
+        backend.clear()
+        for documents in iter_documents(options['chunk_size']):
+            # Short write transactions, so replies are not locked out for the whole rebuild.
+            with transaction.atomic():
+                backend.index(documents)
+            indexed += len(documents)
+            self.stdout.write('Indexed {} documents...'.format(indexed))
+        self.stdout.write(self.style.SUCCESS('Indexed {} documents.'.format(indexed)))
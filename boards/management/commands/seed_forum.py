@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from boards.benchmark import seed_forum
+
+
+class Command(BaseCommand):
+    help = 'Populate the database with a synthetic forum for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--topics', type=int, default=100, help='Topics per board.')
+        parser.add_argument('--posts', type=int, default=20, help='Posts per topic.')
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        posts = seed_forum(
+            options['boards'], options['topics'], options['posts'], options['users'],
+            seed=options['seed'], stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS('Seeded {} posts.'.format(posts)))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from boards import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Add the replies posted since the last run to the trending ranking and drop topics that '
+        'have cooled down. Meant to run every few minutes.'
+    )
+
+    def handle(self, *args, **options):
+        counted = trending.update_from_posts()
+        pruned = trending.prune()
+        self.stdout.write(self.style.SUCCESS('Counted {} new posts, pruned {} topics.'.format(counted, pruned)))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_board_stats(apps, schema_editor):
+    Board = apps.get_model('boards', 'Board')
+    BoardStats = apps.get_model('boards', 'BoardStats')
+    Post = apps.get_model('boards', 'Post')
+    Topic = apps.get_model('boards', 'Topic')
+    for board in Board.objects.all():
+        posts = Post.objects.filter(topic__board=board)
+        last_post = posts.order_by('-created_at', '-pk').first()
+        BoardStats.objects.create(
+            board=board,
+            posts_count=posts.count(),
+            topics_count=Topic.objects.filter(board=board).count(),
+            last_post_id=last_post.pk if last_post else None,
+            last_post_topic_id=last_post.topic_id if last_post else None,
+            last_post_author_id=last_post.created_by_id if last_post else None,
+            last_post_at=last_post.created_at if last_post else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_rename_start_topic_starter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='views',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='boards.board')),
+                ('posts_count', models.PositiveIntegerField(default=0)),
+                ('topics_count', models.PositiveIntegerField(default=0)),
+                ('last_post_at', models.DateTimeField(null=True)),
+                ('last_post', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='boards.post')),
+                ('last_post_author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('last_post_topic', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='boards.topic')),
+            ],
+        ),
+        migrations.RunPython(populate_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0004_boardstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='message_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='message_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0005_post_message_html'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['topic', 'created_at', 'id'], name='post_topic_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['board', '-last_update', '-id'], name='topic_board_last_update_idx'),
+        ),
+    ]
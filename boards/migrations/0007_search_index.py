@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS boards_search "
+        "USING fts5(body, topic_id UNINDEXED, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO boards_search (rowid, body, topic_id) SELECT -id, subject, id FROM boards_topic"
+    )
+    schema_editor.execute(
+        "INSERT INTO boards_search (rowid, body, topic_id) SELECT id, message, topic_id FROM boards_post"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS boards_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
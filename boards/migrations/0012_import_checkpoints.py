@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0011_inverted_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('source', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('line', models.PositiveIntegerField(default=0)),
+                ('counts', models.JSONField(default=dict)),
+                ('matched', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImportedKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=40)),
+                ('old_pk', models.BigIntegerField()),
+                ('new_pk', models.BigIntegerField()),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keys', to='boards.importcheckpoint')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('checkpoint', 'model', 'old_pk'), name='imported_key_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def create_checkpoint(apps, schema_editor):
+    TopicTrend = apps.get_model('boards', 'TopicTrend')
+    TrendingCheckpoint = apps.get_model('boards', 'TrendingCheckpoint')
+    last_post_id = TopicTrend.objects.aggregate(last_post_id=Max('last_post_id'))['last_post_id']
+    TrendingCheckpoint.objects.create(pk=1, last_post_id=last_post_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0012_import_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(null=True)),
+                ('last_post', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='boards.post')),
+            ],
+        ),
+        migrations.RunPython(create_checkpoint, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='topictrend',
+            name='last_post',
+        ),
+    ]
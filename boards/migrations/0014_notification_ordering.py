@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0013_trending_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-post']},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:23
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def create_corpus(apps, schema_editor):
+    SearchDocument = apps.get_model('boards', 'SearchDocument')
+    SearchCorpus = apps.get_model('boards', 'SearchCorpus')
+    stats = SearchDocument.objects.aggregate(documents=Count('pk'), length=Sum('length'))
+    SearchCorpus.objects.create(pk=1, documents=stats['documents'], length=stats['length'] or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0014_notification_ordering'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchCorpus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('documents', models.PositiveIntegerField(default=0)),
+                ('length', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_corpus, migrations.RunPython.noop),
+    ]
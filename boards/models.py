@@ -1,17 +1,60 @@
+import hashlib
 import math
+import threading
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 from django.utils.text import Truncator
-from markdown import markdown
+from markdown import Markdown
+
+
+_markdown = threading.local()
+
+
+def render_markdown(text):
+    """
+    Render `text` with a per-thread `Markdown` instance. Raw HTML is escaped
+    instead of passed through, like the old `safe_mode='escape'`.
+    """
+    md = getattr(_markdown, 'instance', None)
+    if md is None:
+        md = Markdown()
+        md.preprocessors.deregister('html_block')
+        md.inlinePatterns.deregister('html')
+        _markdown.instance = md
+    try:
+        return md.convert(text)
+    finally:
+        md.reset()
 
 
 # Create your models here.
+class BoardQuerySet(models.QuerySet):
+    def with_stats(self):
+        posts = Post.objects.filter(topic__board=OuterRef('pk')).order_by()
+        topics = Topic.objects.filter(board=OuterRef('pk')).order_by()
+        return self.annotate(
+            posts_count=Coalesce(Subquery(
+                posts.values('topic__board').annotate(count=Count('pk')).values('count')
+            ), 0),
+            topics_count=Coalesce(Subquery(
+                topics.values('board').annotate(count=Count('pk')).values('count')
+            ), 0),
+            last_post_id=Subquery(posts.order_by('-created_at', '-pk').values('pk')[:1]),
+        )
+
+
 class Board(models.Model):
     name = models.CharField(max_length=40, unique=True)
     description = models.CharField(max_length=200)
 
+    objects = BoardQuerySet.as_manager()
+
     def __str__(self):
         return "name:" + self.name + "\n description:" + self.description
 
@@ -22,6 +65,40 @@ class Board(models.Model):
         return Post.objects.filter(topic__board=self).order_by("-created_at").first()
 
 
+def read_marker(user):
+    """
+    The id of the last post `user` has read in the outer topic: its own
+    marker or the watermark of its board, whichever is later; 0 if none.
+    """
+    topic = TopicRead.objects.filter(user=user, topic=OuterRef('pk')).values('last_read_post')[:1]
+    board = BoardRead.objects.filter(user=user, board=OuterRef('board')).values('last_read_post')[:1]
+    return Greatest(
+        Coalesce(Subquery(topic), 0), Coalesce(Subquery(board), 0), output_field=models.BigIntegerField()
+    )
+
+
+class TopicQuerySet(models.QuerySet):
+    def with_replies(self):
+        """
+        Annotate `replies` with a COUNT subquery per topic rather than a JOIN
+        and GROUP BY, so an ORDER BY on the topic index is walked in order and
+        stops at the page size instead of sorting every topic of the board.
+        """
+        posts = Post.objects.filter(topic=OuterRef('pk')).order_by().values('topic')
+        return self.annotate(replies=Coalesce(Subquery(posts.annotate(count=Count('pk')).values('count')), 0) - 1)
+
+    def with_unread(self, user):
+        """
+        Annotate `unread`, the number of posts after `user`'s read marker
+        (see `read_marker`). Each is an index range scan of the topic's
+        posts, run for the rows of the page only.
+        """
+        posts = Post.objects.filter(topic=OuterRef('pk'), pk__gt=OuterRef('read_marker')).order_by().values('topic')
+        return self.alias(read_marker=read_marker(user)).annotate(
+            unread=Coalesce(Subquery(posts.annotate(count=Count('pk')).values('count')), 0)
+        )
+
+
 class Topic(models.Model):
     subject = models.CharField(max_length=255)
     last_update = models.DateTimeField(auto_now_add=True)
@@ -29,12 +106,27 @@ class Topic(models.Model):
     starter = models.ForeignKey(User, related_name='topic', on_delete=models.CASCADE)
     views = models.PositiveIntegerField(default=0)
 
+    objects = TopicQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', '-last_update', '-id'], name='topic_board_last_update_idx'),
+        ]
+
     def __str__(self):
         return self.subject
 
-    def get_page_count(self):
-        count = self.posts.count()
-        pages = count / 20
+    def get_posts_count(self):
+        # TopicListView annotates `replies`, which saves a COUNT per topic row.
+        replies = getattr(self, 'replies', None)
+        if replies is not None:
+            return replies + 1
+        return self.posts.count()
+
+    def get_page_count(self, posts_count=None):
+        if posts_count is None:
+            posts_count = self.get_posts_count()
+        pages = posts_count / 20
         return math.ceil(pages)
 
     def has_many_pages(self, count=None):
@@ -44,7 +136,7 @@ class Topic(models.Model):
 
     def get_page_range(self):
         count = self.get_page_count()
-        if self.has_many_pages(self, count):
+        if self.has_many_pages(count):
             return range(1, 5)
         return range(1, count + 1)
 
@@ -59,10 +151,316 @@ class Post(models.Model):
     topic = models.ForeignKey(Topic, related_name='posts', on_delete=models.CASCADE)
     created_by = models.ForeignKey(User, related_name='posts', on_delete=models.CASCADE)
     updated_by = models.ForeignKey(User, null=True, related_name='+', on_delete=models.CASCADE)
+    message_html = models.TextField(blank=True, default='', editable=False)
+    message_hash = models.CharField(max_length=40, blank=True, default='', editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['topic', 'created_at', 'id'], name='post_topic_created_at_idx'),
+        ]
 
     def __str__(self):
         truncated_message = Truncator(self.message)
         return truncated_message.chars(30)
 
+    def save(self, *args, **kwargs):
+        if self.render_message() and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'message_html', 'message_hash'}
+        super().save(*args, **kwargs)
+
+    def get_message_hash(self):
+        return hashlib.sha1(self.message.encode('utf-8')).hexdigest()
+
+    def render_message(self):
+        """Re-render `message_html` if the message changed. Returns True when it did."""
+        message_hash = self.get_message_hash()
+        if message_hash == self.message_hash:
+            return False
+        self.message_html = render_markdown(self.message)
+        self.message_hash = message_hash
+        return True
+
     def get_message_as_markDown(self):
-        return mark_safe(markdown(self.message, safe_mode='escape'))
+        if self.render_message() and self.pk:
+            Post.objects.filter(pk=self.pk).update(message_html=self.message_html, message_hash=self.message_hash)
+        return mark_safe(self.message_html)
+
+
+class BoardStats(models.Model):
+    board = models.OneToOneField(Board, primary_key=True, related_name='stats', on_delete=models.CASCADE)
+    posts_count = models.PositiveIntegerField(default=0)
+    topics_count = models.PositiveIntegerField(default=0)
+    last_post = models.ForeignKey(Post, null=True, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    last_post_topic = models.ForeignKey(Topic, null=True, related_name='+', on_delete=models.DO_NOTHING,
+                                        db_constraint=False)
+    last_post_author = models.ForeignKey(User, null=True, related_name='+', on_delete=models.SET_NULL)
+    last_post_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return "stats:" + str(self.board_id)
+
+    def set_last_post(self, post):
+        self.last_post = post
+        self.last_post_topic_id = post.topic_id if post else None
+        self.last_post_author = post.created_by if post else None
+        self.last_post_at = post.created_at if post else None
+
+    def refresh_last_post(self):
+        posts = Post.objects.filter(topic__board_id=self.board_id).select_related('created_by')
+        self.set_last_post(posts.order_by("-created_at", "-pk").first())
+
+    def refresh(self):
+        self.posts_count = Post.objects.filter(topic__board_id=self.board_id).count()
+        self.topics_count = Topic.objects.filter(board_id=self.board_id).count()
+        self.refresh_last_post()
+
+
+class TopicTrend(models.Model):
+    """
+    Trending score of a topic, kept up to date incrementally by `boards.trending`.
+    `score` is the base-2 logarithm of the topic's time-decayed activity
+    measured at a fixed epoch, so existing scores never need rescaling.
+    """
+    topic = models.OneToOneField(Topic, primary_key=True, related_name='trend', on_delete=models.CASCADE)
+    score = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "trend:" + str(self.topic_id)
+
+
+class TrendingCheckpoint(models.Model):
+    """
+    The newest post `boards.trending` has counted, in a single row. Writes to
+    the ranking update this row first, which makes it their lock.
+    """
+    last_post = models.ForeignKey(Post, null=True, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    updated_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return "trending:" + str(self.last_post_id)
+
+
+class TopicSubscription(models.Model):
+    """A user who is notified of new replies to a topic."""
+    topic = models.ForeignKey(Topic, related_name='subscriptions', on_delete=models.CASCADE)
+    user = models.ForeignKey(User, related_name='topic_subscriptions', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also the index the fan-out walks, subscribers in user id order.
+            models.UniqueConstraint(fields=['topic', 'user'], name='topic_subscription_unique'),
+        ]
+
+    def __str__(self):
+        return "subscription:" + str(self.topic_id) + ":" + str(self.user_id)
+
+
+class Notification(models.Model):
+    """A reply to a topic `user` is subscribed to, created by `boards.notifications`."""
+    user = models.ForeignKey(User, related_name='notifications', on_delete=models.CASCADE)
+    post = models.ForeignKey(Post, related_name='+', on_delete=models.CASCADE)
+    topic = models.ForeignKey(Topic, related_name='+', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read = models.BooleanField(default=False)
+
+    class Meta:
+        # Newest first. The unique index below, read backwards, returns a
+        # user's notifications in this order without a sort.
+        ordering = ['-post']
+        constraints = [
+            # A retried fan-out never notifies twice.
+            models.UniqueConstraint(fields=['user', 'post'], name='notification_unique'),
+        ]
+
+    def __str__(self):
+        return "notification:" + str(self.user_id) + ":" + str(self.post_id)
+
+
+class TopicRead(models.Model):
+    """
+    The last post of `topic` that `user` has read; later posts are unread.
+    Only written when a reader gets past it (boards.unread).
+    """
+    user = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    topic = models.ForeignKey(Topic, related_name='+', on_delete=models.CASCADE)
+    last_read_post = models.ForeignKey(Post, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'topic'], name='topic_read_unique')]
+
+    def __str__(self):
+        return "read:" + str(self.user_id) + ":" + str(self.topic_id)
+
+
+class BoardRead(models.Model):
+    """A "mark all read" watermark: every post of `board` up to `last_read_post` is read by `user`."""
+    user = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    board = models.ForeignKey(Board, related_name='+', on_delete=models.CASCADE)
+    last_read_post = models.ForeignKey(Post, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'board'], name='board_read_unique')]
+
+    def __str__(self):
+        return "read:" + str(self.user_id) + ":board:" + str(self.board_id)
+
+
+class SearchDocument(models.Model):
+    """
+    A topic subject or post message in the inverted search index of
+    `boards.search.InvertedIndexBackend`. Topics use negative keys.
+    """
+    key = models.BigIntegerField(primary_key=True)
+    topic = models.ForeignKey(Topic, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    body = models.TextField()
+    length = models.PositiveIntegerField()
+
+    def __str__(self):
+        return "document:" + str(self.key)
+
+
+class SearchPosting(models.Model):
+    """How often `term` occurs in `document`."""
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, related_name='postings', on_delete=models.CASCADE)
+    frequency = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            # Also the index a search reads the postings of a term from.
+            models.UniqueConstraint(fields=['term', 'document'], name='search_posting_unique'),
+        ]
+
+    def __str__(self):
+        return "posting:" + self.term + ":" + str(self.document_id)
+
+
+class SearchCorpus(models.Model):
+    """
+    Number and total length of the `SearchDocument` rows, in a single row
+    that BM25 reads instead of scanning the documents on every search.
+    """
+    documents = models.PositiveIntegerField(default=0)
+    length = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return "corpus:" + str(self.documents)
+
+
+class ImportCheckpoint(models.Model):
+    """
+    How far `boards.transfer.ForumImporter` got through the dump named
+    `source`. Written in the transaction of each imported batch.
+    """
+    source = models.CharField(max_length=255, primary_key=True)
+    line = models.PositiveIntegerField(default=0)
+    counts = models.JSONField(default=dict)
+    matched = models.JSONField(default=dict)
+
+    def __str__(self):
+        return "import:" + self.source
+
+
+class ImportedKey(models.Model):
+    """The primary key an imported user, board or topic got in this database."""
+    checkpoint = models.ForeignKey(ImportCheckpoint, related_name='keys', on_delete=models.CASCADE)
+    model = models.CharField(max_length=40)
+    old_pk = models.BigIntegerField()
+    new_pk = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['checkpoint', 'model', 'old_pk'], name='imported_key_unique'),
+        ]
+
+    def __str__(self):
+        return "imported:" + self.model + ":" + str(self.old_pk)
+
+
+def attach_board_stats(boards):
+    """
+    Build in-memory `BoardStats` for boards annotated by `BoardQuerySet.with_stats`,
+    loading every last post with its author and topic in one query.
+    """
+    boards = list(boards)
+    last_posts = Post.objects.select_related('created_by', 'topic').in_bulk(
+        [board.last_post_id for board in boards if board.last_post_id]
+    )
+    for board in boards:
+        stats = BoardStats(posts_count=board.posts_count, topics_count=board.topics_count)
+        stats.set_last_post(last_posts.get(board.last_post_id))
+        board.stats = stats
+    return boards
+
+
+def attach_author_post_counts(posts):
+    """
+    Set `created_by.posts_count` on every post of a page from one grouped
+    COUNT, instead of a `created_by.posts.count()` per post.
+    """
+    posts = list(posts)
+    counts = dict(
+        Post.objects.filter(created_by__in={post.created_by_id for post in posts})
+        .order_by().values_list('created_by').annotate(count=Count('pk'))
+    )
+    for post in posts:
+        post.created_by.posts_count = counts.get(post.created_by_id, 0)
+    return posts
+
+
+@receiver(post_save, sender=Board)
+def create_board_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        BoardStats.objects.get_or_create(board=instance)
+
+
+@receiver(post_save, sender=Topic)
+def count_new_topic(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    with transaction.atomic():
+        BoardStats.objects.get_or_create(board_id=instance.board_id)
+        BoardStats.objects.filter(board_id=instance.board_id).update(topics_count=F('topics_count') + 1)
+
+
+@receiver(post_delete, sender=Topic)
+def count_deleted_topic(sender, instance, **kwargs):
+    BoardStats.objects.filter(board_id=instance.board_id, topics_count__gt=0).update(
+        topics_count=F('topics_count') - 1
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_new_post(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    board_id = Topic.objects.filter(pk=instance.topic_id).values_list('board_id', flat=True).first()
+    with transaction.atomic():
+        BoardStats.objects.get_or_create(board_id=board_id)
+        BoardStats.objects.filter(board_id=board_id).update(
+            posts_count=F('posts_count') + 1,
+            last_post=instance,
+            last_post_topic_id=instance.topic_id,
+            last_post_author_id=instance.created_by_id,
+            last_post_at=instance.created_at,
+        )
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    board_id = Topic.objects.filter(pk=instance.topic_id).values_list('board_id', flat=True).first()
+    if board_id is None:
+        return
+    stats = BoardStats.objects.filter(board_id=board_id)
+    newest = Post.objects.filter(topic__board_id=OuterRef('board_id')).order_by('-created_at', '-pk')
+    with transaction.atomic():
+        stats.filter(posts_count__gt=0).update(posts_count=F('posts_count') - 1)
+        # Only a board whose last post this was needs it looked up again.
+        stats.filter(last_post_id=instance.pk).update(
+            last_post=Subquery(newest.values('pk')[:1]),
+            last_post_topic=Subquery(newest.values('topic_id')[:1]),
+            last_post_author=Subquery(newest.values('created_by_id')[:1]),
+            last_post_at=Subquery(newest.values('created_at')[:1]),
+        )
@@ -0,0 +1,53 @@
+"""
+Reply notifications. Starting or replying to a topic subscribes the author,
+and a reply queues one `notify_subscribers` job, so `reply_topic` does the
+same two writes however many people follow the thread. The job creates the
+notifications BOARDS_NOTIFICATION_BATCH_SIZE subscribers at a time, each
+batch queueing the next, so a large thread never holds the write lock for
+long.
+"""
+from django.conf import settings
+
+from boards.models import Notification, Post, TopicSubscription
+from jobs.queue import task
+
+
+def subscribe(user, topic):
+    """Subscribe `user` to `topic`; does nothing if already subscribed."""
+    TopicSubscription.objects.bulk_create([TopicSubscription(user=user, topic=topic)], ignore_conflicts=True)
+
+
+def unsubscribe(user, topic):
+    TopicSubscription.objects.filter(user=user, topic=topic).delete()
+
+
+def is_subscribed(user, topic):
+    return user.is_authenticated and TopicSubscription.objects.filter(user=user, topic=topic).exists()
+
+
+def notify_reply(post):
+    """Subscribe the author of `post` and queue the notification of the topic's other subscribers."""
+    subscribe(post.created_by, post.topic)
+    notify_subscribers.enqueue(key='boards.notify:{}:0'.format(post.pk), post_id=post.pk)
+
+
+@task
+def notify_subscribers(post_id, after_user_id=0):
+    """Notify the next batch of subscribers after `after_user_id` of the reply `post_id`."""
+    post = Post.objects.filter(pk=post_id).values('topic_id', 'created_by_id').first()
+    if post is None:
+        return
+    batch_size = settings.BOARDS_NOTIFICATION_BATCH_SIZE
+    user_ids = list(
+        TopicSubscription.objects.filter(topic_id=post['topic_id'], user_id__gt=after_user_id)
+        .order_by('user_id').values_list('user_id', flat=True)[:batch_size]
+    )
+    Notification.objects.bulk_create(
+        [Notification(user_id=user_id, post_id=post_id, topic_id=post['topic_id'])
+         for user_id in user_ids if user_id != post['created_by_id']],
+        ignore_conflicts=True,
+    )
+    if len(user_ids) == batch_size:
+        notify_subscribers.enqueue(
+            key='boards.notify:{}:{}'.format(post_id, user_ids[-1]), post_id=post_id, after_user_id=user_ids[-1]
+        )
@@ -0,0 +1,132 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+
+
+class CursorPage:
+    is_cursor_page = True
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class CursorPaginator:
+    """
+    Keyset paginator: pages are located by the ordering values of the last
+    row seen instead of an OFFSET, so every page costs the same index range
+    scan and no COUNT(*) is needed.
+
+    `ordering` must end with a unique field, e.g. ('-last_update', '-id').
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def reverse_ordering(self):
+        return tuple(name[1:] if name.startswith('-') else '-' + name for name in self.ordering)
+
+    def encode_cursor(self, obj, backwards):
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would round off.
+        values = [getattr(obj, field) for field in self.fields]
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        data = json.dumps({'v': values, 'b': backwards}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values = data['v']
+            if len(values) != len(self.fields):
+                raise ValueError(cursor)
+            model = self.queryset.model
+            values = [model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, values)]
+            return values, bool(data['b'])
+        except (ValueError, TypeError, KeyError, AttributeError):
+            raise Http404('Invalid cursor.')
+
+    def seek(self, values, ordering):
+        """
+        Build the row-value comparison `(a, b) > (x, y)` as a Q object. The
+        OR alone cannot seek an index, so it is ANDed with the inclusive
+        bound `a >= x` on the leading column, which can.
+        """
+        condition = Q()
+        for i, name in enumerate(ordering):
+            field = self.fields[i]
+            lookup = '{}__{}'.format(field, 'lt' if name.startswith('-') else 'gt')
+            prefix = {self.fields[j]: values[j] for j in range(i)}
+            condition |= Q(**prefix, **{lookup: values[i]})
+        bound = '{}__{}'.format(self.fields[0], 'lte' if ordering[0].startswith('-') else 'gte')
+        return Q(**{bound: values[0]}) & condition
+
+    def get_page_queryset(self, cursor):
+        values, backwards = self.decode_cursor(cursor) if cursor else (None, False)
+        ordering = self.reverse_ordering() if backwards else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek(values, ordering))
+        return queryset[:self.per_page + 1], values, backwards
+
+    def page(self, cursor=None):
+        queryset, values, backwards = self.get_page_queryset(cursor)
+        return self.build_page(list(queryset), values, backwards)
+
+    async def apage(self, cursor=None):
+        queryset, values, backwards = self.get_page_queryset(cursor)
+        return self.build_page([obj async for obj in queryset], values, backwards)
+
+    def build_page(self, object_list, values, backwards):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if backwards:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        return CursorPage(
+            object_list,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self.encode_cursor(object_list[-1], False) if has_next and object_list else None,
+            previous_cursor=self.encode_cursor(object_list[0], True) if has_previous and object_list else None,
+        )
+
+
+class CursorPaginationMixin:
+    """
+    Paginate a `ListView` by cursor when `BOARDS_CURSOR_PAGINATION` is on.
+    Numbered `?page=` links keep using the offset paginator.
+    """
+    cursor_ordering = None
+
+    def paginate_queryset(self, queryset, page_size):
+        if not settings.BOARDS_CURSOR_PAGINATION or self.request.GET.get('page'):
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, self.cursor_ordering, page_size)
+        page = paginator.page(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
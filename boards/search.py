@@ -0,0 +1,247 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from boards.models import Post, SearchCorpus, SearchDocument, SearchPosting, Topic
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MARK_START = '\x02'
+MARK_END = '\x03'
+MAX_TERM_LENGTH = SearchPosting._meta.get_field('term').max_length
+BATCH_SIZE = 1000
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def document_key(obj):
+    """Topics and posts share one index: topics use negative keys."""
+    return -obj.pk if isinstance(obj, Topic) else obj.pk
+
+
+def highlight(text):
+    """Escape a snippet and turn the match markers into <mark> tags."""
+    text = escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    return mark_safe(text)
+
+
+class SearchResult:
+    def __init__(self, key, topic_id, snippet, score):
+        self.post_id = key if key > 0 else None
+        self.topic_id = topic_id
+        self.snippet = snippet
+        self.score = score
+        self.topic = None
+        self.page = 1
+
+
+class SQLiteFTSBackend:
+    """Index stored in the `boards_search` FTS5 table created by the migrations."""
+    table = 'boards_search'
+
+    def index(self, documents):
+        rows = [(key, body, topic_id) for key, topic_id, body in documents]
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM {} WHERE rowid = %s'.format(self.table), [(row[0],) for row in rows])
+            cursor.executemany(
+                'INSERT INTO {} (rowid, body, topic_id) VALUES (%s, %s, %s)'.format(self.table), rows
+            )
+
+    def remove(self, keys):
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM {} WHERE rowid = %s'.format(self.table), [(key,) for key in keys])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(self.table))
+
+    def search(self, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        match = ' '.join('"{}"'.format(term) for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid, topic_id, snippet({table}, 0, %s, %s, %s, 16), bm25({table}) FROM {table} '
+                'WHERE {table} MATCH %s ORDER BY rank LIMIT %s'.format(table=self.table),
+                [MARK_START, MARK_END, '...', match, limit],
+            )
+            return [SearchResult(key, topic_id, highlight(snippet), -score)
+                    for key, topic_id, snippet, score in cursor.fetchall()]
+
+
+class InvertedIndexBackend:
+    """
+    BM25 over an inverted index kept in the `SearchDocument` and
+    `SearchPosting` tables, for databases without FTS5. Every process reads
+    and writes the same index; fill it with `manage.py rebuild_search_index`
+    after switching to this backend.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def update_corpus(self, documents, length):
+        """Add `documents` and `length` (either may be negative) to the `SearchCorpus` row."""
+        if not SearchCorpus.objects.filter(pk=1).update(documents=F('documents') + documents,
+                                                        length=F('length') + length):
+            SearchCorpus.objects.create(pk=1, documents=documents, length=length)
+
+    def index(self, documents):
+        documents = {key: (topic_id, body) for key, topic_id, body in documents}
+        replaced = SearchDocument.objects.filter(key__in=list(documents)).aggregate(
+            documents=Count('pk'), length=Sum('length'),
+        )
+        SearchPosting.objects.filter(document_id__in=list(documents)).delete()
+        postings = []
+        rows = []
+        for key, (topic_id, body) in documents.items():
+            frequencies = Counter(term[:MAX_TERM_LENGTH] for term in tokenize(body))
+            rows.append(SearchDocument(key=key, topic_id=topic_id, body=body, length=sum(frequencies.values())))
+            postings.extend(SearchPosting(term=term, document_id=key, frequency=frequency)
+                            for term, frequency in frequencies.items())
+        SearchDocument.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['key'], update_fields=['topic', 'body', 'length'],
+        )
+        SearchPosting.objects.bulk_create(postings, batch_size=BATCH_SIZE)
+        self.update_corpus(len(rows) - replaced['documents'],
+                           sum(row.length for row in rows) - (replaced['length'] or 0))
+
+    def remove(self, keys):
+        removed = SearchDocument.objects.filter(key__in=keys).aggregate(documents=Count('pk'), length=Sum('length'))
+        SearchPosting.objects.filter(document_id__in=keys).delete()
+        SearchDocument.objects.filter(key__in=keys).delete()
+        if removed['documents']:
+            self.update_corpus(-removed['documents'], -removed['length'])
+
+    def clear(self):
+        SearchPosting.objects.all().delete()
+        SearchDocument.objects.all().delete()
+        SearchCorpus.objects.update(documents=0, length=0)
+
+    def snippet(self, body, terms, width=16):
+        words = body.split()
+        hits = [i for i, word in enumerate(words) if set(tokenize(word)) & terms]
+        start = max(hits[0] - width // 2, 0) if hits else 0
+        window = words[start:start + width]
+        marked = [MARK_START + word + MARK_END if set(tokenize(word)) & terms else word for word in window]
+        text = ' '.join(marked)
+        if start > 0:
+            text = '...' + text
+        if start + width < len(words):
+            text += '...'
+        return highlight(text)
+
+    def search(self, query, limit):
+        terms = {term[:MAX_TERM_LENGTH] for term in tokenize(query)}
+        if not terms:
+            return []
+        counts = dict(
+            SearchPosting.objects.filter(term__in=terms).order_by()
+            .values_list('term').annotate(count=Count('pk'))
+        )
+        if len(counts) < len(terms):
+            return []
+        corpus = SearchCorpus.objects.filter(pk=1).first()
+        if corpus is None or not corpus.documents:
+            return []
+        count = corpus.documents
+        average_length = corpus.length / count or 1
+        # Only the documents that contain the rarest term can match them all.
+        rarest = min(terms, key=counts.get)
+        candidates = SearchPosting.objects.filter(term=rarest).values('document_id')
+        rows = SearchPosting.objects.filter(term__in=terms, document_id__in=candidates).values_list(
+            'document_id', 'term', 'frequency', 'document__length'
+        )
+        scores = defaultdict(float)
+        matched = Counter()
+        for key, term, frequency, length in rows:
+            idf = math.log(1 + (count - counts[term] + 0.5) / (counts[term] + 0.5))
+            norm = frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[key] += idf * frequency * (self.k1 + 1) / norm
+            matched[key] += 1
+        ranked = sorted(
+            ((key, score) for key, score in scores.items() if matched[key] == len(terms)),
+            key=lambda item: (-item[1], item[0]),
+        )[:limit]
+        documents = SearchDocument.objects.in_bulk([key for key, _ in ranked])
+        return [SearchResult(key, documents[key].topic_id, self.snippet(documents[key].body, terms), score)
+                for key, score in ranked]
+
+
+def iter_documents(chunk_size=2000):
+    """
+    Yield lists of `(key, topic_id, body)` for every topic and post, walking
+    the primary keys so memory use does not grow with the table.
+    """
+    sources = (
+        (Topic, ('pk', 'pk', 'subject'), lambda pk, topic_id, body: (-pk, topic_id, body)),
+        (Post, ('pk', 'topic_id', 'message'), lambda pk, topic_id, body: (pk, topic_id, body)),
+    )
+    for model, fields, to_document in sources:
+        last_pk = 0
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(*fields)[:chunk_size])
+            if not rows:
+                break
+            yield [to_document(*row) for row in rows]
+            last_pk = rows[-1][0]
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None or type(_backend) is not import_string(settings.BOARDS_SEARCH_BACKEND):
+        _backend = import_string(settings.BOARDS_SEARCH_BACKEND)()
+    return _backend
+
+
+def search(query, limit=20, per_page=20):
+    """
+    Return ranked results with their topics (and boards) loaded. Post results
+    also get the `page` of the topic they are on, `per_page` posts a page.
+    """
+    results = get_backend().search(query, limit)
+    topics = Topic.objects.select_related('board').in_bulk({result.topic_id for result in results})
+    earlier = Post.objects.filter(topic_id=OuterRef('topic_id'), pk__lt=OuterRef('pk')).order_by().values('topic_id')
+    positions = dict(
+        Post.objects.filter(pk__in=[result.post_id for result in results if result.post_id])
+        .annotate(position=Subquery(earlier.annotate(count=Count('pk')).values('count')))
+        .values_list('pk', 'position')
+    )
+    for result in results:
+        result.topic = topics.get(result.topic_id)
+        if result.post_id in positions:
+            result.page = (positions[result.post_id] or 0) // per_page + 1
+    return [result for result in results if result.topic is not None]
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Post)
+def index_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Saves that leave the text alone, like a reply bumping `last_update`.
+    if update_fields is not None and not {'subject', 'message'} & set(update_fields):
+        return
+    if sender is Topic:
+        get_backend().index([(document_key(instance), instance.pk, instance.subject)])
+    else:
+        get_backend().index([(document_key(instance), instance.topic_id, instance.message)])
+
+
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Post)
+def remove_document(sender, instance, **kwargs):
+    get_backend().remove([document_key(instance)])
@@ -0,0 +1,15 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(name):
+    """Link the STATIC_BUNDLES entry `name`, or each of its sources when bundles are off."""
+    paths = [name] if settings.USE_STATIC_BUNDLES else settings.STATIC_BUNDLES[name]
+    if name.endswith('.css'):
+        return format_html_join('\n', '<link rel="stylesheet" href="{}">', ((static(path),) for path in paths))
+    return format_html_join('\n', '<script src="{}"></script>', ((static(path),) for path in paths))
@@ -1,17 +1,9 @@
-import hashlib
-from urllib.parse import urlencode
+from django import template
 
-from django.utils.translation import template
+from boards.avatars import DEFAULT_SIZE, avatar_cache
 
 register = template.Library()
 
 @register.filter
-def gravatar(user):
-    email = user.email.lower().encode('utf-8')
-    default = 'mm'
-    size = 256
-    url = 'https://www.gravatar.com/avatar/{md5}?{params}'.format(
-        md5=hashlib.md5(email).hexdigest(),
-        params=urlencode({'d': default, 's': str(size)})
-    )
-    return url
+def gravatar(user, size=DEFAULT_SIZE):
+    return avatar_cache.get(user, int(size))
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import async_views
+from ..counters import get_buffer, pending_topic_views
+from ..models import Board, Post, Topic
+
+
+@override_settings(ROOT_URLCONF='djangoProject1.urls_async', TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_buffer().drain()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        Post.objects.create(message='Lorem *ipsum*', topic=self.topic, created_by=self.user)
+        self.topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
+        self.posts_url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def test_routes_are_async(self):
+        for url in (reverse('home'), self.topics_url, self.posts_url):
+            view = self.client.get(url).resolver_match.func
+            self.assertTrue(view.view_class.view_is_async)
+        self.assertIs(self.client.get(self.posts_url).resolver_match.func.view_class, async_views.PostListView)
+
+    async def test_home(self):
+        response = await self.async_client.get(reverse('home'))
+        self.assertContains(response, 'Django')
+        self.assertContains(response, 'By john')
+
+    async def test_topic_list(self):
+        response = await self.async_client.get(self.topics_url)
+        self.assertContains(response, 'Hello, world')
+        self.assertEquals(response.context['board'], self.board)
+
+    async def test_post_list(self):
+        response = await self.async_client.get(self.posts_url)
+        self.assertContains(response, '<em>ipsum</em>')
+        self.assertEquals(response.context['posts'][0].created_by.posts_count, 1)
+        self.assertEquals(pending_topic_views(self.topic.pk), 1)
+
+    async def test_session_counts_one_view(self):
+        await self.async_client.get(self.posts_url)
+        await self.async_client.get(self.posts_url)
+        self.assertEquals(pending_topic_views(self.topic.pk), 1)
+
+    async def test_not_found(self):
+        url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': 99})
+        self.assertEquals((await self.async_client.get(url)).status_code, 404)
+        url = reverse('board_topics', kwargs={'pk': 99})
+        self.assertEquals((await self.async_client.get(url)).status_code, 404)
+
+    async def test_not_modified(self):
+        etag = (await self.async_client.get(self.topics_url))['ETag']
+        response = await self.async_client.get(self.topics_url, headers={'If-None-Match': etag})
+        self.assertEquals(response.status_code, 304)
+
+    @override_settings(BOARDS_CURSOR_PAGINATION=False)
+    async def test_offset_pagination(self):
+        for i in range(25):
+            await Post.objects.acreate(message='Reply {}'.format(i), topic=self.topic, created_by=self.user)
+        response = await self.async_client.get(self.posts_url + '?page=last')
+        self.assertEquals(len(response.context['posts']), 6)
+        self.assertEquals(response.context['paginator'].count, 26)
+
+    @override_settings(BOARDS_CURSOR_PAGINATION=True)
+    async def test_cursor_pagination(self):
+        for i in range(25):
+            await Post.objects.acreate(message='Reply {}'.format(i), topic=self.topic, created_by=self.user)
+        response = await self.async_client.get(self.posts_url)
+        page = response.context['page_obj']
+        self.assertTrue(page.has_next())
+        response = await self.async_client.get(self.posts_url + '?cursor=' + page.next_cursor)
+        self.assertEquals(len(response.context['posts']), 6)
@@ -0,0 +1,78 @@
+import hashlib
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..avatars import AvatarCache, avatar_cache, gravatar_url
+from ..counters import get_buffer
+from ..models import Board, Post, Topic
+from ..templatetags.gravatar import gravatar
+
+
+class AvatarCacheTests(TestCase):
+    def setUp(self):
+        avatar_cache.clear()
+        self.user = User.objects.create_user(username='john', email='John@Doe.com', password='123')
+
+    def test_url(self):
+        md5 = hashlib.md5(b'john@doe.com').hexdigest()
+        self.assertEquals(gravatar(self.user), 'https://www.gravatar.com/avatar/{}?d=mm&s=256'.format(md5))
+        self.assertEquals(gravatar(self.user, 64), 'https://www.gravatar.com/avatar/{}?d=mm&s=64'.format(md5))
+
+    def test_cached_per_size(self):
+        gravatar(self.user)
+        gravatar(self.user, 64)
+        with mock.patch('boards.avatars.gravatar_url', wraps=gravatar_url) as build:
+            gravatar(self.user)
+            gravatar(self.user, 64)
+        self.assertEquals(build.call_count, 0)
+
+    def test_email_change(self):
+        old = gravatar(self.user)
+        self.user.email = 'jane@doe.com'
+        self.assertEquals(gravatar(self.user), gravatar_url('jane@doe.com'))
+        self.assertNotEquals(gravatar(self.user), old)
+
+    def test_bounded(self):
+        cache = AvatarCache(maxsize=2)
+        users = [User.objects.create_user(username='user{}'.format(i), email='user{}@doe.com'.format(i))
+                 for i in range(3)]
+        for user in users:
+            cache.get(user)
+        self.assertEquals(list(cache.entries), [users[1].pk, users[2].pk])
+
+    def test_account_update_forgets(self):
+        gravatar(self.user)
+        self.client.login(username='john', password='123')
+        response = self.client.post(reverse('my_account'), {
+            'first_name': 'John', 'last_name': 'Doe', 'email': 'new@doe.com',
+        })
+        self.assertEquals(response.status_code, 302)
+        self.assertNotIn(self.user.pk, avatar_cache.entries)
+
+
+class TopicPostsAvatarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        avatar_cache.clear()
+        get_buffer().drain()
+        board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        topic = Topic.objects.create(subject='Hello', board=board, starter=user)
+        for i in range(5):
+            Post.objects.create(message='Post {}'.format(i), topic=topic, created_by=user)
+        self.url = reverse('topic_posts', kwargs={'pk': board.pk, 'topic_pk': topic.pk})
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def test_no_hashing_after_warm_up(self):
+        self.client.get(self.url)
+        cache.clear()
+        with mock.patch('boards.avatars.gravatar_url', wraps=gravatar_url) as build:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'gravatar.com/avatar/', 5)
+        self.assertEquals(build.call_count, 0)
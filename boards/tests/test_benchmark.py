@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..benchmark import percentile, seed_forum
+from ..models import Board, BoardStats, Post, Topic
+from ..search import search
+
+
+class SeedForumTests(TestCase):
+    def test_sizes(self):
+        self.assertEquals(seed_forum(boards=2, topics_per_board=3, posts_per_topic=4, users=5), 24)
+        self.assertEquals(User.objects.count(), 5)
+        self.assertEquals(Board.objects.count(), 2)
+        self.assertEquals(Topic.objects.count(), 6)
+        self.assertEquals(Post.objects.count(), 24)
+
+    def test_derived_data_rebuilt(self):
+        seed_forum(boards=1, topics_per_board=2, posts_per_topic=3, users=2)
+        stats = BoardStats.objects.get()
+        self.assertEquals(stats.posts_count, 6)
+        self.assertEquals(stats.topics_count, 2)
+        post = Post.objects.first()
+        self.assertEquals(post.message_hash, post.get_message_hash())
+        self.assertTrue(search(post.message.split()[0]))
+
+    def test_reproducible(self):
+        seed_forum(boards=1, topics_per_board=2, posts_per_topic=2, users=2, seed=7)
+        first = list(Post.objects.order_by('pk').values_list('message', flat=True))
+        Post.objects.all().delete()
+        Topic.objects.all().delete()
+        Board.objects.all().delete()
+        User.objects.all().delete()
+        seed_forum(boards=1, topics_per_board=2, posts_per_topic=2, users=2, seed=7)
+        self.assertEquals(list(Post.objects.order_by('pk').values_list('message', flat=True)), first)
+
+
+class PercentileTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEquals(percentile(values, 0.5), 50)
+        self.assertEquals(percentile(values, 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
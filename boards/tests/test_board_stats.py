@@ -0,0 +1,109 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Board, BoardStats, Post, Topic
+
+
+class BoardStatsTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.first = Post.objects.create(message='first', topic=self.topic, created_by=self.user)
+        self.last = Post.objects.create(message='last', topic=self.topic, created_by=self.user)
+
+    def get_stats(self):
+        return BoardStats.objects.get(board=self.board)
+
+    def test_created_with_board(self):
+        board = Board.objects.create(name='Python', description='Python board.')
+        self.assertTrue(BoardStats.objects.filter(board=board).exists())
+
+    def test_counts_on_create(self):
+        stats = self.get_stats()
+        self.assertEquals(stats.posts_count, 2)
+        self.assertEquals(stats.topics_count, 1)
+        self.assertEquals(stats.last_post_id, self.last.pk)
+        self.assertEquals(stats.last_post_topic_id, self.topic.pk)
+        self.assertEquals(stats.last_post_author_id, self.user.pk)
+
+    def test_delete_last_post(self):
+        self.last.delete()
+        stats = self.get_stats()
+        self.assertEquals(stats.posts_count, 1)
+        self.assertEquals(stats.last_post_id, self.first.pk)
+
+    def test_delete_other_post(self):
+        # The counters are changed in SQL; the stats row is never read and saved back.
+        with CaptureQueriesContext(connection) as captured:
+            self.first.delete()
+        self.assertFalse([query for query in captured if query['sql'].startswith('SELECT "boards_boardstats"')])
+        stats = self.get_stats()
+        self.assertEquals(stats.posts_count, 1)
+        self.assertEquals(stats.last_post_id, self.last.pk)
+
+    def test_delete_topic(self):
+        self.topic.delete()
+        stats = self.get_stats()
+        self.assertEquals(stats.posts_count, 0)
+        self.assertEquals(stats.topics_count, 0)
+        self.assertIsNone(stats.last_post_id)
+
+    def test_rebuild_command(self):
+        BoardStats.objects.all().delete()
+        call_command('rebuild_board_stats', stdout=StringIO())
+        stats = self.get_stats()
+        self.assertEquals(stats.posts_count, 2)
+        self.assertEquals(stats.topics_count, 1)
+        self.assertEquals(stats.last_post_id, self.last.pk)
+
+
+class HomeQueryCountTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        for i in range(5):
+            board = Board.objects.create(name='Board {}'.format(i), description='Board.')
+            topic = Topic.objects.create(subject='Hello', board=board, starter=user)
+            Post.objects.create(message='Lorem ipsum', topic=topic, created_by=user)
+
+    def test_home_constant_queries(self):
+        # One query for the boards; the validators come from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'By john')
+
+
+@override_settings(BOARDS_DENORMALIZED_STATS=False)
+class AnnotatedHomeQueryCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.create_boards(5)
+
+    def create_boards(self, count):
+        start = Board.objects.count()
+        for i in range(start, start + count):
+            board = Board.objects.create(name='Board {}'.format(i), description='Board.')
+            topic = Topic.objects.create(subject='Hello', board=board, starter=self.user)
+            Post.objects.create(message='Lorem ipsum', topic=topic, created_by=self.user)
+
+    def test_constant_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'By john', 5)
+        self.create_boards(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'By john', 25)
+
+    def test_matches_denormalized_stats(self):
+        board = Board.objects.with_stats().get(name='Board 0')
+        stats = BoardStats.objects.get(board=board)
+        self.assertEquals(board.posts_count, stats.posts_count)
+        self.assertEquals(board.topics_count, stats.topics_count)
+        self.assertEquals(board.last_post_id, stats.last_post_id)
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from djangoProject1 import cache as cache_module
+from djangoProject1.cache import Namespace, SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite3')
+        self.cache = self.make_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_set_get_delete(self):
+        self.cache.set('answer', {'value': 42})
+        self.assertEquals(self.cache.get('answer'), {'value': 42})
+        self.assertEquals(self.cache.get_many(['answer', 'missing']), {'answer': {'value': 42}})
+        self.assertTrue(self.cache.delete('answer'))
+        self.assertIsNone(self.cache.get('answer'))
+
+    def test_add_and_expiry(self):
+        self.assertTrue(self.cache.add('key', 1))
+        self.assertFalse(self.cache.add('key', 2))
+        self.cache.set('key', 'old', timeout=1)
+        with mock.patch('djangoProject1.cache.time.time', return_value=time.time() + 5):
+            self.assertIsNone(self.cache.get('key'))
+            self.assertFalse(self.cache.has_key('key'))
+            self.assertTrue(self.cache.add('key', 'new'))
+
+    def test_shared_between_instances(self):
+        self.cache.set('key', 'value')
+        self.assertEquals(self.make_cache().get('key'), 'value')
+
+    def test_incr(self):
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        self.cache.set('count', 1)
+        self.assertEquals(self.cache.incr('count', 5), 6)
+        self.assertEquals(self.cache.decr('count'), 5)
+        self.cache.set('float', 1.5)
+        self.assertEquals(self.cache.incr('float'), 2.5)
+
+    def test_incr_is_atomic(self):
+        self.cache.set('count', 0)
+
+        def increment():
+            cache = self.make_cache()
+            for _ in range(50):
+                cache.incr('count')
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEquals(self.cache.get('count'), 200)
+
+    def test_cull_least_recently_read(self):
+        cache = self.make_cache(MAX_ENTRIES=10, CULL_FREQUENCY=5)
+        with mock.patch('djangoProject1.cache.time.time', return_value=1000.0):
+            cache.set_many({'key{}'.format(i): i for i in range(10)}, timeout=None)
+        with mock.patch('djangoProject1.cache.time.time', return_value=2000.0):
+            cache.get_many(['key{}'.format(i) for i in range(5)])
+        with mock.patch('djangoProject1.cache.time.time', return_value=3000.0):
+            cache.set_many({'new0': 0, 'new1': 1}, timeout=None)
+            cache.cull()
+        self.assertEquals(len(cache.get_many(['key{}'.format(i) for i in range(5)])), 5)
+        self.assertEquals(cache.get_many(['key{}'.format(i) for i in range(5, 10)]), {
+            'key{}'.format(i): i for i in range(7, 10)
+        })
+
+    def test_cull_checked_on_write(self):
+        cache = self.make_cache(MAX_ENTRIES=5)
+        with mock.patch.object(cache_module, 'CULL_CHECK_INTERVAL', 10):
+            cache.set_many({'key{}'.format(i): i for i in range(20)})
+        self.assertLessEqual(self.count(), 5)
+
+    def count(self):
+        return self.cache.connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+class NamespaceTests(SimpleTestCase):
+    def test_key(self):
+        self.assertEquals(Namespace('boards:page').key('1.2', 'abc'), 'boards:page:v1:1.2:abc')
+        self.assertEquals(Namespace('boards:page', version=2).key(3), 'boards:page:v2:3')
@@ -0,0 +1,49 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from djangoProject1.middleware import fingerprint
+from ..models import Board, Post, Topic
+
+
+class FingerprintTests(TestCase):
+    def test_collapses_literals_and_in_lists(self):
+        self.assertEquals(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s) LIMIT 5'),
+        )
+
+
+@override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0, DEBUG=False)
+class InstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        topic = Topic.objects.create(subject='Hello', board=self.board, starter=user)
+        Post.objects.create(message='Lorem ipsum', topic=topic, created_by=user)
+
+    def get_record(self, url, **settings):
+        with self.settings(**settings), self.assertLogs('djangoProject1.instrumentation') as logs:
+            response = self.client.get(url)
+        return response, json.loads(logs.records[-1].getMessage()), logs.records[-1]
+
+    def test_record_and_server_timing(self):
+        response, record, _ = self.get_record(reverse('home'))
+        self.assertEquals(record['queries'], 1)
+        self.assertEquals(record['view'], 'home')
+        self.assertEquals(record['flags'], [])
+        self.assertGreater(record['template_ms'], 0)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    def test_query_threshold_flagged(self):
+        _, record, log = self.get_record(reverse('home'), INSTRUMENTATION_MAX_QUERIES=0)
+        self.assertEquals(record['flags'], ['too_many_queries'])
+        self.assertEquals(log.levelname, 'WARNING')
+
+    def test_unsampled_request_untouched(self):
+        with self.settings(INSTRUMENTATION_SAMPLE_RATE=0.0), self.assertNoLogs('djangoProject1.instrumentation'):
+            response = self.client.get(reverse('home'))
+        self.assertNotIn('Server-Timing', response)
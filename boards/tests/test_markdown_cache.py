@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Board, Post, Topic
+
+
+class MarkdownCacheTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.post = Post.objects.create(message='**Lorem** ipsum', topic=self.topic, created_by=self.user)
+
+    def test_rendered_on_create(self):
+        self.assertEquals(self.post.message_html, '<p><strong>Lorem</strong> ipsum</p>')
+        self.assertEquals(self.post.message_hash, self.post.get_message_hash())
+
+    def test_raw_html_escaped(self):
+        post = Post.objects.create(message='<script>alert(1)</script>', topic=self.topic, created_by=self.user)
+        self.assertNotIn('<script>', post.message_html)
+
+    def test_no_render_on_hit(self):
+        post = Post.objects.get(pk=self.post.pk)
+        with mock.patch('boards.models.render_markdown') as render:
+            self.assertEquals(post.get_message_as_markDown(), '<p><strong>Lorem</strong> ipsum</p>')
+        render.assert_not_called()
+
+    def test_thread_page_no_render_on_hit(self):
+        for i in range(19):
+            Post.objects.create(message='*reply* {}'.format(i), topic=self.topic, created_by=self.user)
+        url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        with mock.patch('boards.models.render_markdown') as render:
+            response = self.client.get(url)
+        render.assert_not_called()
+        self.assertContains(response, '<strong>Lorem</strong>')
+
+    def test_stale_cache_filled_on_read(self):
+        Post.objects.filter(pk=self.post.pk).update(message_html='', message_hash='')
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEquals(post.get_message_as_markDown(), '<p><strong>Lorem</strong> ipsum</p>')
+        self.assertEquals(Post.objects.get(pk=self.post.pk).message_hash, post.get_message_hash())
+
+    def test_invalidated_on_edit(self):
+        self.client.login(username='john', password='123')
+        url = reverse('edit_post', kwargs={
+            'pk': self.board.pk,
+            'topic_pk': self.topic.pk,
+            'post_pk': self.post.pk
+        })
+        self.client.post(url, {'message': '_edited_'})
+        self.post.refresh_from_db()
+        self.assertEquals(self.post.message_html, '<p><em>edited</em></p>')
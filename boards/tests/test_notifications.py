@@ -0,0 +1,101 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jobs.models import Job
+from jobs.queue import run_pending
+from ..models import Board, Notification, Post, Topic, TopicSubscription
+from ..notifications import subscribe
+
+
+@override_settings(BOARDS_NOTIFICATION_BATCH_SIZE=500)
+class ReplyNotificationTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.starter = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello', board=self.board, starter=self.starter)
+        Post.objects.create(message='Lorem ipsum', topic=self.topic, created_by=self.starter)
+        subscribe(self.starter, self.topic)
+        self.replier = User.objects.create_user(username='jane', email='jane@doe.com', password='123')
+        self.client.force_login(self.replier)
+        self.url = reverse('reply_topic', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def add_subscribers(self, count):
+        start = User.objects.count()
+        users = User.objects.bulk_create(
+            [User(username='user{}'.format(i), email='user{}@doe.com'.format(i)) for i in range(start, start + count)]
+        )
+        TopicSubscription.objects.bulk_create([TopicSubscription(user=user, topic=self.topic) for user in users])
+
+    def reply(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {'message': 'A reply'})
+        return len(queries)
+
+    def test_reply_subscribes_and_queues_one_job(self):
+        self.reply()
+        self.assertTrue(TopicSubscription.objects.filter(user=self.replier, topic=self.topic).exists())
+        self.assertEquals(Job.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+        self.assertEquals(run_pending(), (1, 0))
+        notification = Notification.objects.get()
+        self.assertEquals((notification.user, notification.topic), (self.starter, self.topic))
+
+    def test_reply_cost_independent_of_subscribers(self):
+        few = self.reply()
+        self.add_subscribers(200)
+        self.assertEquals(self.reply(), few)
+
+    @override_settings(BOARDS_NOTIFICATION_BATCH_SIZE=3)
+    def test_fan_out_in_batches(self):
+        self.add_subscribers(7)
+        self.reply()
+        # Nine subscribers: three full batches, then one that finds none left.
+        self.assertEquals(run_pending(), (4, 0))
+        # Every subscriber but the author of the reply.
+        self.assertEquals(Notification.objects.count(), 8)
+        self.assertFalse(Notification.objects.filter(user=self.replier).exists())
+        self.assertEquals(run_pending(), (0, 0))
+
+    def test_notifications_page(self):
+        self.reply()
+        run_pending()
+        self.client.force_login(self.starter)
+        response = self.client.get(reverse('notifications'))
+        self.assertContains(response, 'jane')
+        self.assertContains(response, 'font-weight-bold')
+        self.assertFalse(Notification.objects.filter(read=False).exists())
+
+    @override_settings(BOARDS_NOTIFICATIONS_PER_PAGE=2)
+    def test_notifications_page_marks_only_shown(self):
+        for _ in range(3):
+            self.reply()
+        run_pending()
+        self.client.force_login(self.starter)
+        self.client.get(reverse('notifications'))
+        oldest = Notification.objects.filter(user=self.starter).order_by('post').first()
+        self.assertEquals(list(Notification.objects.filter(read=False)), [oldest])
+
+    def test_newest_first_without_sort(self):
+        queryset = self.starter.notifications.select_related('post__created_by', 'topic__board')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[3] for row in cursor.fetchall())
+        # SQLite names the unique constraint's index sqlite_autoindex_*.
+        self.assertIn('SEARCH boards_notification USING INDEX sqlite_autoindex_', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_toggle_subscription(self):
+        url = reverse('topic_subscription', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        topic_url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        response = self.client.post(url, {'subscribe': '1'})
+        self.assertRedirects(response, topic_url)
+        self.assertTrue(TopicSubscription.objects.filter(user=self.replier).exists())
+        self.assertContains(self.client.get(topic_url), 'Unsubscribe')
+        self.client.post(url, {'subscribe': '0'})
+        self.assertFalse(TopicSubscription.objects.filter(user=self.replier).exists())
+        self.assertEquals(self.client.get(url).status_code, 405)
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..counters import get_buffer, pending_topic_views
+from ..models import Board, Post, Topic
+
+
+@override_settings(TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_buffer().drain()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        Post.objects.create(message='Lorem ipsum', topic=self.topic, created_by=self.user)
+        self.topic_url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def get_anonymous(self, url):
+        self.client.cookies.clear()
+        return self.client.get(url)
+
+    def test_hit_without_queries(self):
+        for url in (reverse('home'), reverse('board_topics', kwargs={'pk': self.board.pk}), self.topic_url):
+            first = self.get_anonymous(url)
+            with self.assertNumQueries(0):
+                second = self.get_anonymous(url)
+            self.assertEquals(first.content, second.content)
+
+    def test_post_invalidates(self):
+        self.get_anonymous(self.topic_url)
+        home = self.get_anonymous(reverse('home'))
+        Post.objects.create(message='A new reply', topic=self.topic, created_by=User.objects.create_user('jane'))
+        self.assertContains(self.get_anonymous(self.topic_url), 'A new reply')
+        self.assertNotContains(home, 'By jane')
+        self.assertContains(self.get_anonymous(reverse('home')), 'By jane')
+
+    def test_hit_counts_view(self):
+        self.get_anonymous(self.topic_url)
+        self.get_anonymous(self.topic_url)
+        self.assertEquals(pending_topic_views(self.topic.pk), 2)
+
+    def test_logged_in_not_page_cached(self):
+        self.client.login(username='john', password='123')
+        self.client.get(self.topic_url)
+        response = self.client.get(self.topic_url)
+        self.assertContains(response, 'Edit')
+
+    def test_fragment_invalidated_on_edit(self):
+        self.client.login(username='john', password='123')
+        self.client.get(self.topic_url)
+        post = Post.objects.get()
+        post.message = 'Edited message'
+        post.save()
+        self.assertContains(self.client.get(self.topic_url), 'Edited message')
+
+    def test_fragments_leave_out_live_counts(self):
+        topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
+        self.client.login(username='john', password='123')
+        self.client.get(topics_url)
+        self.client.get(self.topic_url)
+        # Neither change bumps this board's or this topic's generation.
+        Topic.objects.filter(pk=self.topic.pk).update(views=42)
+        board = Board.objects.create(name='Python', description='Python board.')
+        topic = Topic.objects.create(subject='Elsewhere', board=board, starter=self.user)
+        Post.objects.create(message='Lorem ipsum', topic=topic, created_by=self.user)
+        self.assertContains(self.client.get(topics_url), '<td class="align-middle">42</td>')
+        self.assertContains(self.client.get(self.topic_url), 'Posts: 2')
+
+
+@override_settings(TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_buffer().drain()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        Post.objects.create(message='Lorem ipsum', topic=self.topic, created_by=self.user)
+        self.urls = [
+            reverse('home'),
+            reverse('board_topics', kwargs={'pk': self.board.pk}),
+            reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk}),
+        ]
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def get_anonymous(self, url, **extra):
+        self.client.cookies.clear()
+        return self.client.get(url, **extra)
+
+    def test_validators_sent(self):
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertTrue(response.has_header('ETag'))
+            self.assertTrue(response.has_header('Last-Modified'))
+            self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_not_modified(self):
+        for url in self.urls:
+            etag = self.get_anonymous(url)['ETag']
+            with self.assertNumQueries(0):
+                response = self.get_anonymous(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEquals(response.status_code, 304)
+            self.assertEquals(response.content, b'')
+
+    def test_if_modified_since(self):
+        for url in self.urls:
+            last_modified = self.get_anonymous(url)['Last-Modified']
+            response = self.get_anonymous(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEquals(response.status_code, 304)
+
+    def test_reply_changes_etag(self):
+        etags = [self.get_anonymous(url)['ETag'] for url in self.urls]
+        Post.objects.create(message='A new reply', topic=self.topic, created_by=self.user)
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEquals(response.status_code, 200)
+
+    def test_cleared_generations_do_not_repeat(self):
+        cache.clear()
+        etags = [self.get_anonymous(url)['ETag'] for url in self.urls]
+        cache.clear()
+        for url, etag in zip(self.urls, etags):
+            response = self.get_anonymous(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEquals(response.status_code, 200)
+
+    def test_delete_moves_last_modified(self):
+        reply = Post.objects.create(message='A new reply', topic=self.topic, created_by=self.user)
+        stamps = [self.get_anonymous(url)['Last-Modified'] for url in self.urls]
+        reply.delete()
+        # The newest post is now older than before, but the pages still changed.
+        with mock.patch('boards.caching.timezone.now', return_value=timezone.now() + timedelta(minutes=1)):
+            for url, stamp in zip(self.urls, stamps):
+                response = self.get_anonymous(url, HTTP_IF_MODIFIED_SINCE=stamp)
+                self.assertEquals(response.status_code, 200)
+
+    def test_etag_depends_on_reader(self):
+        url = self.urls[2]
+        etag = self.get_anonymous(url)['ETag']
+        self.client.login(username='john', password='123')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_login_changes_etag(self):
+        url = self.urls[2]
+        self.client.post(reverse('login'), {'username': 'john', 'password': '123'})
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('logout'))
+        self.client.post(reverse('login'), {'username': 'john', 'password': '123'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+
+    def test_not_modified_counts_view(self):
+        url = self.urls[2]
+        etag = self.get_anonymous(url)['ETag']
+        self.get_anonymous(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(pending_topic_views(self.topic.pk), 2)
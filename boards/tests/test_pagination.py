@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..counters import get_buffer
+from ..models import Board, Post, Topic
+from ..pagination import CursorPaginator
+
+
+class CursorPaginatorTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        now = timezone.now()
+        for i in range(7):
+            Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=user)
+        # Two topics share a timestamp so the id tie-breaker is exercised.
+        for i, topic in enumerate(Topic.objects.order_by('pk')):
+            Topic.objects.filter(pk=topic.pk).update(last_update=now - timedelta(minutes=min(i, 5)))
+        self.expected = list(Topic.objects.order_by('-last_update', '-id'))
+        self.paginator = CursorPaginator(self.board.topics.all(), ('-last_update', '-id'), 3)
+
+    def test_walk_forward_and_back(self):
+        first = self.paginator.page()
+        self.assertEquals(first.object_list, self.expected[:3])
+        self.assertFalse(first.has_previous())
+        second = self.paginator.page(first.next_cursor)
+        self.assertEquals(second.object_list, self.expected[3:6])
+        third = self.paginator.page(second.next_cursor)
+        self.assertEquals(third.object_list, self.expected[6:])
+        self.assertFalse(third.has_next())
+        back = self.paginator.page(third.previous_cursor)
+        self.assertEquals(back.object_list, self.expected[3:6])
+        self.assertTrue(back.has_next())
+        self.assertTrue(back.has_previous())
+
+    def test_deep_page_single_query(self):
+        cursor = self.paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            self.paginator.page(cursor)
+
+    def test_deep_page_seeks_index(self):
+        # The last page: its cursor is past every row but the final one.
+        queryset, _, _ = self.paginator.get_page_queryset(self.paginator.encode_cursor(self.expected[-2], False))
+        self.assertEquals(list(queryset), self.expected[-1:])
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[3] for row in cursor.fetchall())
+        self.assertIn('topic_board_last_update_idx (board_id=? AND last_update<?)', plan)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('board_topics', kwargs={'pk': self.board.pk}), {'cursor': 'garbage'})
+        self.assertEquals(response.status_code, 404)
+
+
+@override_settings(BOARDS_CURSOR_PAGINATION=True)
+class PostListCursorTests(TestCase):
+    def setUp(self):
+        board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        topic = Topic.objects.create(subject='Hello, world', board=board, starter=user)
+        for i in range(25):
+            Post.objects.create(message='Post {}'.format(i), topic=topic, created_by=user)
+        self.url = reverse('topic_posts', kwargs={'pk': board.pk, 'topic_pk': topic.pk})
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def test_next_page(self):
+        response = self.client.get(self.url)
+        page = response.context['page_obj']
+        self.assertEquals(len(page), 20)
+        self.assertContains(response, '?cursor={}'.format(page.next_cursor))
+        response = self.client.get(self.url, {'cursor': page.next_cursor})
+        self.assertEquals([post.message for post in response.context['posts']],
+                          ['Post {}'.format(i) for i in range(20, 25)])
+
+    def test_numbered_page_still_works(self):
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEquals(response.context['page_obj'].number, 2)
@@ -0,0 +1,42 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from ..management.commands.check_query_plans import Command
+from ..models import Board, Post, Topic
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[3] for row in cursor.fetchall()]
+
+
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.topic = Topic.objects.create(subject='Hello', board=self.board, starter=user)
+        Topic.objects.create(subject='Empty', board=self.board, starter=user)
+        for i in range(3):
+            Post.objects.create(message='Post {}'.format(i), topic=self.topic, created_by=user)
+
+    def test_with_replies(self):
+        replies = dict(self.board.topics.with_replies().values_list('subject', 'replies'))
+        self.assertEquals(replies, {'Hello': 2, 'Empty': -1})
+
+    def test_topic_list_walks_index(self):
+        plan = explain(self.board.topics.select_related('starter').order_by('-last_update').with_replies()[:20])
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_full_scan_fails(self):
+        command = Command(stdout=StringIO())
+        failures, warnings = command.explain([
+            ('scan', 'SELECT "id" FROM "boards_post" WHERE "message" = \'x\''),
+            ('search', 'SELECT "id" FROM "boards_post" WHERE "topic_id" = 1 ORDER BY "created_at"'),
+        ], {'verbose_plans': False})
+        self.assertEquals([name for name, sql in failures], ['scan'])
+        self.assertEquals(warnings, [])
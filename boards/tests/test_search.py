@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Board, Post, SearchCorpus, SearchDocument, Topic
+from ..search import InvertedIndexBackend, get_backend, search
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Deploying with gunicorn', board=self.board, starter=self.user)
+        self.post = Post.objects.create(message='Run the migrations before <b>deploying</b> anything.',
+                                        topic=self.topic, created_by=self.user)
+        other = Topic.objects.create(subject='Templates', board=self.board, starter=self.user)
+        Post.objects.create(message='Template inheritance and blocks.', topic=other, created_by=self.user)
+
+    def test_topic_subject(self):
+        results = search('gunicorn')
+        self.assertEquals(len(results), 1)
+        self.assertIsNone(results[0].post_id)
+        self.assertEquals(results[0].topic, self.topic)
+
+    def test_post_message_snippet(self):
+        results = search('migrations')
+        self.assertEquals([result.post_id for result in results], [self.post.pk])
+        self.assertIn('<mark>migrations</mark>', results[0].snippet)
+        self.assertNotIn('<b>', results[0].snippet)
+
+    def test_all_terms_required(self):
+        self.assertEquals(search('migrations templates'), [])
+
+    def test_edit_reindexes(self):
+        self.post.message = 'Collect static files first.'
+        self.post.save()
+        self.assertEquals(search('migrations'), [])
+        self.assertEquals([result.post_id for result in search('static')], [self.post.pk])
+
+    def test_delete_removes(self):
+        self.post.delete()
+        self.assertEquals(search('migrations'), [])
+
+    def test_rebuild_command(self):
+        get_backend().clear()
+        self.assertEquals(search('migrations'), [])
+        call_command('rebuild_search_index', chunk_size=1, stdout=StringIO())
+        self.assertEquals(len(search('migrations')), 1)
+
+    def test_search_view(self):
+        response = self.client.get(reverse('search'), {'q': 'migrations'})
+        self.assertContains(response, '<mark>migrations</mark>')
+        url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertContains(response, 'href="{}?page=1#{}"'.format(url, self.post.pk))
+
+    def test_result_page(self):
+        for i in range(25):
+            Post.objects.create(message='Reply {}'.format(i), topic=self.topic, created_by=self.user)
+        last = Post.objects.create(message='Restart gunicorn afterwards.', topic=self.topic, created_by=self.user)
+        results = search('restart', per_page=20)
+        self.assertEquals([(result.post_id, result.page) for result in results], [(last.pk, 2)])
+
+    def test_last_update_does_not_reindex(self):
+        self.topic.subject = 'Renamed without reindexing'
+        self.topic.save(update_fields=['last_update'])
+        self.assertEquals(len(search('gunicorn')), 1)
+        self.assertEquals(search('renamed'), [])
+
+
+@override_settings(BOARDS_SEARCH_BACKEND='boards.search.InvertedIndexBackend')
+class InvertedIndexSearchTests(SearchTests):
+    def test_index_shared_by_backends(self):
+        # Each backend instance stands in for another process.
+        other = InvertedIndexBackend()
+        Post.objects.create(message='Indexed by another worker.', topic=self.topic, created_by=self.user)
+        self.assertEquals(len(other.search('worker', 10)), 1)
+
+    def test_corpus_follows_documents(self):
+        self.post.message = 'A longer message than the one it replaces.'
+        self.post.save()
+        Post.objects.create(message='Another reply.', topic=self.topic, created_by=self.user)
+        self.topic.delete()
+        corpus = SearchCorpus.objects.get(pk=1)
+        stats = SearchDocument.objects.aggregate(documents=Count('pk'), length=Sum('length'))
+        self.assertEquals((corpus.documents, corpus.length), (stats['documents'], stats['length']))
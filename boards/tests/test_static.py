@@ -0,0 +1,131 @@
+import gzip
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from djangoProject1.staticfiles import BundleFinder, StaticFilesMiddleware, purge_css
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'djangoProject1.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+
+class PurgeCSSTests(SimpleTestCase):
+    def test_purge(self):
+        css = (
+            '/* comment */:root{--blue:#007bff}body{margin:0}.btn{padding:1px}.unused{color:red}'
+            '.btn:not(.unused):hover,.unused .btn{color:blue}a[href="x.y"]{color:green}'
+            '@media (min-width:576px){.unused{display:none}.btn{margin:0}}'
+            '@media print{.unused{display:none}}@font-face{font-family:x;src:url(x.woff)}'
+        )
+        self.assertEquals(purge_css(css, {'btn'}), (
+            ':root{--blue:#007bff}body{margin:0}.btn{padding:1px}.btn:not(.unused):hover{color:blue}'
+            'a[href="x.y"]{color:green}@media (min-width:576px){.btn{margin:0}}'
+            '@font-face{font-family:x;src:url(x.woff)}'
+        ))
+
+
+class BundleTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_builds_bundle(self):
+        bundles = {
+            'bundles/test.css': ['css/bootstrap.min.css', 'css/app.css'],
+            'bundles/test.js': ['js/popper.min.js'],
+        }
+        with self.settings(STATIC_BUNDLES=bundles, STATIC_BUNDLE_DIR=self.directory):
+            path = BundleFinder().find('bundles/test.css')
+            self.assertIsNone(BundleFinder().find('css/app.css'))
+        with open(path) as bundle:
+            css = bundle.read()
+        self.assertIn('.navbar-brand', css)
+        self.assertIn('.breadcrumb', css)
+        self.assertNotIn('.carousel', css)
+        self.assertNotIn('sourceMappingURL', css)
+
+    def test_tag(self):
+        template = Template("{% load bundles %}{% bundle 'bundles/site.js' %}")
+        with self.settings(USE_STATIC_BUNDLES=False):
+            self.assertEquals(template.render(Context()).count('<script'), 3)
+        with self.settings(USE_STATIC_BUNDLES=True):
+            self.assertEquals(template.render(Context()), '<script src="/static/bundles/site.js"></script>')
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.build = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.root, STATIC_BUNDLE_DIR=cls.build, STORAGES=STORAGES))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.middleware = StaticFilesMiddleware(lambda request: HttpResponse('app'))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.root)
+        shutil.rmtree(cls.build)
+
+    def get(self, path, method='get', **headers):
+        return self.middleware(getattr(RequestFactory(), method)(path, headers=headers))
+
+    def test_hashed_file_immutable_and_compressed(self):
+        url = staticfiles_storage.url('bundles/site.css')
+        self.assertNotEqual(url, '/static/bundles/site.css')
+        response = self.get(url, accept_encoding='gzip, deflate')
+        self.assertEquals(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        self.assertEquals(response['Content-Type'], 'text/css')
+        self.assertEquals(response['Vary'], 'Accept-Encoding')
+        css = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'.navbar-brand', css)
+        self.assertEquals(int(response['Content-Length']), len(gzip.compress(css, mtime=0, compresslevel=9)))
+
+        response = self.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.get(url, accept_encoding='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_not_modified(self):
+        url = staticfiles_storage.url('js/popper.min.js')
+        etag = self.get(url, accept_encoding='gzip')['ETag']
+        response = self.get(url, accept_encoding='gzip', if_none_match=etag)
+        self.assertEquals(response.status_code, 304)
+        self.assertEquals(self.get(url, if_none_match=etag).status_code, 200)
+
+    def test_head(self):
+        response = self.get(staticfiles_storage.url('css/app.css'), method='head')
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.content, b'')
+        self.assertEquals(response['Content-Length'], '54')
+
+    def test_unhashed_name_revalidated(self):
+        response = self.get('/static/css/app.css')
+        self.assertEquals(response['Cache-Control'], 'public, max-age=60')
+
+    def test_only_collected_files(self):
+        for path in ('/static/missing.css', '/static/../djangoProject1/settings.py',
+                     '/static/css/app.css.gz', '/static/staticfiles.json', '/boards/'):
+            self.assertEquals(self.get(path).content, b'app', path)
+        self.assertEquals(self.get('/static/css/app.css', method='post').content, b'app')
+
+    def test_uncollected_file_linked_unhashed(self):
+        self.assertEquals(staticfiles_storage.url('css/simplemde.min.css'), '/static/css/simplemde.min.css')
+
+
+class StaticFilesMiddlewareNotCollectedTests(SimpleTestCase):
+    def test_not_used(self):
+        with self.settings(STATIC_ROOT='/nonexistent'), self.assertRaises(MiddlewareNotUsed):
+            StaticFilesMiddleware(lambda request: HttpResponse())
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.template import Context, Template, engines
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from djangoProject1.templating import precompile_templates, profile_templates
+from ..models import Board, Topic
+
+
+class TemplateProfileTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        Topic.objects.create(subject='Hello', board=self.board, starter=user)
+
+    def test_lookup_queries_attributed(self):
+        template = Template('{{ board.topics.count }} {{ board.name }}')
+        with profile_templates() as profile:
+            self.assertEquals(template.render(Context({'board': self.board})), '1 Django')
+        report = profile.report()
+        self.assertEquals([(row['name'], row['calls'], row['queries']) for row in report['templates']],
+                          [('<string>', 1, 1)])
+        self.assertEquals(report['lookups'], [{'template': '<string>', 'variable': 'board.topics.count',
+                                               'queries': 1}])
+
+    def test_includes_reported(self):
+        template = engines['django'].from_string(
+            "{% for i in items %}{% include 'includes/pagination.html' %}{% endfor %}"
+        )
+        with profile_templates() as profile:
+            template.render({'items': [1, 2]})
+        includes = profile.report()['includes']
+        self.assertEquals(len(includes), 1)
+        self.assertEquals(includes[0]['calls'], 2)
+        self.assertIn("{% include 'includes/pagination.html' %}", includes[0]['name'])
+
+    def test_inactive_without_profile(self):
+        with profile_templates() as profile:
+            pass
+        Template('{{ board.topics.count }}').render(Context({'board': self.board}))
+        self.assertEquals(profile.report(), {'templates': [], 'includes': [], 'lookups': []})
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0, INSTRUMENTATION_TEMPLATE_PROFILE=True, DEBUG=False)
+    def test_instrumentation_record(self):
+        with self.assertLogs('djangoProject1.instrumentation') as logs:
+            self.client.get(reverse('board_topics', kwargs={'pk': self.board.pk}))
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertIn('topics.html', [row['name'] for row in record['templates']])
+        self.assertEquals(record['lookups'], [])
+
+
+class PrecompileTemplatesTests(TestCase):
+    def test_project_templates_compile(self):
+        compiled, errors = precompile_templates()
+        self.assertGreater(compiled, 0)
+        self.assertEquals(errors, [])
+
+    def test_syntax_errors_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as f:
+                f.write('{% if %}')
+            templates = [{**settings.TEMPLATES[0], 'DIRS': [directory]}]
+            with override_settings(TEMPLATES=templates):
+                self.assertIn('broken.html', [name for name, _ in precompile_templates()[1]])
+                with self.assertRaises(CommandError):
+                    call_command('precompile_templates', stdout=StringIO(), stderr=StringIO())
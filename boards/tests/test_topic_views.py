@@ -0,0 +1,107 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import CacheViewBuffer, flush_topic_views, get_buffer, pending_topic_views, record_topic_view
+from ..models import Board, Post, Topic
+from ..viewed import COOKIE_NAME
+
+
+@override_settings(TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class TopicViewCounterTests(TestCase):
+    def setUp(self):
+        board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=board, starter=user)
+        self.other = Topic.objects.create(subject='Other', board=board, starter=user)
+        Post.objects.create(message='Lorem ipsum dolor sit amet', topic=self.topic, created_by=user)
+        self.url = reverse('topic_posts', kwargs={'pk': board.pk, 'topic_pk': self.topic.pk})
+        get_buffer().drain()
+        cache.clear()
+
+    def tearDown(self):
+        get_buffer().drain()
+        cache.clear()
+
+    def test_view_is_buffered(self):
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.views, 0)
+        self.assertEquals(pending_topic_views(self.topic.pk), 1)
+        self.assertEquals(response.context['topic'].views, 1)
+
+    def test_view_counted_once_per_reader(self):
+        response = self.client.get(self.url)
+        self.assertIn(COOKIE_NAME, response.cookies)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        # The second request is a page cache hit, answered from the cookie.
+        response = self.client.get(self.url)
+        self.assertNotIn(COOKIE_NAME, response.cookies)
+        self.assertEquals(pending_topic_views(self.topic.pk), 1)
+        self.client.cookies.clear()
+        self.client.get(self.url)
+        self.assertEquals(pending_topic_views(self.topic.pk), 2)
+
+    def test_flush(self):
+        for _ in range(3):
+            record_topic_view(self.topic.pk)
+        record_topic_view(self.other.pk)
+        # Two grouped UPDATEs, then the trending scores of both topics under the ranking lock.
+        with self.assertNumQueries(8):
+            self.assertEquals(flush_topic_views(), 2)
+        self.topic.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEquals(self.topic.views, 3)
+        self.assertEquals(self.other.views, 1)
+        self.assertEquals(pending_topic_views(self.topic.pk), 0)
+
+    @override_settings(TOPIC_VIEWS_MAX_BUFFER=2)
+    def test_flush_when_buffer_full(self):
+        record_topic_view(self.topic.pk)
+        record_topic_view(self.other.pk)
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.views, 1)
+
+    def test_command_refuses_local_buffer(self):
+        if settings.TOPIC_VIEWS_BUFFER != 'local':
+            self.skipTest('Shared buffer.')
+        with self.assertRaises(CommandError):
+            call_command('flush_topic_views')
+
+
+@override_settings(TOPIC_VIEWS_BUFFER='cache')
+class CacheTopicViewCounterTests(TopicViewCounterTests):
+    def test_buffers_of_other_processes_are_flushed(self):
+        # Each buffer stands in for a worker process sharing the cache.
+        for buffer in (CacheViewBuffer(), CacheViewBuffer(), CacheViewBuffer()):
+            buffer.add(self.topic.pk)
+            buffer.add(self.other.pk)
+        call_command('flush_topic_views', stdout=StringIO())
+        self.topic.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEquals((self.topic.views, self.other.views), (3, 3))
+
+    def test_views_during_flush_stay_buffered(self):
+        buffer = get_buffer()
+        buffer.add(self.topic.pk)
+        pending = buffer.drain()
+        buffer.add(self.topic.pk)
+        # A second flush meanwhile finds the lock taken.
+        self.assertEquals(buffer.drain(), {})
+        buffer.acknowledge(pending)
+        self.assertEquals(buffer.drain(), {self.topic.pk: 1})
+
+    def test_acknowledge_evicted_counter(self):
+        buffer = get_buffer()
+        buffer.add(self.topic.pk)
+        pending = buffer.drain()
+        cache.delete(buffer.key(self.topic.pk))
+        buffer.acknowledge(pending)
+        record_topic_view(self.topic.pk)
+        self.assertEquals(pending_topic_views(self.topic.pk), 1)
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..models import Board, BoardStats, ImportCheckpoint, Post, Topic
+
+
+class ForumTransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'forum.jsonl')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        editor = User.objects.create_user(username='jane', email='jane@doe.com', password='123')
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        for i in range(3):
+            topic = Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.user)
+            for j in range(4):
+                Post.objects.create(message='Post {} {}'.format(i, j), topic=topic, created_by=self.user)
+        Post.objects.filter(message='Post 0 0').update(updated_by=editor)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def export(self, path=None, **options):
+        call_command('export_forum', path or self.path, stdout=StringIO(), **options)
+
+    def import_(self, path=None, **options):
+        call_command('import_forum', path or self.path, stdout=StringIO(), **options)
+
+    def snapshot(self):
+        return sorted(Post.objects.values_list(
+            'message', 'created_at', 'topic__subject', 'topic__last_update', 'topic__board__name',
+            'created_by__username', 'updated_by__username',
+        ))
+
+    def clear(self):
+        Board.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_export_one_object_per_line(self):
+        self.export(chunk_size=5)
+        with open(self.path) as dump:
+            records = [json.loads(line) for line in dump]
+        self.assertEquals([record['model'] for record in records],
+                          ['auth.user'] * 2 + ['boards.board'] + ['boards.topic'] * 3 + ['boards.post'] * 12)
+        self.assertEquals(records[-1]['fields']['message'], 'Post 2 3')
+
+    def test_round_trip(self):
+        before = self.snapshot()
+        password = self.user.password
+        self.export(self.path + '.gz', chunk_size=5)
+        self.clear()
+        User.objects.create_user(username='someone')  # Shifts the new primary keys.
+        self.import_(self.path + '.gz', batch_size=5)
+        self.assertEquals(self.snapshot(), before)
+        self.assertEquals(User.objects.get(username='john').password, password)
+        stats = BoardStats.objects.get(board__name='Django')
+        self.assertEquals((stats.topics_count, stats.posts_count), (3, 12))
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_existing_users_and_boards_reused(self):
+        self.export()
+        out = StringIO()
+        call_command('import_forum', self.path, stdout=out)
+        self.assertEquals(User.objects.count(), 2)
+        self.assertEquals(Board.objects.count(), 1)
+        self.assertEquals(Post.objects.count(), 24)
+        self.assertIn('Reused 2 existing auth.user with the same username: john, jane', out.getvalue())
+        self.assertIn('Reused 1 existing boards.board with the same name: Django', out.getvalue())
+        # The imported times are written back; the model fields are left alone.
+        self.assertTrue(Post._meta.get_field('created_at').auto_now_add)
+
+    def test_render(self):
+        self.export()
+        self.clear()
+        self.import_(render=True)
+        self.assertEquals(Post.objects.filter(message_html='').count(), 0)
+
+    def test_resume_after_failure(self):
+        self.export()
+        before = self.snapshot()
+        with open(self.path) as dump:
+            lines = dump.readlines()
+        broken = lines[:10] + ['{not json\n'] + lines[11:]
+        with open(self.path, 'w') as dump:
+            dump.writelines(broken)
+        self.clear()
+        with self.assertRaises(CommandError):
+            self.import_(batch_size=2)
+        self.assertEquals(ImportCheckpoint.objects.get(source=self.path).line, 8)
+        self.assertEquals(Post.objects.count(), 2)
+
+        with open(self.path, 'w') as dump:
+            dump.writelines(lines)
+        out = StringIO()
+        call_command('import_forum', self.path, batch_size=2, stdout=out)
+        self.assertIn('Resuming after line 8.', out.getvalue())
+        self.assertEquals(self.snapshot(), before)
+
+    def test_unknown_reference(self):
+        with open(self.path, 'w') as dump:
+            dump.write(json.dumps({'model': 'boards.topic', 'pk': 1, 'fields': {
+                'subject': 'Orphan', 'board': 42, 'starter': 1,
+            }}) + '\n')
+        with self.assertRaisesMessage(CommandError, 'refers to unknown boards.board 42'):
+            self.import_()
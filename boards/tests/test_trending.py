@@ -0,0 +1,105 @@
+import math
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import trending
+from ..counters import flush_topic_views, get_buffer, record_topic_view
+from ..models import Board, Post, Topic, TopicTrend
+
+
+@override_settings(
+    BOARDS_TRENDING_HALF_LIFE=3600, BOARDS_TRENDING_VIEW_WEIGHT=1, BOARDS_TRENDING_REPLY_WEIGHT=10,
+    TOPIC_VIEWS_FLUSH_INTERVAL=3600,
+)
+class TrendingTests(TestCase):
+    def setUp(self):
+        get_buffer().drain()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topics = [Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.user)
+                       for i in range(3)]
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def heat(self, topic, now):
+        """The decayed activity of a topic at `now`, in views."""
+        score = TopicTrend.objects.get(pk=topic.pk).score
+        return 2 ** (score - trending.log_weight(1, now))
+
+    def test_log_add(self):
+        self.assertAlmostEquals(trending.log_add(3, 3), 4)
+        self.assertAlmostEquals(trending.log_add(None, 5), 5)
+        self.assertAlmostEquals(2 ** trending.log_add(math.log2(3), math.log2(5)), 8)
+
+    def test_flushed_views(self):
+        for _ in range(3):
+            record_topic_view(self.topics[1].pk)
+        record_topic_view(self.topics[2].pk)
+        flush_topic_views()
+        self.assertEquals(trending.trending_topics(), [self.topics[1], self.topics[2]])
+        self.assertAlmostEquals(self.heat(self.topics[1], timezone.now()), 3, places=2)
+
+    def test_decay(self):
+        now = timezone.now()
+        trending.add_activity({self.topics[0].pk: trending.log_weight(10, now - timedelta(hours=2))})
+        trending.record_views({self.topics[1].pk: 5}, now)
+        self.assertAlmostEquals(self.heat(self.topics[0], now), 2.5)
+        self.assertEquals(trending.trending_topics()[0], self.topics[1])
+
+    def test_replies_counted_once(self):
+        for topic, replies in zip(self.topics, (1, 3, 2)):
+            for _ in range(replies):
+                Post.objects.create(message='Reply', topic=topic, created_by=self.user)
+        self.assertEquals(trending.update_from_posts(), 6)
+        self.assertEquals(trending.trending_topics(), [self.topics[1], self.topics[2], self.topics[0]])
+        self.assertEquals(trending.update_from_posts(), 0)
+        Post.objects.create(message='Reply', topic=self.topics[0], created_by=self.user)
+        # Lock and read the checkpoint, read the posts and scores, write both back.
+        with self.assertNumQueries(8):
+            self.assertEquals(trending.update_from_posts(), 1)
+
+    def test_first_run_skips_old_posts(self):
+        old = Post.objects.create(message='Old', topic=self.topics[0], created_by=self.user)
+        Post.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        Post.objects.create(message='New', topic=self.topics[1], created_by=self.user)
+        self.assertEquals(trending.update_from_posts(), 1)
+        self.assertEquals(trending.trending_topics(), [self.topics[1]])
+
+    def test_checkpoint_survives_topic_delete(self):
+        for topic in self.topics:
+            Post.objects.create(message='Reply', topic=topic, created_by=self.user)
+        self.assertEquals(trending.update_from_posts(), 3)
+        # The second topic cools down and the one with the newest post counted is deleted.
+        TopicTrend.objects.filter(pk=self.topics[1].pk).delete()
+        self.topics[2].delete()
+        self.assertEquals(trending.update_from_posts(), 0)
+        self.assertEquals(trending.trending_topics(), [self.topics[0]])
+
+    def test_prune(self):
+        now = timezone.now()
+        trending.add_activity({self.topics[0].pk: trending.log_weight(1, now - timedelta(hours=5))})
+        trending.record_views({self.topics[1].pk: 1}, now)
+        self.assertEquals(trending.prune(now), 1)
+        self.assertEquals(trending.trending_topics(), [self.topics[1]])
+
+    def test_command(self):
+        Post.objects.create(message='Reply', topic=self.topics[0], created_by=self.user)
+        out = StringIO()
+        call_command('update_trending', stdout=out)
+        self.assertIn('Counted 1 new posts', out.getvalue())
+
+    def test_feed_single_query(self):
+        for topic in self.topics:
+            Post.objects.create(message='Reply', topic=topic, created_by=self.user)
+        trending.update_from_posts()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('trending'))
+        for topic in self.topics:
+            self.assertContains(response, topic.subject)
@@ -0,0 +1,116 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counters import get_buffer
+from ..models import Board, BoardRead, Post, Topic, TopicRead
+from ..unread import get_read_marker, mark_read
+
+
+@override_settings(TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class UnreadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_buffer().drain()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.author = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.reader = User.objects.create_user(username='jane', email='jane@doe.com', password='123')
+        self.topic = self.create_topic('Hello', posts=3)
+        self.topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
+        self.posts_url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.client.force_login(self.reader)
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def create_topic(self, subject, posts):
+        topic = Topic.objects.create(subject=subject, board=self.board, starter=self.author)
+        self.add_posts(topic, posts)
+        return topic
+
+    def add_posts(self, topic, count):
+        for i in range(count):
+            Post.objects.create(message='Post {}'.format(i), topic=topic, created_by=self.author)
+
+    def get_unread(self):
+        response = self.client.get(self.topics_url)
+        return {topic.subject: topic.unread for topic in response.context['topics']}
+
+    def test_unread_counts(self):
+        self.assertEquals(self.get_unread(), {'Hello': 3})
+        self.client.get(self.posts_url)
+        self.assertEquals(self.get_unread(), {'Hello': 0})
+        self.add_posts(self.topic, 2)
+        self.assertEquals(self.get_unread(), {'Hello': 2})
+
+    def test_topic_list_queries_constant(self):
+        self.client.get(self.topics_url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.topics_url)
+        for i in range(10):
+            self.create_topic('Topic {}'.format(i), posts=2)
+        self.client.get(self.topics_url)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.topics_url)
+        self.assertEquals(len(many), len(few))
+        self.assertContains(response, 'badge badge-primary', count=11)
+
+    def test_marker_written_only_when_it_advances(self):
+        self.client.get(self.posts_url)
+        marker = TopicRead.objects.get(user=self.reader, topic=self.topic).last_read_post_id
+        self.assertEquals(marker, self.topic.posts.order_by('-pk')[0].pk)
+        self.assertFalse(mark_read(self.reader, self.topic.pk, list(self.topic.posts.all()), marker))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.posts_url)
+        self.assertFalse([query for query in queries if 'boards_topicread' in query['sql']
+                          and not query['sql'].startswith('SELECT')])
+
+    def test_jump_to_first_unread(self):
+        self.client.get(self.posts_url)
+        self.add_posts(self.topic, 25)
+        first_unread = self.topic.posts.order_by('pk')[3]
+        response = self.client.get(self.posts_url)
+        self.assertRedirects(response, '{}?page=1#{}'.format(self.posts_url, first_unread.pk),
+                             fetch_redirect_response=False)
+        self.client.get(self.posts_url + '?page=2')
+        last = self.topic.posts.order_by('-pk')[0]
+        self.assertEquals(get_read_marker(self.reader, self.topic.pk), last.pk)
+        # Up to date: the topic opens on its first page.
+        self.assertEquals(self.client.get(self.posts_url).status_code, 200)
+
+    def test_first_visit_not_redirected(self):
+        self.assertEquals(self.client.get(self.posts_url).status_code, 200)
+
+    def test_mark_board_read(self):
+        other = self.create_topic('Other', posts=2)
+        self.client.get(self.posts_url)
+        response = self.client.post(reverse('mark_board_read', kwargs={'pk': self.board.pk}))
+        self.assertRedirects(response, self.topics_url)
+        self.assertEquals(self.get_unread(), {'Hello': 0, 'Other': 0})
+        self.assertTrue(BoardRead.objects.filter(user=self.reader, board=self.board).exists())
+        self.assertFalse(TopicRead.objects.filter(user=self.reader).exists())
+        self.add_posts(other, 1)
+        self.assertEquals(self.get_unread(), {'Hello': 0, 'Other': 1})
+
+    def test_etag_changes_when_read(self):
+        # The first page hands out the CSRF cookie, which the ETag includes.
+        self.client.get(self.topics_url)
+        etag = self.client.get(self.topics_url)['ETag']
+        self.assertEquals(self.client.get(self.topics_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.get(self.posts_url)
+        self.assertEquals(self.client.get(self.topics_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_anonymous_untouched(self):
+        self.client.logout()
+        response = self.client.get(self.topics_url)
+        self.assertNotContains(response, 'Mark all read')
+        self.client.get(self.posts_url)
+        self.assertFalse(TopicRead.objects.exists())
+
+
+@override_settings(ROOT_URLCONF='djangoProject1.urls_async', TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class AsyncUnreadTests(UnreadTests):
+    pass
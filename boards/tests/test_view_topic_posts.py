@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import get_buffer
+from ..models import Board, Post, Topic
+
+
+@override_settings(TOPIC_VIEWS_FLUSH_INTERVAL=3600)
+class TopicPostsQueryCountTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.url = reverse('topic_posts', kwargs={'pk': self.board.pk, 'topic_pk': self.topic.pk})
+        get_buffer().drain()
+
+    def tearDown(self):
+        get_buffer().drain()
+
+    def create_posts(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            author = User.objects.create_user(username='user{}'.format(i), email='user{}@doe.com'.format(i))
+            Post.objects.create(message='Post {}'.format(i), topic=self.topic, created_by=author)
+        Post.objects.create(message='Another', topic=self.topic, created_by=author)
+
+    def test_constant_queries(self):
+        self.create_posts(2)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        self.create_posts(20)
+        self.client.cookies.clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEquals(len(response.context['posts']), 20)
+
+    def test_author_post_count(self):
+        self.create_posts(1)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Posts: 2', 2)
@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Board, Post, Topic
+
+
+class TopicListQueryCountTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.url = reverse('board_topics', kwargs={'pk': self.board.pk})
+
+    def create_topics(self, count, posts):
+        for i in range(count):
+            topic = Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.user)
+            Post.objects.bulk_create([
+                Post(message='Post {}'.format(j), topic=topic, created_by=self.user) for j in range(posts)
+            ])
+
+    def test_page_links_from_annotation(self):
+        self.create_topics(1, 150)
+        response = self.client.get(self.url)
+        self.assertContains(response, '?page=4')
+        self.assertContains(response, 'Last Page')
+        self.assertContains(response, '?page=8')
+
+    @override_settings(BOARDS_CURSOR_PAGINATION=True)
+    def test_constant_queries_cursor(self):
+        self.create_topics(3, 25)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        self.create_topics(15, 25)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEquals(len(response.context['topics']), 18)
+
+    @override_settings(BOARDS_CURSOR_PAGINATION=False)
+    def test_constant_queries_offset(self):
+        self.create_topics(20, 3)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
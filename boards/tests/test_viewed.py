@@ -0,0 +1,47 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..viewed import COOKIE_NAME, ViewedTopics
+
+
+@override_settings(BOARDS_VIEWED_TOPICS_SIZE=3)
+class ViewedTopicsTests(SimpleTestCase):
+    def round_trip(self, viewed):
+        """A request carrying the cookie `viewed` would have set."""
+        response = HttpResponse()
+        viewed.save(response)
+        request = RequestFactory().get('/')
+        if COOKIE_NAME in response.cookies:
+            request.COOKIES[COOKIE_NAME] = response.cookies[COOKIE_NAME].value
+        return ViewedTopics(request)
+
+    def test_add(self):
+        viewed = ViewedTopics(RequestFactory().get('/'))
+        self.assertTrue(viewed.add(1))
+        self.assertFalse(viewed.add(1))
+        viewed = self.round_trip(viewed)
+        self.assertIn(1, viewed)
+        self.assertFalse(viewed.add(1))
+        self.assertFalse(viewed.changed)
+
+    def test_bounded_least_recently_viewed_first(self):
+        viewed = ViewedTopics(RequestFactory().get('/'))
+        for topic_id in (1, 2, 3, 1, 4, 5000000):
+            viewed.add(topic_id)
+        viewed = self.round_trip(viewed)
+        self.assertEquals(viewed.topic_ids, [1, 4, 5000000])
+        self.assertTrue(viewed.add(2))
+
+    def test_tampered_cookie_ignored(self):
+        viewed = ViewedTopics(RequestFactory().get('/'))
+        viewed.add(1)
+        response = HttpResponse()
+        viewed.save(response)
+        request = RequestFactory().get('/')
+        request.COOKIES[COOKIE_NAME] = response.cookies[COOKIE_NAME].value.replace('1', '2', 1)
+        self.assertEquals(ViewedTopics(request).topic_ids, [])
+
+    def test_unchanged_not_saved(self):
+        response = HttpResponse()
+        ViewedTopics(RequestFactory().get('/')).save(response)
+        self.assertNotIn(COOKIE_NAME, response.cookies)
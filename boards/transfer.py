@@ -0,0 +1,231 @@
+import gzip
+import io
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+
+from boards.caching import bump_generation
+from boards.models import Board, ImportCheckpoint, ImportedKey, Post, Topic
+
+# (label, model, plain fields, foreign keys as {field: label of the target}),
+# in the order objects must be imported.
+MODELS = (
+    ('auth.user', User, (
+        'username', 'email', 'password', 'first_name', 'last_name',
+        'is_staff', 'is_active', 'is_superuser', 'last_login', 'date_joined',
+    ), {}),
+    ('boards.board', Board, ('name', 'description'), {}),
+    ('boards.topic', Topic, ('subject', 'last_update', 'views'), {'board': 'boards.board', 'starter': 'auth.user'}),
+    ('boards.post', Post, ('message', 'created_at', 'updated_at'), {
+        'topic': 'boards.topic', 'created_by': 'auth.user', 'updated_by': 'auth.user',
+    }),
+)
+SPECS = {label: (model, fields, foreign_keys) for label, model, fields, foreign_keys in MODELS}
+# Existing rows with the same natural key are reused instead of duplicated.
+NATURAL_KEYS = {'auth.user': 'username', 'boards.board': 'name'}
+# Posts are not referenced by anything in the export, so their keys are not kept.
+MAPPED = ('auth.user', 'boards.board', 'boards.topic')
+# auto_now_add fields: bulk_create stamps them with the current time, so the
+# imported values are written back with an UPDATE.
+TIMESTAMPS = {'boards.topic': ('last_update',), 'boards.post': ('created_at',)}
+PROGRESS_INTERVAL = 5
+
+
+def open_dump(path, mode):
+    """Open a JSONL dump for text reading or writing; `.gz` paths are compressed."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def encode_value(value):
+    # isoformat() keeps microseconds, which DjangoJSONEncoder would round off.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+class Progress:
+    def __init__(self, stdout, verb):
+        self.stdout = stdout
+        self.verb = verb
+        self.start = self.last = time.monotonic()
+
+    def report(self, label, count, force=False):
+        now = time.monotonic()
+        if self.stdout is None or (not force and now - self.last < PROGRESS_INTERVAL):
+            return
+        self.last = now
+        self.stdout.write('{} {} {} ({:.0f}/s)'.format(
+            self.verb, count, label, count / max(now - self.start, 1e-6)
+        ))
+
+
+def export_forum(stream, chunk_size=2000, stdout=None):
+    """
+    Write every user, board, topic and post to `stream` as one JSON object per
+    line. Rows are read in primary key chunks, so memory use stays flat however
+    large the forum is. Returns the number of objects written.
+    """
+    progress = Progress(stdout, 'Exported')
+    written = 0
+    for label, model, fields, foreign_keys in MODELS:
+        columns = ('pk', *fields, *('{}_id'.format(name) for name in foreign_keys))
+        names = (*fields, *foreign_keys)
+        count = 0
+        last_pk = 0
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(*columns)[:chunk_size])
+            if not rows:
+                break
+            for row in rows:
+                record = {'model': label, 'pk': row[0], 'fields': dict(zip(names, row[1:]))}
+                stream.write(json.dumps(record, default=encode_value, separators=(',', ':')))
+                stream.write('\n')
+            count += len(rows)
+            last_pk = rows[-1][0]
+            progress.report(label, count)
+        progress.report(label, count, force=True)
+        written += count
+    return written
+
+
+class InvalidDump(ValueError):
+    pass
+
+
+class ForumImporter:
+    """
+    Load a dump written by `export_forum`, in batches of `bulk_create` that each
+    commit in their own transaction. Primary keys are reassigned by the target
+    database and foreign keys are remapped through the keys seen so far.
+
+    With a `checkpoint` name, every batch also records the input position and
+    the new keys in `ImportCheckpoint` and `ImportedKey`, in the same
+    transaction, so an interrupted import started again with the same name
+    skips straight to where it stopped. Users and boards that already exist
+    with the same username or name are reused and listed in `matched`.
+    """
+
+    def __init__(self, batch_size=1000, checkpoint=None, render=False, stdout=None):
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.render = render
+        self.stdout = stdout
+        self.maps = {label: {} for label in MAPPED}
+        self.counts = {label: 0 for label in SPECS}
+        self.matched = {label: [] for label in NATURAL_KEYS}
+        self.position = 0
+
+    def load_checkpoint(self):
+        if not self.checkpoint:
+            return False
+        state = ImportCheckpoint.objects.filter(source=self.checkpoint).first()
+        if state is None:
+            return False
+        self.position = state.line
+        self.counts.update(state.counts)
+        self.matched.update(state.matched)
+        for label, old, new in state.keys.values_list('model', 'old_pk', 'new_pk').iterator():
+            self.maps[label][old] = new
+        return True
+
+    def write_checkpoint(self, label, keys):
+        if not self.checkpoint:
+            return
+        state, _ = ImportCheckpoint.objects.update_or_create(source=self.checkpoint, defaults={
+            'line': self.position, 'counts': self.counts, 'matched': self.matched,
+        })
+        ImportedKey.objects.bulk_create(
+            [ImportedKey(checkpoint=state, model=label, old_pk=old, new_pk=new) for old, new in keys]
+        )
+
+    def run(self, stream):
+        """Import everything after the checkpointed position; returns the object counts."""
+        resumed_at = self.position
+        progress = Progress(self.stdout, 'Imported')
+        batch, label = [], None
+        for number, line in enumerate(stream, start=1):
+            if number <= resumed_at or not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                record_label = record['model']
+                if record_label not in SPECS:
+                    raise KeyError(record_label)
+            except (ValueError, KeyError, TypeError) as e:
+                raise InvalidDump('Line {}: invalid record ({}).'.format(number, e))
+            if batch and (record_label != label or len(batch) >= self.batch_size):
+                self.flush(label, batch)
+                progress.report(label, self.counts[label])
+                batch = []
+            label = record_label
+            batch.append((number, record))
+        if batch:
+            self.flush(label, batch)
+        for label in SPECS:
+            progress.report(label, self.counts[label], force=True)
+        if self.checkpoint:
+            ImportCheckpoint.objects.filter(source=self.checkpoint).delete()
+        self.finish()
+        return self.counts
+
+    def build(self, label, number, record):
+        model, fields, foreign_keys = SPECS[label]
+        values = record.get('fields', {})
+        obj = model(**{name: model._meta.get_field(name).to_python(values.get(name)) for name in fields
+                       if name in values})
+        for name, target in foreign_keys.items():
+            old = values.get(name)
+            if old is None:
+                continue
+            try:
+                setattr(obj, '{}_id'.format(name), self.maps[target][old])
+            except KeyError:
+                raise InvalidDump('Line {}: {} {} refers to unknown {} {}.'.format(
+                    number, label, record.get('pk'), target, old
+                ))
+        if label == 'boards.post' and self.render:
+            obj.render_message()
+        return obj
+
+    def flush(self, label, batch):
+        model = SPECS[label][0]
+        objects = [(record.get('pk'), self.build(label, number, record)) for number, record in batch]
+        keys = []
+        with transaction.atomic():
+            natural_key = NATURAL_KEYS.get(label)
+            if natural_key:
+                existing = dict(model.objects.filter(
+                    **{'{}__in'.format(natural_key): [getattr(obj, natural_key) for _, obj in objects]}
+                ).values_list(natural_key, 'pk'))
+                matched = [(old, obj) for old, obj in objects if getattr(obj, natural_key) in existing]
+                keys.extend((old, existing[getattr(obj, natural_key)]) for old, obj in matched)
+                self.matched[label].extend(getattr(obj, natural_key) for _, obj in matched)
+                objects = [(old, obj) for old, obj in objects if getattr(obj, natural_key) not in existing]
+            fields = TIMESTAMPS.get(label, ())
+            timestamps = [[getattr(obj, name) for name in fields] for _, obj in objects]
+            created = model.objects.bulk_create([obj for _, obj in objects])
+            keys.extend((old, obj.pk) for (old, _), obj in zip(objects, created))
+            if fields:
+                for obj, values in zip(created, timestamps):
+                    for name, value in zip(fields, values):
+                        if value is not None:
+                            setattr(obj, name, value)
+                model.objects.bulk_update(created, fields)
+            self.position = batch[-1][0]
+            self.counts[label] += len(batch)
+            if label in self.maps:
+                self.maps[label].update(keys)
+            self.write_checkpoint(label, keys if label in self.maps else [])
+
+    def finish(self):
+        # bulk_create skips the signal receivers that keep these up to date.
+        call_command('rebuild_board_stats', stdout=io.StringIO())
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        bump_generation('site', 0)
+        for board_id in set(self.maps['boards.board'].values()):
+            bump_generation('board', board_id)
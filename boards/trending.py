@@ -0,0 +1,162 @@
+"""
+Time-decayed "trending" ranking of topics.
+
+A topic's heat is the sum of its activity weights, each halved every
+BOARDS_TRENDING_HALF_LIFE seconds. Decay scales every topic by the same
+factor, so the ranking only changes when activity is added: an event at time
+t adds `weight * 2 ** ((t - EPOCH) / half_life)` to a score that is never
+touched again otherwise. Scores are kept as base-2 logarithms so they do not
+overflow.
+
+Every write to the ranking starts by updating the `TrendingCheckpoint` row.
+On SQLite that takes the database write lock, which `select_for_update`
+does not, so two writers never read and rewrite the same scores at once.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from boards.models import Post, Topic, TopicTrend, TrendingCheckpoint
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+CHUNK_SIZE = 2000
+
+
+def log_weight(weight, when):
+    return math.log2(weight) + (when - EPOCH).total_seconds() / settings.BOARDS_TRENDING_HALF_LIFE
+
+
+def log_add(a, b):
+    """log2(2**a + 2**b) without leaving log space."""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def lock_ranking():
+    """Update the checkpoint row, holding the write lock until the surrounding transaction ends."""
+    now = timezone.now()
+    if not TrendingCheckpoint.objects.filter(pk=1).update(updated_at=now):
+        TrendingCheckpoint.objects.bulk_create([TrendingCheckpoint(pk=1, updated_at=now)], ignore_conflicts=True)
+
+
+def add_activity(scores):
+    """
+    Fold `{topic_id: log score}` increments into the stored ranking. Only the
+    rows of the given topics are read and written.
+    """
+    if not scores:
+        return
+    with transaction.atomic():
+        lock_ranking()
+        fold_activity(scores)
+
+
+def fold_activity(scores):
+    """`add_activity` for callers that already hold the ranking lock."""
+    now = timezone.now()
+    trends = TopicTrend.objects.in_bulk(list(scores))
+    changed = []
+    for topic_id, trend in trends.items():
+        trend.score = log_add(trend.score, scores[topic_id])
+        trend.updated_at = now
+        changed.append(trend)
+    TopicTrend.objects.bulk_update(changed, ['score', 'updated_at'], batch_size=500)
+    # Topics deleted since their activity was recorded have nothing to rank.
+    new_topics = Topic.objects.filter(pk__in=[topic_id for topic_id in scores if topic_id not in trends])
+    TopicTrend.objects.bulk_create([
+        TopicTrend(topic_id=topic_id, score=scores[topic_id])
+        for topic_id in new_topics.values_list('pk', flat=True)
+    ], batch_size=500, ignore_conflicts=True)
+
+
+def record_views(counts, now=None):
+    """Add flushed view increments, `{topic_id: views}`, as activity at `now`."""
+    now = now or timezone.now()
+    add_activity({
+        topic_id: log_weight(count * settings.BOARDS_TRENDING_VIEW_WEIGHT, now)
+        for topic_id, count in counts.items() if count > 0
+    })
+
+
+def get_checkpoint():
+    """The newest post already counted, or None before the first run."""
+    return TrendingCheckpoint.objects.filter(pk=1).values_list('last_post_id', flat=True).first()
+
+
+def first_recent_post_id(since):
+    """
+    Walk back from the newest post in primary key chunks until posts are older
+    than `since`, so the first run only reads the recent tail of the table.
+    """
+    upper = None
+    first = None
+    while True:
+        posts = Post.objects.order_by('-pk')
+        if upper is not None:
+            posts = posts.filter(pk__lt=upper)
+        rows = list(posts.values_list('pk', 'created_at')[:CHUNK_SIZE])
+        for pk, created_at in rows:
+            if created_at < since:
+                return first
+            first = pk
+        if len(rows) < CHUNK_SIZE:
+            return first
+        upper = rows[-1][0]
+
+
+def update_from_posts(now=None):
+    """
+    Add the replies posted since the last run, reading posts by primary key
+    from the checkpoint. Each chunk is counted and the checkpoint moved in one
+    transaction, under the ranking lock, so concurrent runs never count a
+    post twice. Returns the number of posts counted.
+    """
+    now = now or timezone.now()
+    counted = 0
+    while True:
+        with transaction.atomic():
+            lock_ranking()
+            checkpoint = TrendingCheckpoint.objects.get(pk=1)
+            after = checkpoint.last_post_id
+            if after is None:
+                # Nothing counted yet: older replies would have decayed to nothing.
+                first = first_recent_post_id(now - timedelta(seconds=settings.BOARDS_TRENDING_HALF_LIFE * 10))
+                if first is None:
+                    return counted
+                after = first - 1
+            rows = list(
+                Post.objects.filter(pk__gt=after).order_by('pk')
+                .values_list('pk', 'topic_id', 'created_at')[:CHUNK_SIZE]
+            )
+            if not rows:
+                return counted
+            scores = defaultdict(lambda: None)
+            for pk, topic_id, created_at in rows:
+                weight = log_weight(settings.BOARDS_TRENDING_REPLY_WEIGHT, min(created_at, now))
+                scores[topic_id] = log_add(scores[topic_id], weight)
+            fold_activity(dict(scores))
+            checkpoint.last_post_id = rows[-1][0]
+            checkpoint.save(update_fields=['last_post'])
+        counted += len(rows)
+        if len(rows) < CHUNK_SIZE:
+            return counted
+
+
+def prune(now=None):
+    """Drop topics whose heat has decayed below one view. Uses the `score` index."""
+    now = now or timezone.now()
+    threshold = log_weight(settings.BOARDS_TRENDING_VIEW_WEIGHT, now)
+    return TopicTrend.objects.filter(score__lt=threshold).delete()[0]
+
+
+def trending_topics(limit=None):
+    """The hottest topics with their boards and starters, in one indexed query."""
+    limit = limit or settings.BOARDS_TRENDING_SIZE
+    trends = TopicTrend.objects.select_related('topic__board', 'topic__starter').order_by('-score')[:limit]
+    return [trend.topic for trend in trends]
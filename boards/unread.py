@@ -0,0 +1,59 @@
+"""
+Read tracking for logged-in users. A reader has one `TopicRead` marker per
+topic they opened, holding the id of the last post they have seen, and one
+`BoardRead` watermark per board they marked as read. A post is unread when
+its id is past both. Post ids grow with creation time, so "newer than" is a
+single index range on the topic's posts.
+
+Markers are only written when a page shows a reader posts past their
+marker; reopening a topic they are up to date with writes nothing. Each
+write bumps the reader's `('reads', user id)` cache generation, which is
+part of the topic list's ETag, so unread counts are never served stale.
+"""
+from boards.caching import bump_generation
+from boards.models import BoardRead, BoardStats, Post, Topic, TopicRead, read_marker
+
+
+def get_read_marker(user, topic_id):
+    """The id of the last post of the topic `user` has read, 0 if none."""
+    if not user.is_authenticated:
+        return 0
+    return Topic.objects.filter(pk=topic_id).annotate(
+        marker=read_marker(user)
+    ).values_list('marker', flat=True).first() or 0
+
+
+def get_first_unread(topic_id, marker, per_page):
+    """`(post id, page number)` of the first post of the topic after `marker`, or None."""
+    posts = Post.objects.filter(topic_id=topic_id)
+    first = posts.filter(pk__gt=marker).order_by('created_at', 'id').values_list('pk', flat=True).first()
+    if first is None:
+        return None
+    return first, posts.filter(pk__lt=first).count() // per_page + 1
+
+
+def mark_read(user, topic_id, posts, marker):
+    """Move `user`'s marker for the topic to the last of `posts` if it is past `marker`."""
+    last = max((post.pk for post in posts), default=0)
+    if not user.is_authenticated or last <= marker:
+        return False
+    TopicRead.objects.bulk_create(
+        [TopicRead(user=user, topic_id=topic_id, last_read_post_id=last)],
+        update_conflicts=True, unique_fields=['user', 'topic'], update_fields=['last_read_post'],
+    )
+    bump_generation('reads', user.pk)
+    return True
+
+
+def mark_board_read(user, board_id):
+    """Mark every post of the board as read by `user`."""
+    watermark = BoardStats.objects.filter(board_id=board_id).values_list('last_post_id', flat=True).first()
+    if watermark is None:
+        return
+    BoardRead.objects.bulk_create(
+        [BoardRead(user=user, board_id=board_id, last_read_post_id=watermark)],
+        update_conflicts=True, unique_fields=['user', 'board'], update_fields=['last_read_post'],
+    )
+    # The watermark covers them now; dropping them keeps the table small.
+    TopicRead.objects.filter(user=user, topic__board_id=board_id).delete()
+    bump_generation('reads', user.pk)
@@ -0,0 +1,77 @@
+"""
+The topics a reader has already been counted as viewing, kept in a signed
+cookie instead of the session. The cookie holds the ids of the last
+BOARDS_VIEWED_TOPICS_SIZE topics opened, least recently viewed first, so it
+stays the same size however much someone reads and opening a topic never
+writes a session row.
+"""
+from django.conf import settings
+from django.core import signing
+
+from boards.counters import record_topic_view
+
+COOKIE_NAME = 'viewed_topics'
+SALT = 'boards.viewed'
+
+
+def encode(topic_ids):
+    return '.'.join(signing.b62_encode(topic_id) for topic_id in topic_ids)
+
+
+def decode(value):
+    try:
+        return [signing.b62_decode(part) for part in value.split('.') if part]
+    except ValueError:
+        return []
+
+
+class ViewedTopics:
+    """Least recently used list of topic ids read from the request's cookie."""
+
+    def __init__(self, request):
+        value = request.get_signed_cookie(
+            COOKIE_NAME, default='', salt=SALT, max_age=settings.BOARDS_VIEWED_COOKIE_AGE
+        )
+        self.topic_ids = decode(value)[-settings.BOARDS_VIEWED_TOPICS_SIZE:]
+        self.changed = False
+
+    def __contains__(self, topic_id):
+        return topic_id in self.topic_ids
+
+    def add(self, topic_id):
+        """Mark `topic_id` as the most recently viewed; returns True if it was not viewed before."""
+        if self.topic_ids and self.topic_ids[-1] == topic_id:
+            return False
+        viewed = topic_id in self.topic_ids
+        if viewed:
+            self.topic_ids.remove(topic_id)
+        self.topic_ids.append(topic_id)
+        del self.topic_ids[:-settings.BOARDS_VIEWED_TOPICS_SIZE]
+        self.changed = True
+        return not viewed
+
+    def save(self, response):
+        # Only a reader who moved to another topic gets the cookie sent back.
+        if not self.changed:
+            return
+        response.set_signed_cookie(
+            COOKIE_NAME, encode(self.topic_ids), salt=SALT, max_age=settings.BOARDS_VIEWED_COOKIE_AGE,
+            secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+        )
+
+
+def get_viewed_topics(request):
+    if not hasattr(request, '_viewed_topics'):
+        request._viewed_topics = ViewedTopics(request)
+    return request._viewed_topics
+
+
+def save_viewed_topics(request, response):
+    if hasattr(request, '_viewed_topics'):
+        request._viewed_topics.save(response)
+
+
+def record_view_once(request, topic_id):
+    """Count a view of the topic unless this reader was already counted for it."""
+    if get_viewed_topics(request).add(topic_id):
+        record_topic_view(topic_id)
@@ -1,26 +1,44 @@
+from django.conf import settings
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.db import transaction
 from django.http import HttpResponse, Http404
 from django.shortcuts import *
 from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_POST
 from django.views.generic import UpdateView, ListView
 
+from boards import notifications, search, trending, unread
+from boards.caching import AnonymousPageCacheMixin, ConditionalPageMixin, bump_generation
+from boards.counters import pending_topic_views, record_topic_view
 from boards.form import NewTopicForm, PostForm
-from boards.models import Board, Topic, Post
+from boards.pagination import CursorPaginationMixin
+from boards.models import Board, Topic, Post, attach_author_post_counts, attach_board_stats
+from boards.viewed import record_view_once, save_viewed_topics
 
 
 # Create your views here.
-class BoardListHome(ListView):
+class BoardListHome(ConditionalPageMixin, AnonymousPageCacheMixin, ListView):
     model = Board
     template_name = "home.html"
     context_object_name = "boards"
 
+    def get_queryset(self):
+        if settings.BOARDS_DENORMALIZED_STATS:
+            return Board.objects.select_related('stats__last_post_author')
+        return Board.objects.with_stats()
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(object_list=object_list, **kwargs)
+        if not settings.BOARDS_DENORMALIZED_STATS:
+            context['boards'] = context['object_list'] = attach_board_stats(context['object_list'])
+        return context
+
 
 def home(request):
-    boards = Board.objects.all()
+    boards = Board.objects.select_related('stats__last_post_author')
     # response_html = "<br>".join(board.name for board in boards)
     return render(request, "home.html", {'boards': boards})
 
@@ -28,7 +46,7 @@ def home(request):
 def board_topic(request, pk):
     # try:
     board = get_object_or_404(Board, id=pk)
-    topics = board.topics.order_by("-last_update").annotate(replies=Count('posts') - 1)
+    topics = board.topics.order_by("-last_update").with_replies()
     # except Board.DoesNotExist:
     #     raise Http404
     return render(request, "topics.html", {'board': board, 'topics': topics})
@@ -40,16 +58,18 @@ def new_topic(request, pk):
     if request.method == 'POST':
         form = NewTopicForm(request.POST)
         if form.is_valid():
-            topic = form.save(commit=False)
-            topic.board = board
-            topic.starter = request.user
-            topic.save()
-            post = Post.objects.create(
-                message=form.cleaned_data.get('message'),
-                topic=topic,
-                created_by=request.user
-            )
-            return redirect('topic_posts', pk=pk, topic_id=topic.pk)
+            with transaction.atomic():
+                topic = form.save(commit=False)
+                topic.board = board
+                topic.starter = request.user
+                topic.save()
+                post = Post.objects.create(
+                    message=form.cleaned_data.get('message'),
+                    topic=topic,
+                    created_by=request.user
+                )
+                notifications.subscribe(request.user, topic)
+            return redirect('topic_posts', pk=pk, topic_pk=topic.pk)
     else:
         form = NewTopicForm()
     return render(request, 'new_topic.html', {'board': board, 'form': form})
@@ -57,35 +77,57 @@ def new_topic(request, pk):
 
 def topic_posts(request, pk, topic_pk):
     topic = get_object_or_404(Topic, board_id=pk, pk=topic_pk)
-    views = topic.views
-    views += 1
-    topic.save()
+    record_topic_view(topic.pk)
+    topic.views += pending_topic_views(topic.pk)
     return render(request, "topic_posts.html", {'topic': topic})
 
 
 @login_required
 def reply_topic(request, pk, topic_pk):
-    topic = get_object_or_404(Topic, board_id=pk, pk=pk)
+    topic = get_object_or_404(Topic, board_id=pk, pk=topic_pk)
     if request.method == 'POST':
         form = PostForm(request.POST)
         if form.is_valid():
-            post = form.save(commit=False)
-            post.topic = topic
-            post.created_by = request.user
-            post.save()
+            with transaction.atomic():
+                post = form.save(commit=False)
+                post.topic = topic
+                post.created_by = request.user
+                post.save()
 
-            topic.last_update = timezone.now()
-            topic.save()
-        topic_url = reverse('topic_posts', kwargs={'pk': pk, 'topic_pk': topic_pk})
-        topic_post_url = '{url}?page={page}#{id}'.format(
-            url=topic_url,
-            id=post.pk,
-            page=topic.get_page_count()
-        )
-        return redirect(topic_post_url)
+                topic.last_update = timezone.now()
+                topic.save(update_fields=['last_update'])
+                notifications.notify_reply(post)
+            topic_url = reverse('topic_posts', kwargs={'pk': pk, 'topic_pk': topic_pk})
+            topic_post_url = '{url}?page={page}#{id}'.format(
+                url=topic_url,
+                id=post.pk,
+                page=topic.get_page_count()
+            )
+            return redirect(topic_post_url)
     else:
-        form = PostForm(request.POST)
-    return render(request, "reply_topic.html", {'form': form})
+        form = PostForm()
+    return render(request, "reply_topic.html", {'topic': topic, 'form': form})
+
+
+@login_required
+@require_POST
+def mark_board_read(request, pk):
+    board = get_object_or_404(Board, pk=pk)
+    unread.mark_board_read(request.user, board.pk)
+    return redirect('board_topics', pk=board.pk)
+
+
+@login_required
+@require_POST
+def toggle_subscription(request, pk, topic_pk):
+    topic = get_object_or_404(Topic, board_id=pk, pk=topic_pk)
+    if request.POST.get('subscribe') == '1':
+        notifications.subscribe(request.user, topic)
+    else:
+        notifications.unsubscribe(request.user, topic)
+    # The topic page shows the button; its ETag must change with it.
+    bump_generation('topic', topic.pk)
+    return redirect('topic_posts', pk=pk, topic_pk=topic_pk)
 
 
 @method_decorator(login_required, name='dispatch')
@@ -104,15 +146,24 @@ class PostUpdateView(UpdateView):
         post = form.save(commit=False)
         post.updated_by = self.request.user
         post.updated_at = timezone.now()
-        post.save()
+        with transaction.atomic():
+            post.save()
         return redirect("topic_posts", pk=post.topic.board.id, topic_pk=post.topic.id)
 
 
-class TopicListView(ListView):
+class TopicListView(ConditionalPageMixin, AnonymousPageCacheMixin, CursorPaginationMixin, ListView):
     model = Topic
-    context_object_name = "topic"
+    context_object_name = "topics"
     template_name = "topics.html"
     paginate_by = 20
+    cursor_ordering = ("-last_update", "-id")
+
+    def get_cache_scopes(self):
+        return [('board', self.kwargs.get('pk'))]
+
+    def get_reader_scopes(self, request):
+        # Unread counts change when the reader moves a read marker.
+        return [('reads', request.user.pk)] if request.user.is_authenticated else []
 
     def get_context_data(self, *, object_list=None, **kwargs):
         kwargs['board'] = self.board
@@ -120,27 +171,126 @@ class TopicListView(ListView):
 
     def get_queryset(self):
         self.board = get_object_or_404(Board, pk=self.kwargs.get('pk'))
-        query_set = self.board.topics.order_by("-last_update").annotate(replies=Count("posts") - 1)
+        query_set = self.board.topics.select_related("starter").order_by("-last_update").with_replies()
+        if self.request.user.is_authenticated:
+            query_set = query_set.with_unread(self.request.user)
         return query_set
 
 
-class PostListView(ListView):
+def get_unread_redirect(request, board_id, topic_id, per_page):
+    """
+    The reader's marker for the topic, and the URL of the first post they
+    have not read if they return to the topic without asking for a page.
+    """
+    marker = unread.get_read_marker(request.user, topic_id)
+    if not marker or request.GET.get('page') or request.GET.get('cursor'):
+        return marker, None
+    first_unread = unread.get_first_unread(topic_id, marker, per_page)
+    if first_unread is None:
+        return marker, None
+    url = reverse('topic_posts', kwargs={'pk': board_id, 'topic_pk': topic_id})
+    return marker, '{}?page={}#{}'.format(url, first_unread[1], first_unread[0])
+
+
+def prepare_topic_page(request, topic, posts, read_marker):
+    """
+    Count the view, attach the author post counts and move the read marker
+    for a page of `posts`. Returns the posts and whether the reader is
+    subscribed to the topic.
+    """
+    record_view_once(request, topic.pk)
+    topic.views += pending_topic_views(topic.pk)
+    posts = attach_author_post_counts(posts)
+    unread.mark_read(request.user, topic.pk, posts, read_marker)
+    return posts, notifications.is_subscribed(request.user, topic)
+
+
+class PostListView(ConditionalPageMixin, AnonymousPageCacheMixin, CursorPaginationMixin, ListView):
     model = Post
     context_object_name = "posts"
     template_name = "topic_posts.html"
     paginate_by = 20
+    cursor_ordering = ("created_at", "id")
 
-    def get_context_data(self, *, object_list=None, **kwargs):
-        session_key = 'viewed_topic_{}'.format(self.topic.pk)
-        if not self.request.session.get(session_key, False):
-            self.topic.views += 1
-            self.topic.save()
-            self.request.session[session_key] = True
+    def get_cache_scopes(self):
+        return [('board', self.kwargs.get('pk')), ('topic', self.kwargs.get('topic_pk'))]
 
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        save_viewed_topics(request, response)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        # A returning reader starts at the first post they have not read.
+        self.read_marker, url = get_unread_redirect(
+            request, self.kwargs.get('pk'), self.kwargs.get('topic_pk'), self.paginate_by
+        )
+        if url is not None:
+            return redirect(url)
+        return super().get(request, *args, **kwargs)
+
+    def on_page_cache_hit(self, request):
+        record_view_once(request, self.kwargs.get('topic_pk'))
+
+    def on_not_modified(self, request):
+        record_view_once(request, self.kwargs.get('topic_pk'))
+
+    def get_context_data(self, *, object_list=None, **kwargs):
         kwargs['topic'] = self.topic
-        return super().get_context_data(kwargs)
+        context = super().get_context_data(**kwargs)
+        context['posts'], context['subscribed'] = prepare_topic_page(
+            self.request, self.topic, context['object_list'], self.read_marker
+        )
+        context['object_list'] = context['posts']
+        return context
 
     def get_queryset(self):
-        self.topic = get_object_or_404(Topic, board_id=self.kwargs.get('pk'), pk=self.kwargs.get('topic_pk'))
-        query_set = self.topic.posts.order_by('created_at')
+        self.topic = get_object_or_404(
+            Topic.objects.select_related('board'), board_id=self.kwargs.get('pk'), pk=self.kwargs.get('topic_pk')
+        )
+        query_set = self.topic.posts.select_related('created_by').order_by('created_at')
         return query_set
+
+
+class SearchView(ListView):
+    context_object_name = "results"
+    template_name = "search.html"
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        if not self.query:
+            return []
+        return search.search(self.query, limit=settings.BOARDS_SEARCH_RESULTS, per_page=PostListView.paginate_by)
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        kwargs['query'] = self.query
+        return super().get_context_data(**kwargs)
+
+
+@method_decorator(login_required, name='dispatch')
+class NotificationListView(ListView):
+    context_object_name = "notifications"
+    template_name = "notifications.html"
+
+    def get_queryset(self):
+        return self.request.user.notifications.select_related(
+            'post__created_by', 'topic__board'
+        )[:settings.BOARDS_NOTIFICATIONS_PER_PAGE]
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(object_list=object_list, **kwargs)
+        # Evaluated before they are marked read, so the page still shows which are new.
+        notifications = context['notifications'] = context['object_list'] = list(context['object_list'])
+        # Only the ones on the page: older unread notifications stay unread until they are shown.
+        self.request.user.notifications.filter(
+            pk__in=[notification.pk for notification in notifications], read=False
+        ).update(read=True)
+        return context
+
+
+class TrendingView(ListView):
+    context_object_name = "topics"
+    template_name = "trending.html"
+
+    def get_queryset(self):
+        return trending.trending_topics()
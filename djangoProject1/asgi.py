@@ -2,6 +2,8 @@
 ASGI config for djangoProject1 project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are routed through ``djangoProject1.urls_async``, which serves the
+read-only board pages with async views.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -9,8 +11,27 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djangoProject1.settings')
 
-application = get_asgi_application()
+
+class AsyncViewsASGIHandler(ASGIHandler):
+    urlconf = 'djangoProject1.urls_async'
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = self.urlconf
+        return request, error_response
+
+
+django.setup(set_prefix=False)
+application = AsyncViewsASGIHandler()
+
+if settings.TEMPLATES_PRECOMPILE:
+    from djangoProject1.templating import precompile_templates
+
+    precompile_templates()
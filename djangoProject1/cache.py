@@ -0,0 +1,240 @@
+"""
+Cache backend and key helpers for djangoProject1.
+
+`SQLiteCache` keeps entries in a SQLite file, so every process on the host
+shares one cache without running a cache server. Reads are plain indexed
+lookups on a WAL database and never wait on a writer. When the cache grows
+past MAX_ENTRIES, the expired entries and then the least recently read ones
+are evicted. `incr` and `decr` are atomic across processes.
+
+`Namespace` builds the keys that applications store in the cache.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Reading an entry refreshes its LRU position at most this often (seconds),
+# so hot keys do not turn every read into a write.
+TOUCH_INTERVAL = 60
+# Each process checks the entry count once every this many writes.
+CULL_CHECK_INTERVAL = 100
+NEVER = float('inf')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL'
+    ') WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+    'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)',
+)
+
+
+def encode(value):
+    # Integers are stored as SQLite integers so incr() can update them in SQL.
+    if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+        return value
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def decode(value):
+    if isinstance(value, int):
+        return value
+    return pickle.loads(value)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache in the SQLite file at LOCATION, shared by every process and thread
+    that opens it. Each thread keeps its own connection.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = str(location)
+        self.local = threading.local()
+        self.writes = 0
+
+    @property
+    def connection(self):
+        # A connection must not cross a fork, so it is keyed by process too.
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or self.local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=20, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        # Take the write lock up front; the connection is in autocommit mode.
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def get_expiry(self, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_backend_timeout(timeout)
+        return NEVER if timeout is None else timeout
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self.transaction() as connection:
+            # Expired entries do not count as present.
+            connection.execute('DELETE FROM cache WHERE key = ? AND expires <= ?', (key, now))
+            added = connection.execute(
+                'INSERT OR IGNORE INTO cache VALUES (?, ?, ?, ?)',
+                (key, encode(value), self.get_expiry(timeout), now),
+            ).rowcount == 1
+        self.wrote(1)
+        return added
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        values = self.fetch([key])
+        return values[key] if key in values else default
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        return {keys[key]: value for key, value in self.fetch(list(keys)).items()}
+
+    def fetch(self, keys):
+        if not keys:
+            return {}
+        now = time.time()
+        rows = self.connection.execute(
+            'SELECT key, value, accessed FROM cache WHERE key IN ({}) AND expires > ?'.format(
+                ', '.join('?' * len(keys))
+            ),
+            (*keys, now),
+        ).fetchall()
+        stale = [key for key, _, accessed in rows if accessed < now - TOUCH_INTERVAL]
+        if stale:
+            self.connection.execute(
+                'UPDATE cache SET accessed = ? WHERE key IN ({})'.format(', '.join('?' * len(stale))),
+                (now, *stale),
+            )
+        return {key: decode(value) for key, value, _ in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_expiry(timeout)
+        now = time.time()
+        rows = [(self.make_and_validate_key(key, version=version), encode(value), expires, now)
+                for key, value in data.items()]
+        with self.transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)', rows)
+        self.wrote(len(rows))
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self.connection.execute(
+            'UPDATE cache SET expires = ? WHERE key = ? AND expires > ?',
+            (self.get_expiry(timeout), key, time.time()),
+        ).rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self.transaction() as connection:
+            rows = connection.execute(
+                "UPDATE cache SET value = value + ? WHERE key = ? AND expires > ? AND typeof(value) = 'integer' "
+                'RETURNING value',
+                (delta, key, now),
+            ).fetchall()
+            if rows:
+                return rows[0][0]
+            # Not stored as a SQLite integer: read, add and write back.
+            row = connection.execute('SELECT value FROM cache WHERE key = ? AND expires > ?', (key, now)).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found." % key)
+            value = decode(row[0]) + delta
+            connection.execute('UPDATE cache SET value = ? WHERE key = ?', (encode(value), key))
+            return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self.connection.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        with self.transaction() as connection:
+            connection.executemany('DELETE FROM cache WHERE key = ?', [(key,) for key in keys])
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self.connection.execute(
+            'SELECT 1 FROM cache WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone() is not None
+
+    def clear(self):
+        self.connection.execute('DELETE FROM cache')
+
+    def wrote(self, count):
+        self.writes += count
+        if self.writes >= CULL_CHECK_INTERVAL:
+            self.writes = 0
+            self.cull()
+
+    def cull(self):
+        """Drop expired entries, then the least recently read ones if still over MAX_ENTRIES."""
+        connection = self.connection
+        connection.execute('DELETE FROM cache WHERE expires <= ?', (time.time(),))
+        count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        # Like the other backends, evict 1/CULL_FREQUENCY of the entries at once.
+        evict = max(count - self._max_entries, count // self._cull_frequency if self._cull_frequency else 0)
+        connection.execute(
+            'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)', (evict,)
+        )
+
+    def close(self, **kwargs):
+        # Connections are kept for the life of the thread, like CONN_MAX_AGE.
+        pass
+
+
+class Namespace:
+    """
+    Keys of one kind of cached data, e.g. `Namespace('boards:page')`.
+
+    `key(*parts)` joins the namespace name, its version and the parts with
+    colons. Raising `version` where the namespace is declared retires every
+    key stored under the old one, for when the format of the cached values
+    changes. Old entries are left for the cache to evict.
+    """
+
+    def __init__(self, name, version=1, alias='default'):
+        self.name = name
+        self.version = version
+        self.alias = alias
+
+    def __repr__(self):
+        return '<Namespace {}:v{}>'.format(self.name, self.version)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, *parts):
+        return ':'.join((self.name, 'v{}'.format(self.version), *map(str, parts)))
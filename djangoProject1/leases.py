@@ -0,0 +1,115 @@
+"""
+Leasing, retries and dead-lettering for work queues kept in the database.
+
+A queue is a model with `status` (QUEUED or FAILED), `attempts`,
+`last_error` and a datetime field saying when a worker may next pick a row
+up. Workers claim due rows by pushing that time past a lease, so a worker
+that dies only delays its rows. Failures are retried with exponential
+backoff, and after the maximum number of attempts a row is marked FAILED
+and left for an operator. `jobs` and `mailqueue` both use this, and their
+worker commands extend `QueueWorkerCommand`.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+class LeasedQueue:
+    """
+    The rows of `model` due by `due_field`. Settings are read as
+    `<prefix>_LEASE`, `_RETRY_DELAY`, `_MAX_RETRY_DELAY` and `_MAX_ATTEMPTS`.
+    """
+
+    def __init__(self, model, due_field, prefix, logger):
+        self.model = model
+        self.due_field = due_field
+        self.prefix = prefix
+        self.logger = logger
+
+    def setting(self, name):
+        return getattr(settings, '{}_{}'.format(self.prefix, name))
+
+    def claim(self, rows, now):
+        """
+        Lease `rows` to this worker for `<prefix>_LEASE` seconds. Returns the
+        ones claimed: a row whose due time changed since it was read was
+        taken by another worker.
+        """
+        lease = now + timedelta(seconds=self.setting('LEASE'))
+        claimed = []
+        for row in rows:
+            due = {self.due_field: getattr(row, self.due_field)}
+            if self.model.objects.filter(pk=row.pk, status=self.model.QUEUED, **due).update(
+                **{self.due_field: lease}
+            ):
+                setattr(row, self.due_field, lease)
+                claimed.append(row)
+        return claimed
+
+    def claim_batch(self, batch_size, now):
+        """Lease up to `batch_size` due rows to this worker and return them."""
+        due = {'{}__lte'.format(self.due_field): now}
+        with transaction.atomic():
+            return self.claim(
+                self.model.objects.filter(status=self.model.QUEUED, **due).order_by(self.due_field, 'pk')[:batch_size],
+                now,
+            )
+
+    def retry_delay(self, attempts):
+        """Seconds to wait before the next attempt, doubling with every failure."""
+        return min(self.setting('RETRY_DELAY') * 2 ** (attempts - 1), self.setting('MAX_RETRY_DELAY'))
+
+    def record_failure(self, row, error, now):
+        row.attempts += 1
+        row.last_error = '{}: {}'.format(type(error).__name__, error)
+        name = self.model._meta.verbose_name
+        if row.attempts >= self.setting('MAX_ATTEMPTS'):
+            row.status = self.model.FAILED
+            self.logger.error('Giving up on %s %s after %s attempts: %s', name, row, row.attempts, row.last_error)
+        else:
+            setattr(row, self.due_field, now + timedelta(seconds=self.retry_delay(row.attempts)))
+            self.logger.warning('%s %s failed, retrying: %s', name.capitalize(), row, row.last_error)
+        row.save(update_fields=['attempts', 'last_error', 'status', self.due_field])
+
+    def requeue(self, rows):
+        """Give failed rows a fresh set of attempts, starting now."""
+        return rows.update(status=self.model.QUEUED, attempts=0, **{self.due_field: timezone.now()})
+
+
+class QueueWorkerCommand(BaseCommand):
+    """
+    A command that works through `queue` once, or keeps polling with
+    `--loop`. Subclasses implement `run(options)`, returning how many rows
+    succeeded and failed, and word the output with `noun` and `report`.
+    """
+    queue = None
+    noun = 'rows'
+    report = 'Processed {} {noun}, {} failed.'
+    interval = 1.0
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Defaults to {}_BATCH_SIZE.'.format(self.queue.prefix))
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new {}.'.format(self.noun))
+        parser.add_argument('--interval', type=float, default=self.interval, help='Seconds between polls with --loop.')
+        parser.add_argument('--retry-failed', action='store_true', help='Requeue failed {} first.'.format(self.noun))
+
+    def run(self, options):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            model = self.queue.model
+            count = self.queue.requeue(model.objects.filter(status=model.FAILED))
+            self.stdout.write('Requeued {} failed {}.'.format(count, self.noun))
+        while True:
+            succeeded, failed = self.run(options)
+            if succeeded or failed or not options['loop']:
+                self.stdout.write(self.report.format(succeeded, failed, noun=self.noun))
+            if not options['loop']:
+                return
+            connection.close_if_unusable_or_obsolete()
+            time.sleep(options['interval'])
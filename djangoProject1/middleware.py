@@ -0,0 +1,180 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from djangoProject1.templating import TemplateProfile, profile_templates
+
+logger = logging.getLogger('djangoProject1.instrumentation')
+
+IN_LIST_RE = re.compile(r'\((?:%s, )+%s\)')
+NUMBER_RE = re.compile(r'\b\d+\b')
+
+
+def fingerprint(sql):
+    """Reduce a query to its shape so repeats of the same query (N+1s) group together."""
+    return NUMBER_RE.sub('?', IN_LIST_RE.sub('(...)', sql))
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+
+class InstrumentationMiddleware:
+    """
+    Record per-request timings and SQL statistics without relying on DEBUG.
+
+    A fraction of requests (INSTRUMENTATION_SAMPLE_RATE) is fully instrumented:
+    query count, SQL time, repeated query shapes, view and template time. Those
+    are written to the instrumentation log and returned in a Server-Timing
+    header. Every request is timed, so requests slower than
+    INSTRUMENTATION_SLOW_REQUEST_MS are always logged as warnings. With
+    INSTRUMENTATION_TEMPLATE_PROFILE, sampled requests also log the slowest
+    templates and includes and the variable lookups that ran queries.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.check_slow(request, self.get_response(request), start)
+
+        recorder = QueryRecorder()
+        profile = self.new_profile()
+        request._instrumentation = {'start': start}
+        with self.install_recorder(recorder, profile), self.profiling(profile):
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, start, profile)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.check_slow(request, await self.get_response(request), start)
+
+        recorder = QueryRecorder()
+        profile = self.new_profile()
+        request._instrumentation = {'start': start}
+        # Database connections belong to the thread that runs the request's
+        # sync code, so the wrappers are installed (and removed) from there.
+        stack = await sync_to_async(self.install_recorder)(recorder, profile)
+        try:
+            with self.profiling(profile):
+                response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, start, profile)
+
+    def new_profile(self):
+        return TemplateProfile() if settings.INSTRUMENTATION_TEMPLATE_PROFILE else None
+
+    def profiling(self, profile):
+        if profile is None:
+            return ExitStack()
+        return profile_templates(profile, count_queries=False)
+
+    def install_recorder(self, recorder, profile=None):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+            if profile is not None:
+                stack.enter_context(connections[alias].execute_wrapper(profile))
+        return stack
+
+    def check_slow(self, request, response, start):
+        total = (time.perf_counter() - start) * 1000
+        if total > settings.INSTRUMENTATION_SLOW_REQUEST_MS:
+            self.log(request, response, {'total_ms': round(total, 2)}, ['slow'])
+        return response
+
+    def finish(self, request, response, recorder, start, profile=None):
+        end = time.perf_counter()
+        timings = request._instrumentation
+        total = (end - start) * 1000
+        if 'view_ms' not in timings and 'view_start' in timings:
+            # Not a TemplateResponse: any rendering happened inside the view.
+            timings['view_ms'] = (end - timings['view_start']) * 1000
+        record = {
+            'total_ms': round(total, 2),
+            'view_ms': round(timings.get('view_ms', total), 2),
+            'template_ms': round(timings.get('template_ms', 0.0), 2),
+            'sql_ms': round(recorder.duration * 1000, 2),
+            'queries': recorder.count,
+            'duplicates': [
+                {'sql': sql[:300], 'count': count}
+                for sql, count in recorder.fingerprints.most_common(5) if count > 1
+            ],
+        }
+        if profile is not None:
+            record.update(profile.report(limit=5))
+        flags = []
+        if total > settings.INSTRUMENTATION_SLOW_REQUEST_MS:
+            flags.append('slow')
+        if recorder.count > settings.INSTRUMENTATION_MAX_QUERIES:
+            flags.append('too_many_queries')
+        if record['duplicates'] and record['duplicates'][0]['count'] > settings.INSTRUMENTATION_MAX_DUPLICATES:
+            flags.append('duplicate_queries')
+        self.log(request, response, record, flags)
+        if settings.INSTRUMENTATION_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                'db;dur={};desc="{} queries"'.format(record['sql_ms'], record['queries']),
+                'view;dur={}'.format(record['view_ms']),
+                'tpl;dur={}'.format(record['template_ms']),
+                'total;dur={}'.format(record['total_ms']),
+            ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, '_instrumentation', None)
+        if timings is not None:
+            timings['view_start'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, '_instrumentation', None)
+        if timings is None or 'view_start' not in timings:
+            return response
+        render_start = time.perf_counter()
+        timings['view_ms'] = (render_start - timings['view_start']) * 1000
+
+        def rendered(response):
+            timings['template_ms'] = (time.perf_counter() - render_start) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, record, flags):
+        record.update({
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'flags': flags,
+        })
+        logger.log(logging.WARNING if flags else logging.INFO, json.dumps(record))
@@ -38,10 +38,13 @@ INSTALLED_APPS = [
     'django.contrib.humanize',
     'widget_tweaks',
     'boards',
-    'accounts'
+    'accounts',
+    'mailqueue',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'djangoProject1.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +85,10 @@ DATABASES = {
     }
 }
 
+# PRAGMA name -> value, run on every new SQLite connection (see boards.db).
+# settings_production.py sets the tuned values.
+SQLITE_PRAGMAS = {}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -118,11 +125,168 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'djangoProject1.staticfiles.BundleFinder',
+]
+
+# Files concatenated into one bundle each (djangoProject1.staticfiles), built
+# into STATIC_BUNDLE_DIR by collectstatic. Rules of the STATIC_PURGE
+# stylesheets whose classes are not used by the templates or bundled scripts
+# are left out. The {% bundle %} tag links the sources one by one unless
+# USE_STATIC_BUNDLES is set.
+STATIC_BUNDLES = {
+    'bundles/site.css': ['css/bootstrap.min.css', 'css/app.css'],
+    'bundles/site.js': ['js/jquery-3.2.1.min.js', 'js/popper.min.js', 'js/bootstrap.min.js'],
+}
+STATIC_PURGE = ['css/bootstrap.min.css']
+STATIC_BUNDLE_DIR = BASE_DIR / 'build' / 'static'
+USE_STATIC_BUNDLES = False
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGOUT_REDIRECT_URL = 'home'
 LOGIN_REDIRECT_URL = 'home'
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = 'mailqueue.backends.QueuedEmailBackend'
 LOGIN_URL = 'login'
+
+# Render the home page from the maintained BoardStats table; when False the
+# counts are computed with subqueries on every request.
+BOARDS_DENORMALIZED_STATS = True
+
+# Topic view counts are buffered and written in batches. 'local' keeps the
+# buffer in process memory (views pending at shutdown are dropped, and only
+# the process itself can flush them), 'cache' keeps it in the default cache,
+# shared by every process and flushed by `manage.py flush_topic_views`.
+TOPIC_VIEWS_BUFFER = 'local'
+TOPIC_VIEWS_FLUSH_INTERVAL = 30
+TOPIC_VIEWS_MAX_BUFFER = 1000
+
+# Page topic and post lists by (timestamp, id) cursor instead of OFFSET.
+BOARDS_CURSOR_PAGINATION = True
+
+# Full-text search over topic subjects and post messages. SQLiteFTSBackend
+# uses the FTS5 table from the boards migrations; InvertedIndexBackend keeps
+# its own index tables for databases without FTS5 (run rebuild_search_index
+# after switching).
+BOARDS_SEARCH_BACKEND = 'boards.search.SQLiteFTSBackend'
+BOARDS_SEARCH_RESULTS = 50
+
+# Request instrumentation (djangoProject1.middleware). A sampled request logs
+# its query count, SQL/view/template time and repeated queries, and gets a
+# Server-Timing header. Slow requests are logged even when not sampled.
+INSTRUMENTATION_SAMPLE_RATE = 0.0
+INSTRUMENTATION_SERVER_TIMING = True
+INSTRUMENTATION_SLOW_REQUEST_MS = 500
+INSTRUMENTATION_MAX_QUERIES = 50
+INSTRUMENTATION_MAX_DUPLICATES = 5
+INSTRUMENTATION_LOG_FILE = BASE_DIR / 'requests.log'
+# Also log per-template and per-include render time and the template variable
+# lookups that ran queries (djangoProject1.templating).
+INSTRUMENTATION_TEMPLATE_PROFILE = False
+
+# Outgoing mail is queued in the database during the request and delivered
+# by `manage.py send_queued_mail` through MAILQUEUE_BACKEND. Use the
+# filebased backend with EMAIL_FILE_PATH to inspect the mail locally.
+MAILQUEUE_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+MAILQUEUE_BATCH_SIZE = 100
+# A claimed message is retried by another worker after this many seconds.
+MAILQUEUE_LEASE = 300
+# Failed sends wait MAILQUEUE_RETRY_DELAY seconds, doubled on every attempt;
+# after MAILQUEUE_MAX_ATTEMPTS the message is marked failed.
+MAILQUEUE_RETRY_DELAY = 60
+MAILQUEUE_MAX_RETRY_DELAY = 3600
+MAILQUEUE_MAX_ATTEMPTS = 5
+
+# Background jobs (jobs.queue), run by `manage.py run_jobs`. Each of the
+# JOBS_WORKER_CONCURRENCY threads claims JOBS_BATCH_SIZE due jobs at a time
+# and holds them for JOBS_LEASE seconds. Failures are retried like mail.
+JOBS_WORKER_CONCURRENCY = 2
+JOBS_BATCH_SIZE = 20
+JOBS_LEASE = 300
+JOBS_RETRY_DELAY = 30
+JOBS_MAX_RETRY_DELAY = 3600
+JOBS_MAX_ATTEMPTS = 5
+# Lets monitoring read /jobs/metrics/ with "Authorization: Bearer <token>";
+# staff users can always read it.
+JOBS_METRICS_TOKEN = os.environ.get('JOBS_METRICS_TOKEN')
+
+# Reply notifications (boards.notifications) are created by a background job
+# this many subscribers at a time.
+BOARDS_NOTIFICATION_BATCH_SIZE = 500
+BOARDS_NOTIFICATIONS_PER_PAGE = 50
+
+# Compile every template when the WSGI/ASGI application starts, so the cached
+# template loader is warm before the first request.
+TEMPLATES_PRECOMPILE = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'instrumentation': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': INSTRUMENTATION_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'djangoProject1.instrumentation': {
+            'handlers': ['instrumentation'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Seconds to keep whole pages for readers without a session, and template
+# fragments for everyone. Writes invalidate both through generation counters
+# (boards.caching); 0 disables page caching.
+BOARDS_PAGE_CACHE_TIMEOUT = 60
+BOARDS_FRAGMENT_CACHE_TIMEOUT = 300
+
+# Gravatar URLs are built once per user and size and kept in a per-process
+# LRU (boards.avatars) of at most this many users; 0 disables it.
+GRAVATAR_CACHE_SIZE = 10000
+
+# Trending feed (boards.trending). Activity decays by half every
+# BOARDS_TRENDING_HALF_LIFE seconds; a reply counts as
+# BOARDS_TRENDING_REPLY_WEIGHT views. Run `manage.py update_trending`
+# periodically to add new replies; views are added when they are flushed.
+BOARDS_TRENDING_HALF_LIFE = 12 * 3600
+BOARDS_TRENDING_VIEW_WEIGHT = 1
+BOARDS_TRENDING_REPLY_WEIGHT = 10
+BOARDS_TRENDING_SIZE = 50
+
+# Topics a reader was already counted as viewing are kept in a signed cookie
+# (boards.viewed) holding the last BOARDS_VIEWED_TOPICS_SIZE topic ids, for
+# BOARDS_VIEWED_COOKIE_AGE seconds, instead of a session key per topic.
+BOARDS_VIEWED_TOPICS_SIZE = 100
+BOARDS_VIEWED_COOKIE_AGE = 30 * 24 * 3600
+
+# One cache for every process on the host, in a SQLite file, without a cache
+# server (djangoProject1.cache.SQLiteCache). Entries past MAX_ENTRIES are
+# evicted least recently read first. Application keys are built with
+# djangoProject1.cache.Namespace.
+CACHES = {
+    'default': {
+        'BACKEND': 'djangoProject1.cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+# `manage.py test` moves the cache file to a temporary directory.
+TEST_RUNNER = 'djangoProject1.test_runner.TestRunner'
+
+# Sessions are read from the cache and written through to the database.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
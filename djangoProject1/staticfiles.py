@@ -0,0 +1,358 @@
+"""
+Static file build and serving for djangoProject1.
+
+`BundleFinder` concatenates the sources of each STATIC_BUNDLES entry into
+one file. CSS files listed in STATIC_PURGE are stripped of the rules whose
+classes appear in neither the templates nor the bundled scripts.
+`CompressedManifestStaticFilesStorage` gives the collected files
+content-hashed names and writes compressed copies beside them.
+`StaticFilesMiddleware` serves what `collectstatic` wrote.
+
+    manage.py collectstatic   # bundles, hashes, compresses into STATIC_ROOT
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map')
+MIN_COMPRESS_SIZE = 256
+# Files whose names are not content hashed may change on the next deploy.
+UNHASHED_MAX_AGE = 60
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# (Content-Encoding, file suffix), best first.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+CSS_TOKEN_RE = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};]|[^{};"\'/]+|/', re.DOTALL)
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][_a-zA-Z0-9-]*)')
+# Parts of a selector that never require a class to be present.
+IGNORED_SELECTOR_RE = re.compile(r'\[[^\]]*\]|:not\([^)]*\)')
+CONTENT_TOKEN_RE = re.compile(r'[A-Za-z0-9_-]+')
+SKIPPED_CONTENT_DIRS = {'tests', 'migrations', '__pycache__'}
+NESTED_AT_RULES = ('@media', '@supports', '@document')
+# A source's map does not describe the bundle it ends up in.
+SOURCE_MAP_RE = re.compile(r'^\s*(?://[#@]|/\*[#@]) sourceMappingURL=.*$', re.MULTILINE)
+
+
+def parse_css(css):
+    """
+    Split a stylesheet into `(prelude, body)` pairs: `body` is None for
+    statements like @import, a string for plain rules and a list of pairs
+    for nested at-rules such as @media.
+    """
+    tokens = [token for token in CSS_TOKEN_RE.findall(css) if not token.startswith('/*')]
+    return parse_block(tokens, 0)[0]
+
+
+def parse_block(tokens, position):
+    rules = []
+    prelude = []
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if token == '}':
+            break
+        if token == ';':
+            rules.append((''.join(prelude).strip(), None))
+            prelude = []
+        elif token == '{':
+            selector = ''.join(prelude).strip()
+            prelude = []
+            if selector.lower().startswith(NESTED_AT_RULES):
+                body, position = parse_block(tokens, position)
+            else:
+                body, position = read_body(tokens, position)
+            rules.append((selector, body))
+        else:
+            prelude.append(token)
+    return rules, position
+
+
+def read_body(tokens, position):
+    depth = 1
+    body = []
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if not depth:
+                break
+        body.append(token)
+    return ''.join(body).strip(), position
+
+
+def serialize_css(rules):
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(prelude + ';')
+        elif isinstance(body, list):
+            parts.append('{}{{{}}}'.format(prelude, serialize_css(body)))
+        else:
+            parts.append('{}{{{}}}'.format(prelude, body))
+    return ''.join(parts)
+
+
+def is_selector_used(selector, used):
+    selector = IGNORED_SELECTOR_RE.sub('', selector)
+    return all(name in used for name in CLASS_RE.findall(selector))
+
+
+def purge_css(css, used):
+    """Drop the selectors of `css` that need a class missing from `used`, and rules left with none."""
+    return serialize_css(purge_rules(parse_css(css), used))
+
+
+def purge_rules(rules, used):
+    kept = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            body = purge_rules(body, used)
+            if body:
+                kept.append((prelude, body))
+        elif body is None or prelude.startswith('@'):
+            # @font-face, @keyframes, @import and the like are kept whole.
+            kept.append((prelude, body))
+        else:
+            selectors = [selector for selector in prelude.split(',') if is_selector_used(selector, used)]
+            if selectors:
+                kept.append((','.join(selectors), body))
+    return kept
+
+
+def get_content_files():
+    """Templates and Python modules of the project, where class names are used."""
+    directories = [Path(directory) for engine in settings.TEMPLATES for directory in engine.get('DIRS', [])]
+    base_dir = Path(settings.BASE_DIR).resolve()
+    for app_config in apps.get_app_configs():
+        path = Path(app_config.path).resolve()
+        if base_dir in path.parents:
+            directories.append(path)
+    for directory in directories:
+        for pattern in ('*.html', '*.py'):
+            for path in Path(directory).rglob(pattern):
+                if not SKIPPED_CONTENT_DIRS.intersection(path.parts):
+                    yield path
+
+
+def get_used_names(scripts=()):
+    used = set()
+    contents = [path.read_text(encoding='utf-8', errors='ignore') for path in get_content_files()]
+    for text in contents + list(scripts):
+        used.update(CONTENT_TOKEN_RE.findall(text))
+    return used
+
+
+def read_static(name):
+    path = finders.find(name)
+    if path is None:
+        raise FileNotFoundError('Static file {!r} of a bundle was not found.'.format(name))
+    with open(path, encoding='utf-8') as source:
+        return source.read()
+
+
+def build_bundle(name, location):
+    """Write bundle `name` under `location` and return its path."""
+    sources = settings.STATIC_BUNDLES[name]
+    contents = [SOURCE_MAP_RE.sub('', read_static(source)) for source in sources]
+    purged = [source for source in sources if source in settings.STATIC_PURGE]
+    if purged:
+        # Classes toggled by scripts only appear in the scripts.
+        scripts = [read_static(script) for bundle, names in settings.STATIC_BUNDLES.items()
+                   if bundle.endswith('.js') for script in names]
+        used = get_used_names(scripts)
+        contents = [purge_css(content, used) if source in purged else content
+                    for source, content in zip(sources, contents)]
+    separator = ';\n' if name.endswith('.js') else '\n'
+    path = Path(location, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(separator.join(contents), encoding='utf-8')
+    return str(path)
+
+
+class BundleFinder(BaseFinder):
+    """
+    Finds the STATIC_BUNDLES, built from their sources into STATIC_BUNDLE_DIR
+    whenever they are looked up or collected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.location = settings.STATIC_BUNDLE_DIR
+        self.storage = FileSystemStorage(location=self.location)
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, find_all=False, **kwargs):
+        find_all = kwargs.get('all', find_all)
+        if path not in settings.STATIC_BUNDLES:
+            return [] if find_all else None
+        built = build_bundle(path, self.location)
+        return [built] if find_all else built
+
+    def list(self, ignore_patterns):
+        for name in settings.STATIC_BUNDLES:
+            build_bundle(name, self.location)
+            yield name, self.storage
+
+
+def compress_file(path):
+    """Write the `.gz` and `.br` copies of `path` that are worth keeping."""
+    with open(path, 'rb') as source:
+        data = source.read()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data) * 0.95:
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    `ManifestStaticFilesStorage` that also writes gzip copies, and brotli ones
+    when the brotli package is installed, of every compressible file it
+    collects, for `StaticFilesMiddleware` to serve.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set(paths)
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name:
+                names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE) and self.exists(name) and self.size(name) >= MIN_COMPRESS_SIZE:
+                compress_file(self.path(name))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Referenced by a template but never collected: link it unhashed
+            # and let it 404 rather than fail the whole page.
+            if not self.hashed_files:
+                raise
+            return self.clean_name(name)
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.last_modified = http_date(stat.st_mtime)
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        with open(path, 'rb') as source:
+            digest = hashlib.md5(source.read()).hexdigest()
+        self.etag = '"{}"'.format(digest)
+        self.immutable = immutable
+        self.encodings = {}
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                self.encodings[encoding] = (path + suffix, os.path.getsize(path + suffix),
+                                            '"{}-{}"'.format(digest, suffix[1:]))
+
+    def select(self, accept_encoding):
+        """`(encoding, path, size, etag)` of the best variant the client accepts."""
+        accepted = set()
+        for part in accept_encoding.split(','):
+            coding, _, params = part.strip().partition(';')
+            if not re.search(r'q=0(\.0*)?\s*$', params):
+                accepted.add(coding.strip().lower())
+        for encoding, _ in ENCODINGS:
+            if encoding in self.encodings and (encoding in accepted or '*' in accepted):
+                return (encoding, *self.encodings[encoding])
+        return None, self.path, self.size, self.etag
+
+
+def scan_static_root(root):
+    """Every collected file by URL path, except the compressed copies and the manifest."""
+    url = urlsplit(settings.STATIC_URL).path
+    if not url.startswith('/'):
+        url = '/' + url
+    hashed = set()
+    manifest = os.path.join(root, ManifestStaticFilesStorage.manifest_name)
+    if os.path.exists(manifest):
+        with open(manifest, encoding='utf-8') as source:
+            hashed = set(json.load(source).get('paths', {}).values())
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            if name.endswith(tuple(suffix for _, suffix in ENCODINGS)) or path == manifest:
+                continue
+            files[url + name] = StaticFile(path, immutable=name in hashed)
+    return files
+
+
+class StaticFilesMiddleware:
+    """
+    Serve the files `collectstatic` wrote to STATIC_ROOT, ahead of the rest
+    of the stack. Only the files found when the process starts are served:
+    the request path is looked up in that table, never joined onto a
+    directory. Content-hashed files are cached by browsers for a year
+    without revalidation; others are revalidated with their ETag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        root = settings.STATIC_ROOT
+        if not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed('STATIC_ROOT has not been collected.')
+        self.files = scan_static_root(root)
+
+    def __call__(self, request):
+        static_file = self.files.get(request.path_info)
+        if static_file is None or request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    def serve(self, request, static_file):
+        encoding, path, size, etag = static_file.select(request.headers.get('Accept-Encoding', ''))
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=static_file.content_type)
+            response['Content-Length'] = size
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=static_file.content_type)
+            response['Content-Length'] = size
+        if encoding and response.status_code == 200:
+            response['Content-Encoding'] = encoding
+        if static_file.encodings:
+            response['Vary'] = 'Accept-Encoding'
+        response['ETag'] = etag
+        response['Last-Modified'] = static_file.last_modified
+        if static_file.immutable:
+            response['Cache-Control'] = 'public, max-age={}, immutable'.format(IMMUTABLE_MAX_AGE)
+        else:
+            response['Cache-Control'] = 'public, max-age={}'.format(UNHASHED_MAX_AGE)
+        return response
@@ -0,0 +1,192 @@
+"""
+Template compilation and profiling for djangoProject1.
+
+`precompile_templates` loads every template the configured engines can
+find, so that a cached loader already holds them when the first request
+arrives.
+
+`profile_templates` reports the render time and database queries of each
+template, each `{% include %}` and each variable lookup that ran queries,
+e.g. `board.topics.count`. The render hooks are installed once and cost
+one context variable read per call while no profile is active.
+"""
+import contextvars
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.base import Template, Variable
+from django.template.exceptions import TemplateSyntaxError
+from django.template.loader_tags import IncludeNode
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+_profile = contextvars.ContextVar('template_profile', default=None)
+_installed = False
+
+
+def find_template_names(engine):
+    """Names of the files under every directory the engine's loaders search."""
+    names = []
+    for loader in engine.engine.template_loaders:
+        if not hasattr(loader, 'get_dirs'):
+            continue
+        for directory in loader.get_dirs():
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    if filename.endswith(TEMPLATE_EXTENSIONS):
+                        names.append(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return list(dict.fromkeys(names))
+
+
+def precompile_templates():
+    """
+    Compile every template of the Django template engines. Returns the
+    number compiled and a list of `(name, error)` for those that failed.
+    """
+    compiled = 0
+    errors = []
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in find_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as e:
+                errors.append((name, str(e)))
+            else:
+                compiled += 1
+    return compiled, errors
+
+
+class Timing:
+    __slots__ = ('calls', 'ms', 'queries')
+
+    def __init__(self):
+        self.calls = 0
+        self.ms = 0.0
+        self.queries = 0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'ms': round(self.ms, 2), 'queries': self.queries}
+
+
+class TemplateProfile:
+    """
+    Render time and queries per template, per `{% include %}` and per
+    variable lookup. Times and queries of a template include those of the
+    templates it extends or includes.
+    """
+
+    def __init__(self):
+        self.templates = defaultdict(Timing)
+        self.includes = defaultdict(Timing)
+        self.lookups = Counter()
+        self.active = []
+        self.template_names = []
+        self.variables = []
+
+    def __call__(self, execute, sql, params, many, context):
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            for timing in self.active:
+                timing.queries += 1
+            if self.variables:
+                template = self.template_names[-1] if self.template_names else None
+                self.lookups[template, self.variables[-1]] += 1
+
+    @contextmanager
+    def measure(self, timing):
+        timing.calls += 1
+        self.active.append(timing)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing.ms += (time.perf_counter() - start) * 1000
+            self.active.pop()
+
+    def report(self, limit=None):
+        def ranked(timings):
+            items = sorted(timings.items(), key=lambda item: -item[1].ms)[:limit]
+            return [{'name': name, **timing.as_dict()} for name, timing in items]
+
+        return {
+            'templates': ranked(self.templates),
+            'includes': ranked(self.includes),
+            'lookups': [
+                {'template': template, 'variable': variable, 'queries': queries}
+                for (template, variable), queries in self.lookups.most_common(limit)
+            ],
+        }
+
+
+def install():
+    """Wrap template rendering, includes and variable lookups with the profile hooks."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    render = Template._render
+    render_include = IncludeNode.render
+    resolve_lookup = Variable._resolve_lookup
+
+    def _render(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return render(self, context)
+        name = self.origin.template_name if self.origin.template_name is not None else self.name or '<string>'
+        profile.template_names.append(name)
+        try:
+            with profile.measure(profile.templates[name]):
+                return render(self, context)
+        finally:
+            profile.template_names.pop()
+
+    def include(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return render_include(self, context)
+        key = '{}:{} {{% include {} %}}'.format(self.origin.template_name, self.token.lineno, self.template.token)
+        with profile.measure(profile.includes[key]):
+            return render_include(self, context)
+
+    def lookup(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return resolve_lookup(self, context)
+        profile.variables.append(self.var)
+        try:
+            return resolve_lookup(self, context)
+        finally:
+            profile.variables.pop()
+
+    Template._render = _render
+    IncludeNode.render = include
+    Variable._resolve_lookup = lookup
+
+
+@contextmanager
+def profile_templates(profile=None, count_queries=True):
+    """
+    Profile the templates rendered in the block into `profile`, which is
+    returned. Queries are counted on every database connection of the
+    current thread unless `count_queries` is false, for callers that
+    install the profile as an execute wrapper themselves.
+    """
+    install()
+    profile = profile or TemplateProfile()
+    token = _profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            if count_queries:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+            yield profile
+    finally:
+        _profile.reset(token)
@@ -0,0 +1,29 @@
+"""
+Test runner for djangoProject1.
+
+Tests clear and fill the default cache, so they run with its file moved to
+a temporary directory, away from the cache the development server uses.
+"""
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_directory = tempfile.mkdtemp()
+        self.cache_settings = override_settings(CACHES={'default': {
+            **settings.CACHES['default'],
+            'LOCATION': os.path.join(self.cache_directory, 'cache.sqlite3'),
+        }})
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        shutil.rmtree(self.cache_directory)
+        super().teardown_test_environment(**kwargs)
@@ -19,6 +19,7 @@ from django.urls import path
 from accounts import views as account_views
 from django.contrib.auth import views as auth_views
 from boards import views
+from jobs import views as jobs_views
 
 urlpatterns = [
     path('', views.BoardListHome.as_view(), name='home'),
@@ -47,10 +48,16 @@ urlpatterns = [
     path('login/', auth_views.LoginView.as_view(template_name='login.html'), name='login'),
     path('boards/<int:pk>/', views.TopicListView.as_view(), name="board_topics"),
     path('boards/<int:pk>/new/', views.new_topic, name="new_topic"),
-    path('boards/<int:pk>/topics/<int:topic_pk>/', views.TopicListView.as_view(), name='topic_posts'),
+    path('boards/<int:pk>/read/', views.mark_board_read, name="mark_board_read"),
+    path('boards/<int:pk>/topics/<int:topic_pk>/', views.PostListView.as_view(), name='topic_posts'),
     path('boards/<int:pk>/topics/<int:topic_pk>/reply/', views.reply_topic, name='reply_topic'),
     path('boards/<int:pk>/topics/<int:topic_pk>/posts/<int:post_pk>/edit/', views.PostUpdateView.as_view(),
          name='edit_post'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('trending/', views.TrendingView.as_view(), name='trending'),
+    path('boards/<int:pk>/topics/<int:topic_pk>/subscribe/', views.toggle_subscription, name='topic_subscription'),
+    path('notifications/', views.NotificationListView.as_view(), name='notifications'),
+    path('jobs/metrics/', jobs_views.metrics, name='job_metrics'),
     path('admin/', admin.site.urls),
-    path('settings/account/', account_views.UserUpdateView.as_view, name='my_account'),
+    path('settings/account/', account_views.UserUpdateView.as_view(), name='my_account'),
 ]
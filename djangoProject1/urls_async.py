@@ -0,0 +1,21 @@
+"""
+URL configuration for the ASGI entry point: the routes of `djangoProject1.urls`
+with the board list, topic list and post list served by the async views in
+`boards.async_views`.
+"""
+from django.urls import path
+
+from boards import async_views
+from djangoProject1 import urls
+
+ASYNC_VIEWS = {
+    'home': async_views.BoardListHome.as_view(),
+    'board_topics': async_views.TopicListView.as_view(),
+    'topic_posts': async_views.PostListView.as_view(),
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+    if getattr(pattern, 'name', None) in ASYNC_VIEWS else pattern
+    for pattern in urls.urlpatterns
+]
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djangoProject1.settings')
 
 application = get_wsgi_application()
+
+if settings.TEMPLATES_PRECOMPILE:
+    from djangoProject1.templating import precompile_templates
+
+    precompile_templates()
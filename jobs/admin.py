@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from jobs.models import Job
+from jobs.queue import requeue
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('key',)
+    readonly_fields = ('payload', 'last_error')
+    actions = ['requeue_jobs']
+
+    @admin.action(description='Requeue selected jobs')
+    def requeue_jobs(self, request, queryset):
+        self.message_user(request, '{} jobs requeued.'.format(requeue(queryset)))
@@ -0,0 +1,19 @@
+from djangoProject1.leases import QueueWorkerCommand
+from jobs.queue import queue, run_workers
+
+
+class Command(QueueWorkerCommand):
+    help = (
+        'Run the queued background jobs with JOBS_WORKER_CONCURRENCY threads. Run from cron, '
+        'or keep it running with --loop.'
+    )
+    queue = queue
+    noun = 'jobs'
+    report = 'Ran {} {noun}, {} failed.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--concurrency', type=int, help='Defaults to JOBS_WORKER_CONCURRENCY.')
+
+    def run(self, options):
+        return run_workers(options['concurrency'], options['batch_size'])
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    A call of a `jobs.queue.task` function waiting for `run_jobs`. Finished
+    jobs are deleted; a job that keeps failing is kept as FAILED with its
+    last error until it is requeued from the admin.
+    """
+    QUEUED = 'queued'
+    FAILED = 'failed'
+    STATUS_CHOICES = ((QUEUED, 'Queued'), (FAILED, 'Failed'))
+
+    name = models.CharField(max_length=200)
+    # At most one job with a given key is waiting at any time.
+    key = models.CharField(max_length=200, null=True, blank=True, unique=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When a worker may next pick the job up: after a retry delay, or after
+    # the lease of the worker that claimed it runs out.
+    run_at = models.DateTimeField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'run_at'], name='jobs_due_idx')]
+
+    def __str__(self):
+        return "{}: {}".format(self.name, self.key or self.pk)
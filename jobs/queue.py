@@ -0,0 +1,124 @@
+"""
+A background job queue kept in the database, for work a request should not
+wait for. Functions decorated with `task` get an `enqueue(key=None,
+delay=0, **kwargs)` method that stores the call as a `Job` row. The row is
+written in the caller's transaction: workers (`manage.py run_jobs`) only
+see it once the transaction commits, and never if it rolls back.
+
+Keyword arguments must be JSON serializable. A job with a `key` is not
+queued again while one with the same key is waiting or failed, so retried
+requests and repeated events do not run the work twice.
+"""
+import logging
+import threading
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from djangoProject1.leases import LeasedQueue
+from jobs.models import Job
+
+logger = logging.getLogger('jobs')
+
+queue = LeasedQueue(Job, 'run_at', 'JOBS', logger)
+claim = queue.claim
+claim_batch = queue.claim_batch
+retry_delay = queue.retry_delay
+record_failure = queue.record_failure
+requeue = queue.requeue
+
+tasks = {}
+
+
+def task(func):
+    """Register `func` as a job that workers may run, and add `func.enqueue`."""
+    name = '{}.{}'.format(func.__module__, func.__qualname__)
+    tasks[name] = func
+    func.enqueue = partial(enqueue, name)
+    return func
+
+
+def enqueue(name, key=None, delay=0, **kwargs):
+    """Queue a call of the task `name`; returns False if a job with `key` is already waiting."""
+    job = Job(name=name, key=key, payload=kwargs, run_at=timezone.now() + timedelta(seconds=delay))
+    try:
+        # A savepoint, so a duplicate key leaves the caller's transaction usable.
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        if key is None:
+            raise
+        return False
+    return True
+
+
+def get_task(name):
+    if name not in tasks:
+        # Importing the module registers its tasks.
+        import_string(name)
+    return tasks[name]
+
+
+def run_job(job):
+    """Run one claimed job; returns True when it succeeded and was removed."""
+    try:
+        with transaction.atomic():
+            get_task(job.name)(**job.payload)
+            # Deleted with the job's own writes, so a job that succeeded is
+            # never run again.
+            Job.objects.filter(pk=job.pk).delete()
+    except Exception as e:
+        record_failure(job, e, timezone.now())
+        return False
+    return True
+
+
+def run_batch(batch_size=None):
+    """Run one batch of due jobs. Returns the number that succeeded and failed."""
+    jobs = claim_batch(batch_size or settings.JOBS_BATCH_SIZE, timezone.now())
+    succeeded = sum(run_job(job) for job in jobs)
+    return succeeded, len(jobs) - succeeded
+
+
+def run_pending(batch_size=None):
+    """Run batches until no job is due. Returns the totals that succeeded and failed."""
+    total_succeeded = total_failed = 0
+    while True:
+        succeeded, failed = run_batch(batch_size)
+        if not succeeded and not failed:
+            return total_succeeded, total_failed
+        total_succeeded += succeeded
+        total_failed += failed
+
+
+def run_workers(concurrency=None, batch_size=None):
+    """
+    Run the due jobs in `concurrency` threads, each claiming its own batches
+    over its own database connection. Returns the totals that succeeded and
+    failed.
+    """
+    concurrency = concurrency or settings.JOBS_WORKER_CONCURRENCY
+    if concurrency == 1:
+        return run_pending(batch_size)
+    totals = [0, 0]
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            succeeded, failed = run_pending(batch_size)
+            with lock:
+                totals[0] += succeeded
+                totals[1] += failed
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return tuple(totals)
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim, enqueue, retry_delay, run_pending, run_workers, task
+
+calls = []
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@task
+def fail():
+    raise ValueError('broken')
+
+
+@override_settings(JOBS_RETRY_DELAY=30, JOBS_MAX_RETRY_DELAY=3600, JOBS_MAX_ATTEMPTS=3)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_run_and_delete(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        self.assertEquals(run_pending(), (2, 0))
+        self.assertEquals(sorted(calls), [1, 2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_key_queues_once(self):
+        self.assertTrue(record.enqueue(key='one', value=1))
+        self.assertFalse(record.enqueue(key='one', value=2))
+        self.assertEquals(run_pending(), (1, 0))
+        self.assertEquals(calls, [1])
+        # Once it has run, the key can be used again.
+        self.assertTrue(record.enqueue(key='one', value=3))
+
+    def test_delay(self):
+        record.enqueue(delay=60, value=1)
+        self.assertEquals(run_pending(), (0, 0))
+        Job.objects.update(run_at=timezone.now())
+        self.assertEquals(run_pending(), (1, 0))
+
+    def test_retry_then_fail(self):
+        fail.enqueue()
+        with self.assertLogs('jobs', 'WARNING'):
+            for attempt in range(1, 4):
+                self.assertEquals(run_pending(), (0, 1))
+                job = Job.objects.get()
+                self.assertEquals(job.attempts, attempt)
+                self.assertIn('broken', job.last_error)
+                Job.objects.update(run_at=timezone.now() - timedelta(seconds=1))
+        self.assertEquals(job.status, Job.FAILED)
+        self.assertEquals(run_pending(), (0, 0))
+
+    def test_unregistered_name_not_run(self):
+        enqueue('django.core.management.call_command', command_name='flush')
+        with self.assertLogs('jobs', 'WARNING'):
+            self.assertEquals(run_pending(), (0, 1))
+
+    def test_claimed_by_one_worker_only(self):
+        for i in range(3):
+            record.enqueue(value=i)
+        now = timezone.now()
+        first, second = list(Job.objects.order_by('pk')), list(Job.objects.order_by('pk'))
+        self.assertEquals(len(claim(first[:1], now)), 1)
+        # A second worker that read the same rows only gets the unclaimed ones.
+        self.assertEquals([job.pk for job in claim(second, now)], [job.pk for job in first[1:]])
+
+    def test_single_worker(self):
+        record.enqueue(value=1)
+        self.assertEquals(run_workers(concurrency=1), (1, 0))
+
+    def test_retry_delay(self):
+        self.assertEquals([retry_delay(attempt) for attempt in (1, 2, 3, 10)], [30, 60, 120, 3600])
+
+    def test_command_requeues_failed(self):
+        record.enqueue(value=1)
+        Job.objects.update(status=Job.FAILED, attempts=3)
+        stdout = StringIO()
+        call_command('run_jobs', '--retry-failed', concurrency=1, stdout=stdout)
+        self.assertEquals(stdout.getvalue(), 'Requeued 1 failed jobs.\nRan 1 jobs, 0 failed.\n')
+        self.assertEquals(calls, [1])
+
+
+class JobQueueTransactionTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_rolled_back_job_is_not_queued(self):
+        try:
+            with transaction.atomic():
+                record.enqueue(value=1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(Job.objects.exists())
+
+
+@override_settings(JOBS_METRICS_TOKEN='secret', JOBS_WORKER_CONCURRENCY=2)
+class JobMetricsTests(TestCase):
+    def setUp(self):
+        self.url = reverse('job_metrics')
+        record.enqueue(value=1)
+        record.enqueue(value=2, delay=60)
+        fail.enqueue()
+        Job.objects.filter(name__endswith='fail').update(status=Job.FAILED)
+
+    def test_forbidden_without_token(self):
+        self.assertEquals(self.client.get(self.url).status_code, 403)
+        self.assertEquals(self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+
+    def test_queue_depth(self):
+        data = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer secret').json()
+        self.assertEquals((data['queued'], data['due'], data['failed'], data['workers']), (2, 1, 1, 2))
+        self.assertEquals(data['tasks']['jobs.tests.test_queue.record'], {'queued': 2, 'due': 1, 'failed': 0})
+        self.assertGreaterEqual(data['lag_seconds'], 0)
+
+    def test_staff_allowed(self):
+        user = User.objects.create_user(username='admin', password='123', is_staff=True)
+        self.client.force_login(user)
+        self.assertEquals(self.client.get(self.url).status_code, 200)
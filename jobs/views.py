@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db.models import Count, Min, Q
+from django.http import HttpResponseForbidden, JsonResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from jobs.models import Job
+
+
+def has_metrics_token(request):
+    token = settings.JOBS_METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    return bool(token) and constant_time_compare(header, 'Bearer {}'.format(token))
+
+
+def metrics(request):
+    """
+    Queue depth as JSON for monitoring: jobs waiting, due and failed, per
+    task and in total, and how late the oldest due job is. Staff users and
+    requests bearing JOBS_METRICS_TOKEN may read it.
+    """
+    if not (request.user.is_staff or has_metrics_token(request)):
+        return HttpResponseForbidden()
+    now = timezone.now()
+    waiting = Q(status=Job.QUEUED)
+    due = Q(status=Job.QUEUED, run_at__lte=now)
+    rows = Job.objects.values('name').annotate(
+        queued=Count('pk', filter=waiting),
+        due=Count('pk', filter=due),
+        failed=Count('pk', filter=Q(status=Job.FAILED)),
+        oldest_due=Min('run_at', filter=due),
+    ).order_by('name')
+
+    tasks = {}
+    totals = {'queued': 0, 'due': 0, 'failed': 0}
+    oldest_due = None
+    for row in rows:
+        tasks[row['name']] = {key: row[key] for key in totals}
+        for key in totals:
+            totals[key] += row[key]
+        if row['oldest_due'] is not None:
+            oldest_due = min(oldest_due or row['oldest_due'], row['oldest_due'])
+    return JsonResponse({
+        **totals,
+        'lag_seconds': round((now - oldest_due).total_seconds(), 3) if oldest_due else 0,
+        'workers': settings.JOBS_WORKER_CONCURRENCY,
+        'tasks': tasks,
+    })
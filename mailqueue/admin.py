@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from mailqueue.models import QueuedMessage
+from mailqueue.sending import requeue
+
+
+@admin.register(QueuedMessage)
+class QueuedMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('recipients', 'subject')
+    readonly_fields = ('data', 'last_error')
+    actions = ['requeue_messages']
+
+    @admin.action(description='Requeue selected messages')
+    def requeue_messages(self, request, queryset):
+        self.message_user(request, '{} messages requeued.'.format(requeue(queryset)))
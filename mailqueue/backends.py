@@ -0,0 +1,19 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from mailqueue.models import QueuedMessage
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Store messages in the mail queue instead of sending them. The rows are
+    written in the caller's transaction, so mail queued by a request that
+    rolls back is never sent. `send_queued_mail` delivers them through
+    MAILQUEUE_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        now = timezone.now()
+        queued = [QueuedMessage.from_email(message, now) for message in email_messages if message.recipients()]
+        QueuedMessage.objects.bulk_create(queued)
+        return len(queued)
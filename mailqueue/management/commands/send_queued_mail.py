@@ -0,0 +1,16 @@
+from djangoProject1.leases import QueueWorkerCommand
+from mailqueue.sending import queue, send_queued
+
+
+class Command(QueueWorkerCommand):
+    help = (
+        'Send the queued email in batches over one connection per batch. Run from cron, '
+        'or keep it running with --loop.'
+    )
+    queue = queue
+    noun = 'messages'
+    report = 'Sent {} {noun}, {} failed.'
+    interval = 5.0
+
+    def run(self, options):
+        return send_queued(options['batch_size'])
@@ -0,0 +1,47 @@
+import pickle
+
+from django.db import models
+
+
+class QueuedMessage(models.Model):
+    """
+    An outgoing email waiting for `send_queued_mail`. Sent messages are
+    deleted; a message that keeps failing is kept as FAILED (dead-lettered)
+    with its last error until it is requeued from the admin.
+    """
+    QUEUED = 'queued'
+    FAILED = 'failed'
+    STATUS_CHOICES = ((QUEUED, 'Queued'), (FAILED, 'Failed'))
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    subject = models.CharField(max_length=255)
+    recipients = models.TextField()
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When a worker may next pick the message up: after a retry delay, or
+    # after the lease of the worker that claimed it runs out.
+    next_attempt_at = models.DateTimeField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='mailqueue_due_idx')]
+
+    def __str__(self):
+        return "{}: {}".format(self.recipients, self.subject)
+
+    @classmethod
+    def from_email(cls, message, now):
+        # The connection that queued the message must not be pickled with it.
+        connection, message.connection = message.connection, None
+        try:
+            data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        finally:
+            message.connection = connection
+        return cls(
+            subject=str(message.subject)[:255], recipients=', '.join(message.recipients()), data=data,
+            next_attempt_at=now,
+        )
+
+    def get_email(self):
+        return pickle.loads(self.data)
@@ -0,0 +1,69 @@
+"""
+Delivery of the mail queue. Workers claim due messages in batches through
+`djangoProject1.leases.LeasedQueue`, send them over one connection to
+MAILQUEUE_BACKEND, delete the sent ones and reschedule the failures with
+exponential backoff. After MAILQUEUE_MAX_ATTEMPTS a message is marked
+FAILED and left for an operator.
+"""
+import logging
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from djangoProject1.leases import LeasedQueue
+from mailqueue.models import QueuedMessage
+
+logger = logging.getLogger('mailqueue')
+
+queue = LeasedQueue(QueuedMessage, 'next_attempt_at', 'MAILQUEUE', logger)
+claim = queue.claim
+claim_batch = queue.claim_batch
+retry_delay = queue.retry_delay
+record_failure = queue.record_failure
+requeue = queue.requeue
+
+
+def send_batch(batch_size=None, connection=None):
+    """
+    Send one batch of due messages over a single connection. Returns the
+    number of messages sent and the number that failed.
+    """
+    now = timezone.now()
+    messages = claim_batch(batch_size or settings.MAILQUEUE_BATCH_SIZE, now)
+    if not messages:
+        return 0, 0
+    connection = connection or get_connection(settings.MAILQUEUE_BACKEND)
+    sent, failed = [], 0
+    try:
+        connection.open()
+    except Exception as e:
+        # The server is unreachable: the whole batch is retried later.
+        for message in messages:
+            record_failure(message, e, now)
+        return 0, len(messages)
+    try:
+        for message in messages:
+            try:
+                connection.send_messages([message.get_email()])
+            except Exception as e:
+                record_failure(message, e, now)
+                failed += 1
+            else:
+                sent.append(message.pk)
+    finally:
+        connection.close()
+        QueuedMessage.objects.filter(pk__in=sent).delete()
+    return len(sent), failed
+
+
+def send_queued(batch_size=None, connection=None):
+    """Send batches until no message is due. Returns the totals sent and failed."""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = send_batch(batch_size, connection)
+        if not sent and not failed:
+            return total_sent, total_failed
+        total_sent += sent
+        total_failed += failed
+
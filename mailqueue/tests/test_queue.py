@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from mailqueue.models import QueuedMessage
+from mailqueue.sending import claim, retry_delay, send_batch, send_queued
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionRefusedError('no server')
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('no server')
+
+
+QUEUED_MAIL = dict(
+    EMAIL_BACKEND='mailqueue.backends.QueuedEmailBackend',
+    MAILQUEUE_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    MAILQUEUE_RETRY_DELAY=60,
+    MAILQUEUE_MAX_RETRY_DELAY=3600,
+    MAILQUEUE_MAX_ATTEMPTS=3,
+)
+
+
+@override_settings(**QUEUED_MAIL)
+class QueuedEmailBackendTests(TestCase):
+    def test_password_reset_is_queued(self):
+        User.objects.create_user(username='john', email='john@doe.com', password='123')
+        response = self.client.post(reverse('password_reset'), {'email': 'john@doe.com'})
+        self.assertRedirects(response, reverse('password_reset_done'))
+        self.assertEquals(mail.outbox, [])
+        message = QueuedMessage.objects.get()
+        self.assertEquals(message.recipients, 'john@doe.com')
+
+        self.assertEquals(send_queued(), (1, 0))
+        self.assertEquals(mail.outbox[0].to, ['john@doe.com'])
+        self.assertIn('reset', mail.outbox[0].subject)
+        self.assertFalse(QueuedMessage.objects.exists())
+
+    def test_batches(self):
+        for i in range(5):
+            mail.send_mail('Hello', 'Body', 'from@example.com', ['user{}@example.com'.format(i)])
+        self.assertEquals(send_batch(batch_size=2), (2, 0))
+        self.assertEquals(QueuedMessage.objects.count(), 3)
+        self.assertEquals(send_queued(batch_size=2), (3, 0))
+        self.assertEquals(sorted(message.to[0] for message in mail.outbox),
+                          ['user{}@example.com'.format(i) for i in range(5)])
+
+    def test_retry_with_backoff_then_dead_letter(self):
+        mail.send_mail('Hello', 'Body', 'from@example.com', ['john@doe.com'])
+        with self.settings(MAILQUEUE_BACKEND='mailqueue.tests.test_queue.FailingBackend'), \
+                self.assertLogs('mailqueue', 'WARNING'):
+            for attempt in range(1, 4):
+                self.assertEquals(send_queued(), (0, 1))
+                message = QueuedMessage.objects.get()
+                self.assertEquals(message.attempts, attempt)
+                self.assertIn('no server', message.last_error)
+                # Not due again until the backoff has passed.
+                self.assertEquals(send_queued(), (0, 0))
+                QueuedMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEquals(message.status, QueuedMessage.FAILED)
+        self.assertEquals(send_queued(), (0, 0))
+
+        call_command('send_queued_mail', '--retry-failed', stdout=StringIO())
+        self.assertEquals(len(mail.outbox), 1)
+
+    @override_settings(MAILQUEUE_BACKEND='mailqueue.tests.test_queue.UnreachableBackend')
+    def test_unreachable_server_defers_batch(self):
+        for _ in range(2):
+            mail.send_mail('Hello', 'Body', 'from@example.com', ['john@doe.com'])
+        with self.assertLogs('mailqueue', 'WARNING'):
+            self.assertEquals(send_queued(), (0, 2))
+        self.assertEquals(set(QueuedMessage.objects.values_list('attempts', flat=True)), {1})
+
+    def test_claimed_messages_are_leased(self):
+        mail.send_mail('Hello', 'Body', 'from@example.com', ['john@doe.com'])
+        QueuedMessage.objects.update(next_attempt_at=timezone.now() + timedelta(seconds=300))
+        self.assertEquals(send_queued(), (0, 0))
+
+    def test_claimed_by_one_worker_only(self):
+        for _ in range(3):
+            mail.send_mail('Hello', 'Body', 'from@example.com', ['john@doe.com'])
+        now = timezone.now()
+        first, second = list(QueuedMessage.objects.order_by('pk')), list(QueuedMessage.objects.order_by('pk'))
+        self.assertEquals(len(claim(first[:1], now)), 1)
+        # A second worker that read the same rows only gets the unclaimed ones.
+        self.assertEquals([message.pk for message in claim(second, now)], [m.pk for m in first[1:]])
+
+    def test_retry_delay(self):
+        self.assertEquals([retry_delay(attempt) for attempt in (1, 2, 3, 10)], [60, 120, 240, 3600])
+
+
+@override_settings(**QUEUED_MAIL)
+class QueuedEmailTransactionTests(TransactionTestCase):
+    def test_rolled_back_mail_is_not_queued(self):
+        try:
+            with transaction.atomic():
+                mail.send_mail('Hello', 'Body', 'from@example.com', ['john@doe.com'])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(QueuedMessage.objects.exists())